@@ -0,0 +1,61 @@
+"""add audio processing status and job queue
+
+Revision ID: 2e7b9d4c6a18
+Revises: 5a9c3e1d7b42
+Create Date: 2026-10-18 15:40:09.512733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e7b9d4c6a18'
+down_revision: Union[str, None] = '5a9c3e1d7b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('jobs',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('kind', sa.String(length=50), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_jobs_kind_status_run_at', 'jobs', ['kind', 'status', 'run_at'], unique=False)
+    # Existing rows already carry the inline-parsed duration, so they start out ready.
+    op.add_column('audios', sa.Column('status', sa.String(length=20), server_default='ready', nullable=False))
+    op.alter_column('audios', 'status', server_default=None)
+    op.add_column('audios', sa.Column('bitrate', sa.Integer(), nullable=True))
+    op.add_column('audios', sa.Column('sample_rate', sa.Integer(), nullable=True))
+    op.add_column('audios', sa.Column('channels', sa.Integer(), nullable=True))
+    op.add_column('audios', sa.Column('codec', sa.String(length=32), nullable=True))
+    # Queue a metadata pass for everything uploaded before the pipeline existed.
+    op.execute(
+        "INSERT INTO jobs (kind, payload, status, attempts, max_attempts) "
+        "SELECT 'audio.metadata', jsonb_build_object('audio_id', id::text), 'pending', 0, 5 FROM audios"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('audios', 'codec')
+    op.drop_column('audios', 'channels')
+    op.drop_column('audios', 'sample_rate')
+    op.drop_column('audios', 'bitrate')
+    op.drop_column('audios', 'status')
+    op.drop_index('ix_jobs_kind_status_run_at', table_name='jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,47 @@
+"""add upload sessions
+
+Revision ID: 3b1f6d2c9a7e
+Revises: ece5ad5aa134
+Create Date: 2026-10-18 12:10:41.512233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b1f6d2c9a7e'
+down_revision: Union[str, None] = 'ece5ad5aa134'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('upload_sessions',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('filename', sa.String(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('is_public', sa.Boolean(), nullable=True),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('offset', sa.BigInteger(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_upload_sessions_id'), 'upload_sessions', ['id'], unique=False)
+    op.create_index(op.f('ix_upload_sessions_user_id'), 'upload_sessions', ['user_id'], unique=False)
+    op.create_index(op.f('ix_upload_sessions_expires_at'), 'upload_sessions', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_upload_sessions_expires_at'), table_name='upload_sessions')
+    op.drop_index(op.f('ix_upload_sessions_user_id'), table_name='upload_sessions')
+    op.drop_index(op.f('ix_upload_sessions_id'), table_name='upload_sessions')
+    op.drop_table('upload_sessions')
@@ -0,0 +1,48 @@
+"""store backend-relative storage keys
+
+Revision ID: 5a9c3e1d7b42
+Revises: 8d4e2a7f1c05
+Create Date: 2026-10-18 14:21:53.118406
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.core.config.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a9c3e1d7b42'
+down_revision: Union[str, None] = '8d4e2a7f1c05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('audios', 'audio_blobs')
+
+
+def _upload_root() -> str:
+    return os.path.normpath(os.path.join(os.getcwd(), settings.storage.audio_upload_dir)) + '/'
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    root = _upload_root()
+    for table in TABLES:
+        op.execute(
+            sa.text(f"UPDATE {table} SET file_path = substr(file_path, :start) WHERE starts_with(file_path, :root)")
+            .bindparams(start=len(root) + 1, root=root)
+        )
+        op.execute(f"UPDATE {table} SET file_path = regexp_replace(file_path, '^.*/', '') WHERE file_path LIKE '/%'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    root = _upload_root()
+    for table in TABLES:
+        op.execute(
+            sa.text(f"UPDATE {table} SET file_path = :root || file_path WHERE file_path NOT LIKE '/%'")
+            .bindparams(root=root)
+        )
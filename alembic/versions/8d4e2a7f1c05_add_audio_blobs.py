@@ -0,0 +1,41 @@
+"""add audio blobs
+
+Revision ID: 8d4e2a7f1c05
+Revises: 3b1f6d2c9a7e
+Create Date: 2026-10-18 13:02:17.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4e2a7f1c05'
+down_revision: Union[str, None] = '3b1f6d2c9a7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('audio_blobs',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('file_path', sa.String(), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+    op.add_column('audios', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_audios_content_hash'), 'audios', ['content_hash'], unique=False)
+    op.create_foreign_key('audios_content_hash_fkey', 'audios', 'audio_blobs', ['content_hash'], ['sha256'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('audios_content_hash_fkey', 'audios', type_='foreignkey')
+    op.drop_index(op.f('ix_audios_content_hash'), table_name='audios')
+    op.drop_column('audios', 'content_hash')
+    op.drop_table('audio_blobs')
@@ -0,0 +1,38 @@
+"""add composite indexes for keyset-paginated audio listings
+
+Revision ID: 9c1f4e8b2d63
+Revises: 2e7b9d4c6a18
+Create Date: 2026-10-18 18:32:45.730261
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1f4e8b2d63'
+down_revision: Union[str, None] = '2e7b9d4c6a18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    'ix_audios_is_public_created_at_id': ['is_public', 'created_at', 'id'],
+    'ix_audios_user_id_created_at_id': ['user_id', 'created_at', 'id'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so large audio tables stay writable during the migration.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(name, 'audios', columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name='audios', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,55 @@
+"""add full-text and trigram search over audio titles
+
+Revision ID: b7e3c1a94f20
+Revises: 9c1f4e8b2d63
+Create Date: 2026-10-18 21:04:12.518337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3c1a94f20'
+down_revision: Union[str, None] = '9c1f4e8b2d63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A stored generated column rewrites the table once; after that Postgres keeps it in sync.
+    op.add_column('audios', sa.Column(
+        'title_search',
+        postgresql.TSVECTOR(),
+        sa.Computed("to_tsvector('simple', title)", persisted=True),
+        nullable=True
+    ))
+    # pg_trgm ships with contrib; hosts without it get full-text search only (AUDIO_SEARCH_FUZZY=false).
+    has_trgm = op.get_bind().scalar(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm')"
+    ))
+    if has_trgm:
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_audios_title_search', 'audios', ['title_search'], unique=False,
+            postgresql_using='gin', postgresql_concurrently=True, if_not_exists=True
+        )
+        if has_trgm:
+            op.create_index(
+                'ix_audios_title_trgm', 'audios', ['title'], unique=False,
+                postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_audios_title_trgm', table_name='audios', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_audios_title_search', table_name='audios', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('audios', 'title_search')
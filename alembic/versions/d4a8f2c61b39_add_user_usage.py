@@ -0,0 +1,43 @@
+"""add per-user usage counters and quota tiers
+
+Revision ID: d4a8f2c61b39
+Revises: b7e3c1a94f20
+Create Date: 2026-10-18 23:12:37.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8f2c61b39'
+down_revision: Union[str, None] = 'b7e3c1a94f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('quota_tier', sa.String(length=32), nullable=True))
+    op.create_table('user_usage',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('bytes_used', sa.BigInteger(), nullable=False),
+    sa.Column('audio_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    # Seed the counters once; from here on uploads and deletes keep them current
+    # and the repair job corrects any drift.
+    op.execute(
+        "INSERT INTO user_usage (user_id, bytes_used, audio_count) "
+        "SELECT user_id, coalesce(sum(size), 0), count(*) FROM audios GROUP BY user_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_usage')
+    op.drop_column('users', 'quota_tier')
@@ -0,0 +1,33 @@
+"""add shared token-bucket state for admission control
+
+Revision ID: e6b0c3d85a17
+Revises: d4a8f2c61b39
+Create Date: 2026-10-19 00:41:09.377165
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b0c3d85a17'
+down_revision: Union[str, None] = 'd4a8f2c61b39'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rate_limits',
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('tat', sa.Double(), nullable=False),
+    sa.PrimaryKeyConstraint('key'),
+    prefixes=['UNLOGGED']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rate_limits')
@@ -0,0 +1,28 @@
+"""add chunk claim lease to upload sessions
+
+Revision ID: f2c9a4d7b1e3
+Revises: e6b0c3d85a17
+Create Date: 2026-10-18 12:20:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c9a4d7b1e3'
+down_revision: Union[str, None] = 'e6b0c3d85a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('upload_sessions', sa.Column('claimed_until', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('upload_sessions', 'claimed_until')
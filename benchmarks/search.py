@@ -0,0 +1,187 @@
+"""Search latency on a large synthetic catalogue.
+
+Seeds ``--rows`` audios (one million by default) with titles drawn from a
+fixed vocabulary, server-side so seeding is not the bottleneck, then times
+``AudioService.search_audios`` for whole-word, multi-word, prefix
+(typeahead) and misspelt queries, each as an anonymous caller and as the
+owner, plus a deep keyset walk. An unindexed ``ILIKE '%q%'`` over the same
+visibility scope is timed as the baseline.
+
+    python -m benchmarks.search --rows 1000000 --explain
+    python -m benchmarks.search --keep          # leave the catalogue for the next run
+"""
+import argparse
+import asyncio
+import math
+import time
+import uuid
+
+from sqlalchemy import delete, func, select, text
+
+from src.audio.model import Audio
+from src.audio.schema import AudioSearchParams
+from src.audio.service import AudioService
+from src.core.config.config import settings
+from src.core.database import SessionLocal, engine
+from src.users.model import User
+
+BENCH_EMAIL = "search-bench@example.com"
+COMMON_WORDS = [
+    "love", "night", "summer", "dream", "fire", "rain", "heart", "river", "city", "light",
+    "live", "remix", "acoustic", "demo", "session", "version", "edit", "mix", "part", "intro",
+]
+SYLLABLES = [
+    "ka", "lo", "mi", "ra", "ven", "tor", "sa", "lin", "dor", "el", "quo", "ni", "ber", "sta", "phon",
+    "ri", "mar", "zu", "tel", "gra", "vo", "den", "sul", "ar", "mo", "cri", "pel", "the", "wa", "lux",
+]
+
+def vocabulary() -> list[str]:
+    """Common words first, then ~27k synthetic ones; titles draw from it with a heavy head."""
+    synthetic = [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES]
+    return COMMON_WORDS + sorted(set(synthetic))
+
+VOCABULARY = vocabulary()
+QUERIES = [
+    ("common word", "night"),
+    ("two common words", "summer rain"),
+    ("mid-frequency word", VOCABULARY[300]),
+    ("rare word", VOCABULARY[20000]),
+    ("prefix (typeahead)", VOCABULARY[300][:5]),
+    ("common + prefix", f"live {VOCABULARY[150][:4]}"),
+    ("typo", VOCABULARY[300][:-2] + VOCABULARY[300][-1]),
+]
+
+def percentile(values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    return values[max(math.ceil(p / 100 * len(values)) - 1, 0)]
+
+async def seed(rows: int) -> tuple[User, User]:
+    async with SessionLocal() as session:
+        users = (await session.scalars(select(User).where(User.email.like("search-bench%")))).all()
+        if len(users) == 2:
+            existing = await session.scalar(select(func.count()).where(Audio.user_id.in_([u.id for u in users])))
+            if existing == rows:
+                print(f"reusing {existing:,} seeded audios")
+                return users[0], users[1]
+            await cleanup(session, users)
+        owner = User(email=BENCH_EMAIL, is_active=True)
+        other = User(email=f"search-bench-{uuid.uuid4().hex[:8]}@example.com", is_active=True)
+        session.add_all([owner, other])
+        await session.flush()
+        started = time.perf_counter()
+        # Three words per title, skewed towards the head of the vocabulary (u^3) so a
+        # few words are very common and most are rare; one in three private, owners alternate.
+        await session.execute(text("""
+            INSERT INTO audios (id, title, size, format, status, is_public, file_path, user_id, created_at)
+            SELECT gen_random_uuid(),
+                   initcap(w[1 + floor(n * power((hashint4(i) & 2147483647) / 2147483648.0, 3))::int]) || ' ' ||
+                   w[1 + floor(n * power((hashint4(i + 1000003) & 2147483647) / 2147483648.0, 3))::int] || ' ' ||
+                   w[1 + floor(n * power((hashint4(i + 2000003) & 2147483647) / 2147483648.0, 3))::int],
+                   4000000 + i, 'mp3', 'ready', i % 3 <> 0, 'bench/' || i || '.mp3',
+                   CASE WHEN i % 2 = 0 THEN CAST(:owner AS uuid) ELSE CAST(:other AS uuid) END,
+                   now() - i * interval '1 second'
+            FROM generate_series(1, :rows) AS i,
+                 (SELECT CAST(:words AS text[]) AS w, cardinality(CAST(:words AS text[])) AS n) AS vocabulary
+        """), {"owner": owner.id, "other": other.id, "rows": rows, "words": VOCABULARY})
+        await session.commit()
+        print(f"seeded {rows:,} audios in {time.perf_counter() - started:.1f}s")
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        await connection.execute(text("VACUUM ANALYZE audios"))
+    return owner, other
+
+async def cleanup(session, users: list[User]) -> None:
+    ids = [u.id for u in users]
+    await session.execute(delete(Audio).where(Audio.user_id.in_(ids)))
+    await session.execute(delete(User).where(User.id.in_(ids)))
+    await session.commit()
+
+async def timed(call, iterations: int) -> tuple[list[float], int]:
+    samples = []
+    found = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        found = await call()
+        samples.append(time.perf_counter() - started)
+    return sorted(samples), found
+
+def report(name: str, samples: list[float], found: int) -> None:
+    p50, p95 = percentile(samples, 50) * 1000, percentile(samples, 95) * 1000
+    print(f"{name:<48} p50 {p50:>8.2f} ms   p95 {p95:>8.2f} ms   {found:>4} hits")
+
+async def bench(owner: User, limit: int, iterations: int, pages: int, explain: bool) -> None:
+    async with SessionLocal() as session:
+        service = AudioService(session)
+        for kind, q in QUERIES:
+            if kind == "typo" and not settings.search.fuzzy:
+                continue
+            params = AudioSearchParams(q=q, limit=limit)
+            for caller, user_id in (("anonymous", None), ("owner", owner.id)):
+                async def search():
+                    rows, _ = await service.search_audios(params, user_id=user_id)
+                    return len(rows)
+                report(f"search {kind!r} ({caller})", *await timed(search, iterations))
+
+            async def baseline():
+                query = (
+                    select(Audio.id)
+                    .where(Audio.is_public.is_(True), Audio.title.ilike(f"%{q}%"))
+                    .order_by(Audio.created_at.desc())
+                    .limit(limit)
+                )
+                return len((await session.execute(query)).all())
+            report(f"  baseline ILIKE {q!r} (anonymous)", *await timed(baseline, max(iterations // 10, 1)))
+
+        async def walk():
+            cursor, seen = None, 0
+            for _ in range(pages):
+                rows, cursor = await service.search_audios(AudioSearchParams(q=VOCABULARY[300], limit=limit, cursor=cursor))
+                seen += len(rows)
+                if cursor is None:
+                    break
+            return seen
+        report(f"keyset walk {VOCABULARY[300]!r}, {pages} pages", *await timed(walk, max(iterations // 10, 1)))
+
+        if explain:
+            params = AudioSearchParams(q=VOCABULARY[300], limit=limit)
+            captured = {}
+            execute = session.execute
+
+            async def capture(query, *args, **kwargs):
+                captured["query"] = query
+                return await execute(query, *args, **kwargs)
+            session.execute = capture
+            await service.search_audios(params)
+            session.execute = execute
+            compiled = captured["query"].compile(dialect=session.bind.dialect)
+            connection = await session.connection()
+            plan = await connection.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS) {compiled}",
+                tuple(compiled.params[name] for name in compiled.positiontup)
+            )
+            print("\n".join(row[0] for row in plan))
+
+async def run(args: argparse.Namespace) -> None:
+    owner, other = await seed(args.rows)
+    try:
+        await bench(owner, args.limit, args.iterations, args.pages, args.explain)
+    finally:
+        if not args.keep:
+            async with SessionLocal() as session:
+                await cleanup(session, [owner, other])
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark audio title search")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--explain", action="store_true", help="print EXPLAIN ANALYZE for one search")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded catalogue for the next run")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
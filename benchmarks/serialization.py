@@ -0,0 +1,140 @@
+"""Rows/sec for the listing endpoints: ORM + Pydantic vs. column projection + orjson.
+
+Seeds a throwaway user with ``--rows`` audios, measures both serialization
+paths at the service level and then the real endpoints in-process.
+
+    python -m benchmarks.serialization --rows 5000 --limit 100
+"""
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from sqlalchemy import delete, insert, select
+
+from main import app
+from src.audio.cache import public_listing_cache
+from src.audio.model import Audio, AudioStatus
+from src.audio.schema import AudioInDB, AudioListParams, AudioPage
+from src.audio.service import AudioService
+from src.core.database import SessionLocal
+from src.shared.utils.auth_utils import create_access_token
+from src.shared.utils.serialization import page_body, rows_to_dicts, dumps
+from src.users.model import User
+from src.users.schema import UserInDB
+from src.users.service import UserService
+
+async def seed(rows: int) -> User:
+    async with SessionLocal() as session:
+        user = User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com", is_active=True)
+        session.add(user)
+        await session.flush()
+        await session.execute(insert(Audio), [
+            {
+                "id": uuid.uuid4(),
+                "title": f"bench {i}",
+                "duration": 180 + i % 120,
+                "size": 4_000_000 + i,
+                "format": "mp3",
+                "status": AudioStatus.READY,
+                "bitrate": 128000,
+                "sample_rate": 44100,
+                "channels": 2,
+                "codec": "mp3",
+                "is_public": True,
+                "file_path": f"bench/{i}.mp3",
+                "user_id": user.id,
+            }
+            for i in range(rows)
+        ])
+        await session.commit()
+        return user
+
+async def cleanup(user: User) -> None:
+    async with SessionLocal() as session:
+        await session.execute(delete(Audio).where(Audio.user_id == user.id))
+        await session.execute(delete(User).where(User.id == user.id))
+        await session.commit()
+
+def report(name: str, rows: int, elapsed: float) -> None:
+    print(f"{name:<40} {rows / elapsed:>12,.0f} rows/s")
+
+async def legacy_audio_page(session, user_id, params: AudioListParams) -> bytes:
+    query = (
+        select(Audio)
+        .where(Audio.user_id == user_id)
+        .order_by(Audio.created_at.desc(), Audio.id.desc())
+        .limit(params.limit + 1)
+    )
+    audios = (await session.execute(query)).scalars().all()[:params.limit]
+    page = AudioPage(items=[AudioInDB.model_validate(a) for a in audios], next_cursor=None)
+    return page.model_dump_json().encode()
+
+async def fast_audio_page(session, user_id, params: AudioListParams) -> bytes:
+    rows, next_cursor = await AudioService(session).get_user_audios(user_id, params)
+    return page_body(rows, next_cursor)
+
+async def legacy_users(session, limit: int) -> bytes:
+    users = (await session.execute(select(User).limit(limit))).scalars().all()
+    return b"[" + b",".join(UserInDB.model_validate(u.__dict__).model_dump_json().encode() for u in users) + b"]"
+
+async def fast_users(session, limit: int) -> bytes:
+    return dumps(rows_to_dicts(await UserService(session).get_all_users(0, limit)))
+
+async def bench_service(user: User, limit: int, iterations: int) -> None:
+    params = AudioListParams(limit=limit)
+    for name, func, args in (
+        ("service audio page: ORM + pydantic", legacy_audio_page, (user.id, params)),
+        ("service audio page: projection + orjson", fast_audio_page, (user.id, params)),
+        ("service users: ORM + pydantic", legacy_users, (limit,)),
+        ("service users: projection + orjson", fast_users, (limit,)),
+    ):
+        async with SessionLocal() as session:
+            await func(session, *args)
+            rows = 0
+            started = time.perf_counter()
+            for _ in range(iterations):
+                body = await func(session, *args)
+                rows += body.count(b'"id"')
+            report(name, rows, time.perf_counter() - started)
+
+async def bench_http(user: User, limit: int, iterations: int) -> None:
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, url, uncached in (
+            ("GET /api/audio/me", "/api/audio/me", False),
+            ("GET /api/audio/public (cache miss)", "/api/audio/public", True),
+            ("GET /api/users/", "/api/users/", False),
+        ):
+            rows = 0
+            started = time.perf_counter()
+            for _ in range(iterations):
+                if uncached:
+                    public_listing_cache.invalidate()
+                response = await client.get(url, params={"limit": limit}, headers=headers)
+                response.raise_for_status()
+                payload = response.json()
+                rows += len(payload["items"] if isinstance(payload, dict) else payload)
+            report(name, rows, time.perf_counter() - started)
+
+async def run(rows: int, limit: int, iterations: int) -> None:
+    async with app.router.lifespan_context(app):
+        user = await seed(rows)
+        try:
+            await bench_service(user, limit, iterations)
+            await bench_http(user, limit, iterations)
+        finally:
+            await cleanup(user)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark listing serialization")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.limit, args.iterations))
+
+if __name__ == "__main__":
+    main()
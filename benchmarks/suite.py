@@ -0,0 +1,394 @@
+"""End-to-end benchmarks for the upload, download, listing and auth hot paths.
+
+Boots the real FastAPI app in-process against the Postgres configured in
+``.env`` and drives concurrent clients through it. SQLite cannot stand in
+for Postgres here: the schema relies on JSONB, arrays, ON CONFLICT and
+SKIP LOCKED. Results are written as JSON so runs on different commits can
+be compared:
+
+    python -m benchmarks.suite --output results/$(git rev-parse --short HEAD).json
+    python -m benchmarks.suite --scenarios download,range --compare results/main.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import resource
+import socket
+import subprocess
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+SCENARIOS = ("upload", "download", "range", "listing", "login", "refresh")
+PASSWORD = "benchmark-password"
+RSS_SAMPLE_INTERVAL = 0.02
+
+Worker = Callable[[int], Awaitable[int]]
+
+def parse_size(value: str) -> int:
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    value = value.strip().upper()
+    if value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+def percentile(values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not values:
+        return 0.0
+    return values[max(math.ceil(p / 100 * len(values)) - 1, 0)]
+
+def current_rss() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class RssSampler:
+    """Samples resident memory while a scenario runs."""
+
+    def __init__(self):
+        self.peak = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            self.peak = max(self.peak, current_rss())
+            await asyncio.sleep(RSS_SAMPLE_INTERVAL)
+
+    def start(self) -> None:
+        self.peak = current_rss()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> int:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        return max(self.peak, current_rss())
+
+async def run_scenario(worker: Worker, clients: int, requests: int) -> dict:
+    """Run ``requests`` calls of ``worker`` spread over ``clients`` concurrent tasks."""
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+    transferred = 0
+    pending = iter(range(requests))
+
+    async def client() -> None:
+        nonlocal transferred
+        for i in pending:
+            started = time.perf_counter()
+            try:
+                transferred += await worker(i)
+            except Exception as e:
+                key = type(e).__name__
+                if isinstance(e, httpx.HTTPStatusError):
+                    key = f"HTTP {e.response.status_code}"
+                errors[key] = errors.get(key, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    sampler = RssSampler()
+    sampler.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    wall = time.perf_counter() - started
+    peak_rss = await sampler.stop()
+    latencies.sort()
+    return {
+        "requests": requests,
+        "succeeded": len(latencies),
+        "errors": errors,
+        "clients": clients,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "throughput_mib_s": round(transferred / wall / 1024 ** 2, 2) if wall else 0.0,
+        "bytes": transferred,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+        },
+        "peak_rss_mib": round(peak_rss / 1024 ** 2, 1),
+    }
+
+class Bench:
+    def __init__(self, client: httpx.AsyncClient, args: argparse.Namespace):
+        self.client = client
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.users: list[dict] = []
+        self.audio_ids: dict[int, list[str]] = {}
+
+    def _auth(self, i: int) -> dict:
+        token = self.users[i % len(self.users)]["access_token"]
+        return {"Authorization": f"Bearer {token}"}
+
+    async def setup_users(self) -> None:
+        for _ in range(self.args.users):
+            email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+            response = await self.client.post("/api/auth/register", json={"email": email, "password": PASSWORD})
+            response.raise_for_status()
+            self.users.append({"email": email, **response.json()})
+
+    async def _upload(self, i: int, payload: bytes, is_public: bool = False) -> str:
+        response = await self.client.post(
+            "/api/audio/upload",
+            headers=self._auth(i),
+            files={"file": (f"bench-{i}.mp3", payload, "audio/mpeg")},
+            data={"title": f"bench {i}", "is_public": str(is_public).lower()}
+        )
+        response.raise_for_status()
+        audio_id = response.json()["id"]
+        self.audio_ids.setdefault(i % len(self.users), []).append(audio_id)
+        return audio_id
+
+    async def upload(self) -> dict:
+        payloads = [os.urandom(parse_size(size)) for size in self.args.upload_sizes.split(",")]
+
+        async def worker(i: int) -> int:
+            payload = payloads[i % len(payloads)]
+            await self._upload(i, payload)
+            return len(payload)
+
+        return await run_scenario(worker, self.args.clients, self.args.requests)
+
+    async def _download_target(self) -> tuple[str, int]:
+        size = parse_size(self.args.download_size)
+        return await self._upload(0, os.urandom(size)), size
+
+    async def download(self) -> dict:
+        audio_id, _ = await self._download_target()
+
+        async def worker(i: int) -> int:
+            response = await self.client.get(f"/api/audio/download/{audio_id}", headers=self._auth(0))
+            response.raise_for_status()
+            return len(response.content)
+
+        return await run_scenario(worker, self.args.clients, self.args.requests)
+
+    async def range(self) -> dict:
+        audio_id, size = await self._download_target()
+        length = parse_size(self.args.range_size)
+
+        async def worker(i: int) -> int:
+            start = self.rng.randrange(0, max(size - length, 1))
+            response = await self.client.get(
+                f"/api/audio/download/{audio_id}",
+                headers={**self._auth(0), "Range": f"bytes={start}-{start + length - 1}"}
+            )
+            response.raise_for_status()
+            return len(response.content)
+
+        return await run_scenario(worker, self.args.clients, self.args.requests)
+
+    async def listing(self) -> dict:
+        await seed_public_audios(self.users[0]["email"], self.args.listing_rows)
+        cursors: dict[int, Optional[str]] = {}
+
+        async def worker(i: int) -> int:
+            # Each client slot walks the listing page by page, starting over at the end.
+            slot = i % self.args.clients
+            params = {"limit": self.args.page_size}
+            if cursors.get(slot):
+                params["cursor"] = cursors[slot]
+            response = await self.client.get("/api/audio/public", params=params)
+            response.raise_for_status()
+            cursors[slot] = response.json()["next_cursor"]
+            return len(response.content)
+
+        return await run_scenario(worker, self.args.clients, self.args.requests)
+
+    async def login(self) -> dict:
+        async def worker(i: int) -> int:
+            user = self.users[i % len(self.users)]
+            response = await self.client.post(
+                "/api/auth/login", json={"email": user["email"], "password": PASSWORD}
+            )
+            response.raise_for_status()
+            return 0
+
+        return await run_scenario(worker, self.args.clients, self.args.auth_requests)
+
+    async def refresh(self) -> dict:
+        async def worker(i: int) -> int:
+            user = self.users[i % len(self.users)]
+            response = await self.client.post(
+                "/api/auth/refresh-token", json={"refresh_token": user["refresh_token"]}
+            )
+            response.raise_for_status()
+            return 0
+
+        return await run_scenario(worker, self.args.clients, self.args.requests)
+
+    async def cleanup(self) -> None:
+        for owner, audio_ids in self.audio_ids.items():
+            for offset in range(0, len(audio_ids), 500):
+                await self.client.post(
+                    "/api/audio/batch-delete",
+                    headers=self._auth(owner),
+                    json={"ids": audio_ids[offset:offset + 500]}
+                )
+        await delete_bench_users([user["email"] for user in self.users])
+
+async def seed_public_audios(email: str, rows: int) -> None:
+    from sqlalchemy import insert, select
+
+    from src.audio.model import Audio, AudioStatus
+    from src.core.database import SessionLocal
+    from src.users.model import User
+
+    async with SessionLocal() as session:
+        user_id = (await session.execute(select(User.id).where(User.email == email))).scalar_one()
+        await session.execute(insert(Audio), [
+            {
+                "id": uuid.uuid4(),
+                "title": f"bench listing {i}",
+                "duration": 120 + i % 300,
+                "size": 4_000_000,
+                "format": "mp3",
+                "status": AudioStatus.READY,
+                "is_public": True,
+                "file_path": f"bench/{uuid.uuid4()}.mp3",
+                "user_id": user_id,
+            }
+            for i in range(rows)
+        ])
+        await session.commit()
+
+async def delete_bench_users(emails: list[str]) -> None:
+    from sqlalchemy import delete, select
+
+    from src.audio.model import Audio
+    from src.core.database import SessionLocal
+    from src.users.model import User
+
+    async with SessionLocal() as session:
+        user_ids = select(User.id).where(User.email.in_(emails))
+        await session.execute(delete(Audio).where(Audio.user_id.in_(user_ids)))
+        await session.execute(delete(User).where(User.email.in_(emails)))
+        await session.commit()
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def run(args: argparse.Namespace) -> dict:
+    # Settings are read at import time, so the app is imported only now.
+    from main import app
+
+    results = {
+        "commit": git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "options": vars(args),
+        "scenarios": {},
+    }
+    server, server_task = None, None
+    async with app.router.lifespan_context(app):
+        if args.transport == "http":
+            import uvicorn
+
+            port = free_port()
+            server = uvicorn.Server(uvicorn.Config(app, port=port, lifespan="off", log_level="warning"))
+            server_task = asyncio.create_task(server.serve())
+            while not server.started:
+                await asyncio.sleep(0.01)
+            client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=60)
+        else:
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60
+            )
+        try:
+            bench = Bench(client, args)
+            await bench.setup_users()
+            try:
+                for name in args.scenarios.split(","):
+                    print(f"running {name}...", flush=True)
+                    results["scenarios"][name] = await getattr(bench, name)()
+            finally:
+                await bench.cleanup()
+        finally:
+            await client.aclose()
+            if server is not None:
+                server.should_exit = True
+                await server_task
+    results["peak_rss_mib"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return results
+
+def print_results(results: dict, baseline: Optional[dict]) -> None:
+    def delta(now: float, before: Optional[float]) -> str:
+        if not before:
+            return ""
+        return f" ({(now - before) / before * 100:+.1f}%)"
+
+    print(f"{'scenario':<10} {'ok/req':>10} {'req/s':>18} {'MiB/s':>9} {'p50 ms':>9} {'p95 ms':>18} {'p99 ms':>9} {'rss MiB':>8}")
+    for name, s in results["scenarios"].items():
+        base = (baseline or {}).get("scenarios", {}).get(name, {})
+        print(
+            f"{name:<10} {s['succeeded']:>5}/{s['requests']:<4} "
+            f"{str(s['throughput_rps']) + delta(s['throughput_rps'], base.get('throughput_rps')):>18} "
+            f"{s['throughput_mib_s']:>9} {s['latency_ms']['p50']:>9} "
+            f"{str(s['latency_ms']['p95']) + delta(s['latency_ms']['p95'], base.get('latency_ms', {}).get('p95')):>18} "
+            f"{s['latency_ms']['p99']:>9} {s['peak_rss_mib']:>8}"
+        )
+        if s["errors"]:
+            print(f"{'':<10} errors: {s['errors']}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="End-to-end benchmarks for the audio service")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument("--transport", choices=["asgi", "http"], default="asgi",
+                        help="call the app directly or through an in-process uvicorn socket")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--auth-requests", type=int, default=32, help="requests for the bcrypt-bound login scenario")
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--upload-sizes", default="256K,1M,8M")
+    parser.add_argument("--download-size", default="8M")
+    parser.add_argument("--range-size", default="64K")
+    parser.add_argument("--listing-rows", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--processing", action="store_true",
+                        help="keep the in-app processing worker running during the benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON to print deltas against")
+    args = parser.parse_args()
+    unknown = set(args.scenarios.split(",")) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    if not args.processing:
+        os.environ["PROCESSING_ENABLED"] = "false"
+
+    results = asyncio.run(run(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,72 @@
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import FastAPI
-from src.core.database import init_db, shutdown_db
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from src.audio.cache import PUBLIC_LISTING_CHANNEL, public_listing_cache
+from src.audio.processing import create_processing_worker
+from src.core.admission import AdmissionRejected, admission
+from src.core.config.config import settings
+from src.core.database import has_extension, init_db, shutdown_db
+from src.core.metrics import MetricsMiddleware, instrument_default_executor
+from src.core.notifications import notifier
+from src.core.query_profiler import QueryProfilingMiddleware
+from src.core.scheduler import scheduler
+from src.core.storage.service import storage_backend
+from src.quotas.service import repair_usage_drift
 from src.routes import api_router
+from src.shared.clients.yandex import yandex_client
+from src.shared.utils.password_utils import PasswordHasherBusy, password_hasher
+from src.uploads.service import purge_expired_upload_sessions
+from src.users.cache import USER_CACHE_CHANNEL, user_cache
+
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    if settings.metrics.enabled:
+        instrument_default_executor(asyncio.get_running_loop())
     await init_db()
+    if settings.search.fuzzy and not await has_extension("pg_trgm"):
+        # The migration skips the trigram index without pg_trgm; rank by full text only.
+        logger.warning("pg_trgm is not installed, title search falls back to full-text ranking")
+        settings.search.fuzzy = False
+    scheduler.add_job(
+        "purge_expired_upload_sessions",
+        settings.storage.upload_session_gc_interval,
+        purge_expired_upload_sessions
+    )
+    scheduler.add_job("repair_usage_drift", settings.quota.repair_interval, repair_usage_drift)
+    scheduler.add_job("purge_rate_limits", 10 * 60, admission.store.purge)
+    await scheduler.start()
+    if settings.auth.user_cache_notify:
+        notifier.subscribe(USER_CACHE_CHANNEL, user_cache.handle_notification, reset=user_cache.clear)
+    if settings.cache.public_listing_notify:
+        notifier.subscribe(
+            PUBLIC_LISTING_CHANNEL,
+            public_listing_cache.handle_notification,
+            reset=public_listing_cache.invalidate
+        )
+    await notifier.start()
+    await yandex_client.start()
+    executor, worker = None, None
+    if settings.processing.enabled:
+        executor = ProcessPoolExecutor(max_workers=settings.processing.workers)
+        worker = create_processing_worker(executor)
+        await worker.start()
     yield
+    if worker is not None:
+        await worker.stop()
+        executor.shutdown(cancel_futures=True)
+    await yandex_client.close()
+    await notifier.stop()
+    password_hasher.shutdown()
+    await scheduler.shutdown()
+    await admission.close()
+    await storage_backend.close()
     await shutdown_db()
 
 app = FastAPI(
@@ -27,4 +86,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(api_router, prefix="/api")
\ No newline at end of file
+if settings.db.query_profiling:
+    app.add_middleware(QueryProfilingMiddleware)
+
+if settings.metrics.enabled:
+    app.add_middleware(MetricsMiddleware)
+
+app.include_router(api_router, prefix="/api")
+
+if settings.metrics.enabled:
+    @app.get(settings.metrics.path, include_in_schema=False)
+    async def metrics():
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many concurrent authentication requests"},
+        headers={"Retry-After": "1"}
+    )
+
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
@@ -0,0 +1,19 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config.config import settings
+from src.core.database import run_after_commit
+from src.core.notifications import notify
+from src.core.response_cache import ResponseCache
+
+PUBLIC_LISTING_CHANNEL = "public_audio_changed"
+
+public_listing_cache = ResponseCache(
+    settings.cache.public_listing_max_bytes,
+    settings.cache.public_listing_ttl
+)
+
+async def invalidate_public_listing(session: AsyncSession) -> None:
+    """Drop cached public pages once the session's transaction commits."""
+    run_after_commit(session, public_listing_cache.invalidate)
+    if settings.cache.public_listing_notify:
+        await notify(session, PUBLIC_LISTING_CHANNEL, "")
@@ -0,0 +1,161 @@
+import os
+from email.utils import format_datetime
+from typing import Optional
+from urllib.parse import quote
+from fastapi import HTTPException, status
+from fastapi.responses import Response, StreamingResponse
+
+from src.audio.seek import SEEK_ENTRY, SEEK_HEADER, SEEK_MAGIC, seek_entry_range, seek_index_key
+from src.core.config.config import settings
+from src.core.metrics import OFFLOADED_DOWNLOADS, metered_download
+from src.core.storage.ranges import MultipartRanges, RangeNotSatisfiable, content_range, parse_range_header
+from src.core.storage.service import StorageService, storage_backend
+
+def content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+def file_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Audio file not found on server"
+    )
+
+class AudioDelivery:
+    """Builds file responses (full, ranged, multipart, time-seek) for a storage key.
+
+    Needs nothing but storage, so it serves both authenticated and signed
+    downloads. In ``x-accel-redirect``/``x-sendfile`` mode files the proxy can
+    reach are handed to it with an empty response and the proxy streams the
+    bytes (and answers ``Range``) itself; everything else is streamed here.
+    """
+
+    def __init__(
+        self,
+        storage: StorageService,
+        mode: str = "stream",
+        accel_redirect_prefix: str = "/_protected/audio/",
+        sendfile_root: str = ''
+    ):
+        self.storage = storage
+        self.mode = mode
+        self.accel_redirect_prefix = accel_redirect_prefix.rstrip("/") + "/"
+        self.sendfile_root = sendfile_root
+
+    async def respond(
+        self,
+        key: str,
+        media_type: str,
+        filename: str,
+        etag: str,
+        range_header: Optional[str] = None,
+        if_range: Optional[str] = None,
+        seek_seconds: Optional[float] = None,
+        extra_headers: Optional[dict[str, str]] = None
+    ) -> Response:
+        stat = await self.storage.backend.stat(key)
+        if stat is None:
+            raise file_not_found()
+        last_modified = format_datetime(stat.modified, usegmt=True)
+        headers = {
+            "Accept-Ranges": "bytes",
+            "ETag": etag,
+            "Last-Modified": last_modified,
+            "Content-Disposition": content_disposition(filename),
+            **(extra_headers or {}),
+        }
+        if range_header is not None or seek_seconds is None:
+            offload = self._offload_header(key)
+            if offload is not None:
+                OFFLOADED_DOWNLOADS.labels(self.mode).inc()
+                # The proxy answers Range/If-Range from the client's own headers; only
+                # a ?t= seek needs a range computed here, so that one is streamed.
+                return Response(media_type=media_type, headers={**headers, **offload})
+        if range_header is None and seek_seconds is not None:
+            offset = await self.seek_offset(key, seek_seconds)
+            # An unreadable index entry degrades to the whole file rather than a 500.
+            range_header = f"bytes={offset}-" if offset is not None else None
+        elif if_range is not None and if_range not in (etag, last_modified):
+            range_header = None
+        ranges = None
+        if range_header is not None:
+            try:
+                ranges = parse_range_header(range_header, stat.size)
+            except RangeNotSatisfiable:
+                return Response(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    headers={"Content-Range": f"bytes */{stat.size}"}
+                )
+        if ranges is None:
+            return StreamingResponse(
+                metered_download(self.storage.backend.get_stream(key)),
+                media_type=media_type,
+                headers={**headers, "Content-Length": str(stat.size)}
+            )
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            return StreamingResponse(
+                metered_download(self.storage.backend.get_stream(key, offset=start, length=end - start)),
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                media_type=media_type,
+                headers={
+                    **headers,
+                    "Content-Range": content_range(start, end, stat.size),
+                    "Content-Length": str(end - start),
+                }
+            )
+        body = MultipartRanges(self.storage.backend, key, ranges, stat.size, media_type)
+        return StreamingResponse(
+            metered_download(body),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=body.content_type,
+            headers={**headers, "Content-Length": str(body.content_length)}
+        )
+
+    def _offload_header(self, key: str) -> Optional[dict[str, str]]:
+        if self.mode == "stream":
+            return None
+        path = self.storage.backend.local_path(key)
+        if path is None:
+            return None
+        if self.mode == "x-accel-redirect":
+            return {"X-Accel-Redirect": self.accel_redirect_prefix + quote(key)}
+        if self.sendfile_root:
+            path = os.path.join(self.sendfile_root, key)
+        return {"X-Sendfile": path}
+
+    async def seek_offset(self, key: str, seconds: float) -> Optional[int]:
+        """Byte offset of the frame at ``seconds``, or ``None`` if the index entry cannot be read."""
+        index_key = seek_index_key(key)
+        header = await self.storage.read_bytes(index_key, length=SEEK_HEADER.size)
+        if header is None or len(header) < SEEK_HEADER.size or header[:4] != SEEK_MAGIC:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Time-based seek is not available for this audio"
+            )
+        _, _, entries = SEEK_HEADER.unpack(header)
+        if not entries:
+            return None
+        offset, length = seek_entry_range(seconds)
+        offset = min(offset, SEEK_HEADER.size + (entries - 1) * SEEK_ENTRY.size)
+        # A truncated sidecar (or one left behind by a move) can end before the entry.
+        entry = await self.storage.read_bytes(index_key, offset=offset, length=length)
+        if entry is None or len(entry) != SEEK_ENTRY.size:
+            return None
+        return SEEK_ENTRY.unpack(entry)[0]
+
+def create_audio_delivery(storage: Optional[StorageService] = None) -> AudioDelivery:
+    if storage is None:
+        storage = StorageService(
+            storage_backend,
+            settings.storage.staging_dir,
+            chunk_size=settings.storage.upload_chunk_size
+        )
+    return AudioDelivery(
+        storage,
+        mode=settings.storage.delivery_mode,
+        accel_redirect_prefix=settings.storage.accel_redirect_prefix,
+        sendfile_root=settings.storage.sendfile_root
+    )
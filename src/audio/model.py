@@ -1,22 +1,51 @@
 import uuid
-from sqlalchemy import UUID, Boolean, Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import UUID, BigInteger, Boolean, Column, Computed, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from src.shared.models.base import Base
 from src.users.model import User 
 
+class AudioStatus:
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+    MISSING = "missing"
+
+class AudioBlob(Base):
+    __tablename__ = "audio_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    file_path = Column(String, nullable=False)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
 class Audio(Base):
     __tablename__ = "audios"
+    __table_args__ = (
+        Index("ix_audios_is_public_created_at_id", "is_public", "created_at", "id"),
+        Index("ix_audios_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_audios_title_search", "title_search", postgresql_using="gin"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     title = Column(String, nullable=False)
+    # 'simple' rather than a language config: titles are mixed-language names, not prose.
+    title_search = deferred(Column(TSVECTOR, Computed("to_tsvector('simple', title)", persisted=True)))
     duration = Column(Integer)
     size = Column(Integer)
     format = Column(String(10))
+    status = Column(String(20), nullable=False, default=AudioStatus.PENDING)
+    bitrate = Column(Integer)
+    sample_rate = Column(Integer)
+    channels = Column(Integer)
+    codec = Column(String(32))
     is_public = Column(Boolean, default=False)
     file_path = Column(String, nullable=False)
+    content_hash = Column(String(64), ForeignKey("audio_blobs.sha256"), nullable=True, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    user = relationship("User", back_populates="audios")
\ No newline at end of file
+    user = relationship("User", back_populates="audios")
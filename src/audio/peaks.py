@@ -0,0 +1,93 @@
+import struct
+from typing import Iterable, Optional
+import av
+import numpy as np
+
+# Peaks are stored in the audiowaveform ``.dat`` (version 1) layout so that
+# players such as peaks.js can consume the sidecars without conversion:
+# version, flags (bit 0 set for 8-bit samples), sample rate, samples per
+# pixel and pair count, followed by interleaved min/max values.
+DAT_HEADER = struct.Struct("<iIiiI")
+DAT_VERSION = 1
+DAT_FLAG_8_BIT = 0x1
+
+# Decoded samples are first reduced to min/max of fixed-size blocks, every
+# resolution is then aggregated from these blocks instead of the raw signal.
+BLOCK_SIZE = 256
+
+def peaks_key(key: str, resolution: int) -> str:
+    return f"{key}.peaks.{resolution}.dat"
+
+def _decode_blocks(path: str) -> tuple[int, np.ndarray, np.ndarray]:
+    mins: list[np.ndarray] = []
+    maxs: list[np.ndarray] = []
+    carry = np.empty(0, dtype=np.float32)
+    with av.open(path) as container:
+        stream = container.streams.audio[0]
+        sample_rate = stream.rate
+        resampler = av.AudioResampler(format="flt", layout="mono", rate=sample_rate)
+        try:
+            for frame in container.decode(stream):
+                for resampled in resampler.resample(frame):
+                    samples = np.concatenate((carry, resampled.to_ndarray()[0]))
+                    usable = len(samples) - len(samples) % BLOCK_SIZE
+                    blocks = samples[:usable].reshape(-1, BLOCK_SIZE)
+                    mins.append(blocks.min(axis=1))
+                    maxs.append(blocks.max(axis=1))
+                    carry = samples[usable:]
+        except av.error.InvalidDataError:
+            # Truncated or damaged tail: keep what was decoded so far.
+            pass
+    if len(carry):
+        mins.append(carry.min(keepdims=True))
+        maxs.append(carry.max(keepdims=True))
+    if not mins:
+        return sample_rate, np.empty(0, np.float32), np.empty(0, np.float32)
+    return sample_rate, np.concatenate(mins), np.concatenate(maxs)
+
+def _aggregate(mins: np.ndarray, maxs: np.ndarray, resolution: int) -> tuple[int, np.ndarray, np.ndarray]:
+    blocks_per_pixel = max(1, -(-len(mins) // resolution))
+    pad = -len(mins) % blocks_per_pixel
+    if pad:
+        mins = np.pad(mins, (0, pad), constant_values=mins[-1])
+        maxs = np.pad(maxs, (0, pad), constant_values=maxs[-1])
+    return (
+        blocks_per_pixel,
+        mins.reshape(-1, blocks_per_pixel).min(axis=1),
+        maxs.reshape(-1, blocks_per_pixel).max(axis=1)
+    )
+
+def _encode_dat(
+    sample_rate: int,
+    samples_per_pixel: int,
+    mins: np.ndarray,
+    maxs: np.ndarray,
+    bits: int
+) -> bytes:
+    scale, dtype = (127, "<i1") if bits == 8 else (32767, "<i2")
+    pairs = np.empty(len(mins) * 2, dtype=np.float32)
+    pairs[0::2] = mins
+    pairs[1::2] = maxs
+    data = np.clip(np.rint(pairs * scale), -scale, scale).astype(dtype)
+    flags = DAT_FLAG_8_BIT if bits == 8 else 0
+    header = DAT_HEADER.pack(DAT_VERSION, flags, sample_rate, samples_per_pixel, len(mins))
+    return header + data.tobytes()
+
+def compute_peaks(path: str, resolutions: Iterable[int], bits: int) -> Optional[dict[int, bytes]]:
+    """Decode ``path`` once and encode min/max peaks for every resolution.
+
+    Runs inside a worker process. Returns ``None`` when the file cannot be decoded.
+    """
+    try:
+        sample_rate, mins, maxs = _decode_blocks(path)
+    except (av.error.FFmpegError, IndexError):
+        return None
+    if not len(mins):
+        return None
+    peaks = {}
+    for resolution in resolutions:
+        blocks_per_pixel, level_mins, level_maxs = _aggregate(mins, maxs, resolution)
+        peaks[resolution] = _encode_dat(
+            sample_rate, blocks_per_pixel * BLOCK_SIZE, level_mins, level_maxs, bits
+        )
+    return peaks
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import Any, Iterable, List, Optional
+from uuid import UUID
+import mutagen
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.audio.cache import invalidate_public_listing
+from src.audio.model import Audio, AudioStatus
+from src.audio.peaks import compute_peaks, peaks_key
+from src.audio.seek import build_seek_index, seek_index_key
+from src.core.config.config import settings
+from src.core.metrics import PROCESSING_DURATION
+from src.core.storage.service import StorageError, StorageService, storage_backend
+from src.jobs.model import Job
+from src.jobs.service import JobQueue
+from src.jobs.worker import JobWorker
+
+logger = logging.getLogger(__name__)
+
+METADATA_JOB = "audio.metadata"
+PEAKS_JOB = "audio.peaks"
+SEEK_INDEX_JOB = "audio.seek_index"
+FILE_DELETE_JOB = "storage.delete"
+
+# Formats whose frames the seek index scanner understands.
+SEEKABLE_FORMATS = {"mp3"}
+
+# Every row in the bulk UPDATE carries the same columns so the ORM can send
+# the whole batch as a single executemany.
+EMPTY_METADATA = dict.fromkeys(("duration", "bitrate", "sample_rate", "channels", "codec"))
+
+def probe_audio(path: str) -> Optional[dict[str, Any]]:
+    """Read stream properties with mutagen; runs inside a worker process."""
+    try:
+        audio = mutagen.File(path)
+    except mutagen.MutagenError:
+        return None
+    if audio is None or audio.info is None:
+        return None
+    info = audio.info
+    codec = getattr(info, "codec", None) or type(audio).__name__.lower()
+    return {
+        "duration": int(getattr(info, "length", 0) or 0),
+        "bitrate": getattr(info, "bitrate", None) or None,
+        "sample_rate": getattr(info, "sample_rate", None) or None,
+        "channels": getattr(info, "channels", None) or None,
+        "codec": codec[:32],
+    }
+
+def enqueue_processing_jobs(queue: JobQueue, audio_id: UUID, file_ext: str) -> None:
+    kinds = [METADATA_JOB, PEAKS_JOB]
+    if file_ext.lower() in SEEKABLE_FORMATS:
+        kinds.append(SEEK_INDEX_JOB)
+    for kind in kinds:
+        queue.enqueue(kind, {"audio_id": str(audio_id)})
+
+def enqueue_file_removals(queue: JobQueue, keys: Iterable[str], run_at: Optional[datetime] = None) -> None:
+    for key in keys:
+        queue.enqueue(FILE_DELETE_JOB, {"key": key}, run_at=run_at)
+
+class FileDeleteProcessor:
+    """Retries removal of stored files whose deletion failed during a request."""
+
+    def __init__(self):
+        self.storage = StorageService(storage_backend, settings.storage.staging_dir)
+
+    async def __call__(self, session: AsyncSession, jobs: List[Job]) -> dict[int, str]:
+        failures = await self.storage.delete_many(
+            (job.payload["key"] for job in jobs),
+            settings.storage.delete_concurrency
+        )
+        return {job.id: failures[job.payload["key"]] for job in jobs if job.payload["key"] in failures}
+
+class AudioJobProcessor(ABC):
+    """Runs a per-file step for a batch of jobs and collects the outcomes."""
+
+    def __init__(self, executor: Executor):
+        self.executor = executor
+        self.storage = StorageService(
+            storage_backend,
+            settings.storage.staging_dir,
+            chunk_size=settings.storage.upload_chunk_size
+        )
+
+    async def __call__(self, session: AsyncSession, jobs: List[Job]) -> dict[int, str]:
+        ids = {job.id: UUID(job.payload["audio_id"]) for job in jobs}
+        result = await session.execute(
+            select(Audio.id, Audio.file_path).where(Audio.id.in_(ids.values()))
+        )
+        keys = {row.id: row.file_path for row in result}
+        # Jobs for audios deleted in the meantime are simply dropped.
+        ids = {job_id: audio_id for job_id, audio_id in ids.items() if audio_id in keys}
+        timer = PROCESSING_DURATION.labels(jobs[0].kind)
+        outcomes = await asyncio.gather(
+            *(self._timed(timer, keys[audio_id]) for audio_id in ids.values()),
+            return_exceptions=True
+        )
+        failures: dict[int, str] = {}
+        results: dict[UUID, Any] = {}
+        for (job_id, audio_id), outcome in zip(ids.items(), outcomes):
+            if isinstance(outcome, Exception):
+                failures[job_id] = f"{type(outcome).__name__}: {outcome}"
+            else:
+                results[audio_id] = outcome
+        await self.save(session, results)
+        return failures
+
+    async def _timed(self, timer, key: str) -> Any:
+        with timer.time():
+            return await self.process(key)
+
+    @abstractmethod
+    async def process(self, key: str) -> Any:
+        """Compute this step's result for the stored file ``key``."""
+
+    async def save(self, session: AsyncSession, results: dict[UUID, Any]) -> None:
+        pass
+
+    async def _run_on_file(self, key: str, func, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        try:
+            async with self.storage.local_copy(key) as path:
+                return await loop.run_in_executor(self.executor, func, path, *args)
+        except (FileNotFoundError, StorageError):
+            logger.warning("Audio file %s is missing", key)
+            return None
+
+class MetadataProcessor(AudioJobProcessor):
+    async def process(self, key: str) -> Optional[dict[str, Any]]:
+        return await self._run_on_file(key, probe_audio)
+
+    async def save(self, session: AsyncSession, results: dict[UUID, Any]) -> None:
+        values = [
+            {"id": audio_id, "status": AudioStatus.READY, **metadata}
+            if metadata is not None
+            else {"id": audio_id, "status": AudioStatus.FAILED, **EMPTY_METADATA}
+            for audio_id, metadata in results.items()
+        ]
+        if values:
+            await session.execute(update(Audio), values)
+            await invalidate_public_listing(session)
+
+class PeaksProcessor(AudioJobProcessor):
+    async def process(self, key: str) -> bool:
+        resolutions = settings.processing.peaks_resolutions
+        # Content-addressed blobs are shared, so their sidecars may already exist.
+        if await self.storage.backend.exists(peaks_key(key, resolutions[-1])):
+            return True
+        peaks = await self._run_on_file(key, compute_peaks, resolutions, settings.processing.peaks_bits)
+        if peaks is None:
+            return False
+        for resolution, data in peaks.items():
+            await self.storage.put_bytes(peaks_key(key, resolution), data)
+        return True
+
+class SeekIndexProcessor(AudioJobProcessor):
+    async def process(self, key: str) -> bool:
+        index_key = seek_index_key(key)
+        if await self.storage.backend.exists(index_key):
+            return True
+        index = await self._run_on_file(key, build_seek_index)
+        if index is None:
+            return False
+        await self.storage.put_bytes(index_key, index)
+        return True
+
+def create_processing_worker(executor: Executor) -> JobWorker:
+    return JobWorker(
+        handlers={
+            METADATA_JOB: MetadataProcessor(executor),
+            PEAKS_JOB: PeaksProcessor(executor),
+            SEEK_INDEX_JOB: SeekIndexProcessor(executor),
+            FILE_DELETE_JOB: FileDeleteProcessor(),
+        },
+        batch_size=settings.processing.batch_size,
+        poll_interval=settings.processing.poll_interval,
+        lease_seconds=settings.processing.lease_seconds
+    )
@@ -1,46 +1,111 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+import time
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated, Optional
 from uuid import UUID
+from starlette.datastructures import UploadFile as StarletteUploadFile
 
+from src.core.admission import admit_download, admit_signed_download, admit_upload
+from src.core.config.config import settings
 from src.core.database import get_db
-from src.shared.utils.get_current_user import get_current_user
+from src.shared.utils.get_current_user import get_current_user, get_optional_user
 from src.users.model import User
-from src.audio.schema import AudioInDB
+from src.audio.delivery import create_audio_delivery
+from src.audio.schema import (AudioBatchDelete, AudioBatchDeleteResult, AudioCreate, AudioDownloadUrl, AudioInDB,
+                              AudioListParams, AudioPage, AudioSearchPage, AudioSearchParams)
 from src.audio.service import AudioService
+from src.audio.signed_urls import DownloadGrant, DownloadUrlExpired, InvalidDownloadSignature, download_signer
+from src.quotas.service import QuotaService
+from src.shared.utils.serialization import FastJSONResponse, page_body
 
 AudioRouter = APIRouter(tags=["Audio"])
 
-@AudioRouter.post("/upload", response_model=AudioInDB, status_code=201)
+UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["file", "title"],
+            "properties": {
+                "file": {"type": "string", "format": "binary"},
+                "title": {"type": "string"},
+                "is_public": {"type": "boolean", "default": False},
+            },
+        }}},
+    }
+}
+
+@AudioRouter.post(
+    "/upload",
+    response_model=AudioInDB,
+    status_code=201,
+    openapi_extra=UPLOAD_REQUEST_BODY,
+    dependencies=[Depends(admit_upload)]
+)
 async def upload_audio(
-    file: UploadFile = File(...),
-    title: str = Form(...),
-    is_public: bool = Form(False),
+    request: Request,
+    content_length: Optional[int] = Header(None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    service = AudioService(db)
-    audio = await service.upload_audio_file(
-        file=file,
-        title=title,
-        is_public=is_public,
-        user_id=current_user.id
-    )
+    # No File/Form parameters: FastAPI would read the whole body before this
+    # runs. Parsing the form here lets an over-quota upload be refused from
+    # its Content-Length before any of it is received.
+    await QuotaService(db).check_upload(current_user.id, content_length, settings.quota.multipart_overhead)
+    # End the read transaction so no pooled connection is held while the body arrives.
+    await db.commit()
+    async with request.form(max_files=1) as form:
+        file = form.get("file")
+        try:
+            fields = AudioCreate.model_validate({key: value for key, value in form.items() if key != "file"})
+        except ValidationError as e:
+            raise RequestValidationError(e.errors(include_url=False))
+        if not isinstance(file, StarletteUploadFile):
+            raise RequestValidationError([{"type": "missing", "loc": ("body", "file"), "msg": "Field required"}])
+        service = AudioService(db)
+        audio = await service.upload_audio_file(
+            file=file,
+            title=fields.title,
+            is_public=fields.is_public,
+            user_id=current_user.id
+        )
     return AudioInDB.model_validate(audio)
 
-@AudioRouter.get("/me", response_model=list[AudioInDB])
+@AudioRouter.get("/me", response_model=AudioPage)
 async def get_my_audios(
+    params: Annotated[AudioListParams, Query()],
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     service = AudioService(db)
-    audios = await service.get_user_audios(current_user.id)
-    return [AudioInDB.model_validate(a) for a in audios]
+    rows, next_cursor = await service.get_user_audios(current_user.id, params)
+    return FastJSONResponse(page_body(rows, next_cursor))
 
-@AudioRouter.get("/public", response_model=list[AudioInDB])
-async def get_public_audios(db: AsyncSession = Depends(get_db)):
+@AudioRouter.get("/public", response_model=AudioPage)
+async def get_public_audios(
+    params: Annotated[AudioListParams, Query()],
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
     service = AudioService(db)
-    audios = await service.get_public_audios()
-    return [AudioInDB.model_validate(a) for a in audios]
+    return await service.get_public_audio_page(params, if_none_match)
+
+@AudioRouter.get("/search", response_model=AudioSearchPage)
+async def search_audios(
+    params: Annotated[AudioSearchParams, Query()],
+    db: AsyncSession = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
+    service = AudioService(db)
+    rows, next_cursor = await service.search_audios(
+        params,
+        user_id=current_user.id if current_user else None,
+        is_superuser=current_user.is_superuser if current_user else False
+    )
+    return FastJSONResponse(page_body(rows, next_cursor))
 
 @AudioRouter.delete("/{audio_id}", status_code=204)
 async def delete_audio(
@@ -51,9 +116,22 @@ async def delete_audio(
     service = AudioService(db)
     await service.delete_user_audio(audio_id, current_user.id, current_user.is_superuser)
 
-@AudioRouter.get("/download/{audio_id}")
+@AudioRouter.post("/batch-delete", response_model=AudioBatchDeleteResult)
+async def batch_delete_audios(
+    data: AudioBatchDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    service = AudioService(db)
+    results = await service.delete_user_audios(data.ids, current_user.id, current_user.is_superuser)
+    return AudioBatchDeleteResult(results=results)
+
+@AudioRouter.get("/download/{audio_id}", dependencies=[Depends(admit_download)])
 async def download_audio(
     audio_id: UUID,
+    t: Optional[float] = Query(None, ge=0, description="Start playback at this many seconds"),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -61,5 +139,66 @@ async def download_audio(
     return await service.download_audio_file(
         audio_id=audio_id,
         user_id=current_user.id if current_user else None,
-        is_superuser=current_user.is_superuser if current_user else False
+        is_superuser=current_user.is_superuser if current_user else False,
+        range_header=range_header,
+        if_range=if_range,
+        seek_seconds=t
+    )
+
+@AudioRouter.get("/{audio_id}/download-url", response_model=AudioDownloadUrl, dependencies=[Depends(admit_download)])
+async def create_download_url(
+    audio_id: UUID,
+    request: Request,
+    bind_client: bool = Query(False, description="Only accept the URL from the requesting client address"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    service = AudioService(db)
+    client = request.client.host if bind_client and request.client else None
+    token, expires = await service.sign_download(audio_id, current_user.id, current_user.is_superuser, client)
+    return AudioDownloadUrl(
+        url=str(request.url_for("download_signed_audio", token=token)),
+        expires_at=datetime.fromtimestamp(expires, tz=timezone.utc)
+    )
+
+async def signed_download_grant(token: str, request: Request) -> DownloadGrant:
+    # No database or user lookup: the signature is the authorization.
+    client = request.client.host if request.client else None
+    try:
+        grant = download_signer.verify(token, client)
+    except DownloadUrlExpired as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+    except InvalidDownloadSignature as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    await admit_signed_download(grant.audio_id, client)
+    return grant
+
+@AudioRouter.get("/signed/{token}", name="download_signed_audio")
+async def download_signed_audio(
+    grant: DownloadGrant = Depends(signed_download_grant),
+    t: Optional[float] = Query(None, ge=0, description="Start playback at this many seconds"),
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None)
+):
+    max_age = max(grant.expires - int(time.time()), 0)
+    return await create_audio_delivery().respond(
+        grant.key, grant.media_type, grant.filename, grant.etag, range_header, if_range, t,
+        extra_headers={"Cache-Control": f"private, max-age={max_age}"}
+    )
+
+@AudioRouter.get("/{audio_id}/peaks")
+async def get_audio_peaks(
+    audio_id: UUID,
+    resolution: Optional[int] = Query(None, gt=0, description="Desired number of min/max pairs"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    service = AudioService(db)
+    return await service.get_audio_peaks(
+        audio_id=audio_id,
+        resolution=resolution,
+        if_none_match=if_none_match,
+        user_id=current_user.id,
+        is_superuser=current_user.is_superuser
     )
\ No newline at end of file
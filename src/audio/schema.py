@@ -1,7 +1,11 @@
-from pydantic import BaseModel
+from enum import Enum
+from typing import Optional
+from pydantic import BaseModel, Field
 from uuid import UUID
 from datetime import datetime
 
+from src.core.config.config import settings
+
 class AudioBase(BaseModel):
     title: str
     is_public: bool = False
@@ -12,12 +16,69 @@ class AudioCreate(AudioBase):
 class AudioInDB(AudioBase):
     id: UUID
     user_id: UUID
-    duration: int
+    duration: int | None = None
     size: int
     format: str
     file_path: str
+    status: str
+    bitrate: int | None = None
+    sample_rate: int | None = None
+    channels: int | None = None
+    codec: str | None = None
     created_at: datetime | None = None
     updated_at: datetime | None = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class AudioSort(str, Enum):
+    NEWEST = "-created_at"
+    OLDEST = "created_at"
+
+class AudioListParams(BaseModel):
+    limit: int = Field(50, ge=1, le=100)
+    cursor: Optional[str] = None
+    format: Optional[str] = None
+    min_duration: Optional[int] = Field(None, ge=0)
+    max_duration: Optional[int] = Field(None, ge=0)
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    sort: AudioSort = AudioSort.NEWEST
+
+class AudioSearchHit(AudioInDB):
+    rank: float
+
+class AudioSearchPage(BaseModel):
+    items: list[AudioSearchHit]
+    next_cursor: Optional[str] = None
+
+class AudioSearchParams(BaseModel):
+    q: str = Field(..., min_length=1, max_length=settings.search.max_query_length)
+    limit: int = Field(20, ge=1, le=100)
+    cursor: Optional[str] = None
+
+class AudioPage(BaseModel):
+    items: list[AudioInDB]
+    next_cursor: Optional[str] = None
+
+
+class AudioBatchDelete(BaseModel):
+    ids: list[UUID] = Field(..., min_length=1, max_length=settings.storage.batch_delete_max_ids)
+
+class AudioDeleteStatus(str, Enum):
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
+    FORBIDDEN = "forbidden"
+
+class AudioDeleteResult(BaseModel):
+    id: UUID
+    status: AudioDeleteStatus
+    # True when removing the stored files failed and was queued for retry.
+    files_pending: bool = False
+
+class AudioBatchDeleteResult(BaseModel):
+    results: list[AudioDeleteResult]
+
+class AudioDownloadUrl(BaseModel):
+    url: str
+    expires_at: datetime
@@ -0,0 +1,117 @@
+import mmap
+import struct
+import sys
+from array import array
+from typing import Optional
+
+# Seek index sidecar: magic, interval in milliseconds and entry count,
+# followed by little-endian uint64 byte offsets of the first frame at or
+# after every ``interval`` boundary, so ``t`` maps to an entry directly.
+SEEK_MAGIC = b"SEEK"
+SEEK_HEADER = struct.Struct("<4sII")
+SEEK_ENTRY = struct.Struct("<Q")
+SEEK_INTERVAL_MS = 1000
+
+# Minimum number of consecutive frame headers before a sync word is trusted,
+# otherwise random bytes in the first frame could start the scan.
+MIN_SYNC_FRAMES = 3
+
+_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+def seek_index_key(key: str) -> str:
+    return f"{key}.seek"
+
+def _frame_info(header: int) -> Optional[tuple[int, int, int]]:
+    """Return (frame length, samples per frame, sample rate) for an MPEG audio header."""
+    if header >> 21 != 0x7FF:
+        return None
+    version_bits = (header >> 19) & 0x3
+    layer = 4 - ((header >> 17) & 0x3)
+    bitrate_index = (header >> 12) & 0xF
+    sample_rate_index = (header >> 10) & 0x3
+    if version_bits == 1 or layer == 4 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    version = 1 if version_bits == 3 else 2
+    bitrate = _BITRATES[(version, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+    padding = (header >> 9) & 0x1
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate
+    samples = 576 if layer == 3 and version == 2 else 1152
+    return samples // 8 * bitrate // sample_rate + padding, samples, sample_rate
+
+def _audio_start(data: mmap.mmap) -> int:
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = data[6] << 21 | data[7] << 14 | data[8] << 7 | data[9]
+        footer = 10 if data[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+def _find_sync(data: mmap.mmap, position: int) -> Optional[int]:
+    end = len(data) - 4
+    while position < end:
+        position = data.find(b"\xff", position, end)
+        if position < 0:
+            return None
+        candidate = position
+        for _ in range(MIN_SYNC_FRAMES):
+            info = _frame_info(int.from_bytes(data[candidate:candidate + 4], "big"))
+            if info is None:
+                break
+            candidate += info[0]
+            if candidate > end:
+                return position
+        else:
+            return position
+        position += 1
+    return None
+
+def build_seek_index(path: str) -> Optional[bytes]:
+    """Scan MPEG audio frames and record byte offsets every ``SEEK_INTERVAL_MS``.
+
+    Runs inside a worker process. Returns ``None`` if ``path`` is not MPEG audio.
+    """
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None
+        with data:
+            position = _find_sync(data, _audio_start(data))
+            if position is None:
+                return None
+            offsets = array("Q")
+            elapsed = 0.0
+            next_mark = 0.0
+            end = len(data) - 4
+            while position <= end:
+                info = _frame_info(int.from_bytes(data[position:position + 4], "big"))
+                if info is None:
+                    position = _find_sync(data, position + 1)
+                    if position is None:
+                        break
+                    continue
+                length, samples, sample_rate = info
+                if elapsed >= next_mark:
+                    offsets.append(position)
+                    next_mark += SEEK_INTERVAL_MS / 1000
+                elapsed += samples / sample_rate
+                position += length
+    if not offsets:
+        return None
+    if sys.byteorder == "big":
+        offsets.byteswap()
+    return SEEK_HEADER.pack(SEEK_MAGIC, SEEK_INTERVAL_MS, len(offsets)) + offsets.tobytes()
+
+def seek_entry_range(seconds: float) -> tuple[int, int]:
+    """Byte range of the index entry that covers ``seconds``."""
+    entry = int(seconds * 1000 // SEEK_INTERVAL_MS)
+    return SEEK_HEADER.size + entry * SEEK_ENTRY.size, SEEK_ENTRY.size
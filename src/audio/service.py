@@ -1,46 +1,89 @@
-import os
+import re
+import time
 import uuid
-import asyncio
+import logging
+from collections import Counter
 from typing import List, Optional
 from uuid import UUID
-from fastapi.responses import FileResponse
-from mutagen.mp3 import MP3
+from fastapi.responses import Response
 from fastapi import Path, UploadFile, HTTPException, status
+from sqlalchemy import Double, Integer, Row, String, cast, column, delete, func, literal, or_, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from pathlib import Path as PathLib
-import aiofiles
 
-from src.core.storage.service import StorageService
+from src.core.storage.service import (FileTooLargeError, StagedFile,
+                                      StorageService, StoredFile, storage_backend)
 from src.core.config.config import settings
-from src.audio.model import Audio
-from src.shared.repositories.base import BaseRepository
+from src.core.metrics import SAVE_DURATION, observe_upload
+from src.audio.model import Audio, AudioBlob, AudioStatus
+from src.audio.peaks import peaks_key
+from src.audio.delivery import create_audio_delivery
+from src.audio.signed_urls import DownloadGrant, download_signer
+from src.audio.cache import invalidate_public_listing, public_listing_cache
+from src.audio.schema import AudioDeleteResult, AudioDeleteStatus, AudioInDB, AudioListParams, AudioSearchParams, AudioSort
+from src.audio.processing import enqueue_file_removals, enqueue_processing_jobs
+from src.audio.seek import seek_index_key
+from src.jobs.service import JobQueue
+from src.quotas.service import QuotaService
+from src.shared.repositories.base import BaseRepository, any_of
+from src.shared.utils.pagination import InvalidCursor, decode_cursor, decode_rank_cursor, encode_cursor, encode_rank_cursor
+from src.shared.utils.serialization import page_body
+
+logger = logging.getLogger(__name__)
+
+PEAKS_MAX_AGE = 365 * 24 * 60 * 60
+
+# Listings select exactly the response fields, in schema order, so rows can
+# be encoded directly without loading ORM entities or re-validating them.
+AUDIO_LIST_COLUMNS = [getattr(Audio, name) for name in AudioInDB.model_fields]
+
+SEARCH_TERM = re.compile(r"\w+")
+SIDECAR_SUFFIX = re.compile(r"\.(?:peaks\.\d+\.dat|seek)$")
+
+def sidecar_keys(key: str) -> List[str]:
+    """Derived files stored next to the audio at ``key``."""
+    return [
+        *(peaks_key(key, resolution) for resolution in settings.processing.peaks_resolutions),
+        seek_index_key(key),
+    ]
+
+def sidecar_owner(key: str) -> str:
+    """The audio key a stored file belongs to: itself, or the key a sidecar was derived from."""
+    return SIDECAR_SUFFIX.sub("", key)
 
 class AudioService:
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.repository = BaseRepository(Audio, session)
         self.upload_dir = settings.storage.audio_upload_dir
-        self.storage = StorageService(settings.storage.audio_upload_dir)
+        self.storage = StorageService(
+            storage_backend,
+            settings.storage.staging_dir,
+            chunk_size=settings.storage.upload_chunk_size,
+            max_file_size=settings.storage.max_upload_size,
+            content_addressed=settings.storage.content_addressed,
+            shard_depth=settings.storage.shard_depth
+        )
+        self.delivery = create_audio_delivery(self.storage)
 
-    async def _get_audio_duration(self, file_path: str) -> int:
-        try:
-            return await asyncio.to_thread(lambda: int(MP3(file_path).info.length))
-        except Exception:
-            return 0
-
-    async def _save_audio_file(self, file: UploadFile) -> tuple[str, int, int, str]:
-        file_uuid = uuid.uuid4()
-        file_ext = file.filename.split('.')[-1] if '.' in file.filename else 'bin'
-        filename = f"{file_uuid}.{file_ext}"
-        file_path = await self.storage.get_full_path(filename)
+    async def _save_audio_file(self, file: UploadFile) -> tuple[StagedFile, str]:
+        file_ext = self._get_file_ext(file.filename)
         await self.storage.ensure_directory_exists()
-        contents = await file.read()
-        await self._write_file(file_path, contents)
-        duration = await self._get_audio_duration(file_path)
-        return file_path, duration, len(contents), file_ext
+        started = time.perf_counter()
+        try:
+            staged = await self.storage.stage_stream(file)
+        except FileTooLargeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds maximum upload size of {e.max_size} bytes"
+            )
+        elapsed = time.perf_counter() - started
+        SAVE_DURATION.observe(elapsed)
+        observe_upload(staged.size, elapsed)
+        return staged, file_ext
 
-    async def _write_file(self, file_path: str, contents: bytes):
-        async with aiofiles.open(file_path, "wb") as f:
-            await f.write(contents)
+    def _get_file_ext(self, filename: Optional[str]) -> str:
+        return filename.split('.')[-1] if filename and '.' in filename else 'bin'
 
     async def upload_audio_file(
         self,
@@ -49,26 +92,251 @@ class AudioService:
         is_public: bool,
         user_id: UUID
     ) -> Audio:
-        file_path, duration, size, file_ext = await self._save_audio_file(file)
+        staged, file_ext = await self._save_audio_file(file)
+        try:
+            return await self._create_audio(title, staged, file_ext, is_public, user_id)
+        finally:
+            await self.storage.discard(staged)
+
+    async def create_audio_from_file(
+        self,
+        source_path: str,
+        filename: str,
+        title: str,
+        is_public: bool,
+        user_id: UUID
+    ) -> Audio:
+        file_ext = self._get_file_ext(filename)
+        staged = await self.storage.stage_file(source_path)
+        try:
+            return await self._create_audio(title, staged, file_ext, is_public, user_id)
+        finally:
+            await self.storage.discard(staged)
+
+    async def _create_audio(
+        self,
+        title: str,
+        staged: StagedFile,
+        file_ext: str,
+        is_public: bool,
+        user_id: UUID
+    ) -> Audio:
+        content_hash = None
+        if self.storage.content_addressed:
+            stored = await self._acquire_blob(staged)
+            content_hash = stored.sha256
+        else:
+            stored = await self.storage.store(staged, self.storage.audio_key(file_ext))
+        # Charged after storing so the usage row is locked only for the rest of
+        # this transaction, not for the (possibly remote) copy.
+        try:
+            await QuotaService(self.session).charge(user_id, stored.size)
+        except HTTPException:
+            # A new content-addressed blob is left to reconcile_storage: it may be shared.
+            if not self.storage.content_addressed:
+                await self.storage.delete_many([stored.key], 1)
+            raise
         audio_data = {
+            "id": uuid.uuid4(),
             "title": title,
-            "duration": duration,
-            "size": size,
+            "size": stored.size,
             "format": file_ext,
+            "status": AudioStatus.PENDING,
             "is_public": is_public,
-            "file_path": file_path,
+            "file_path": stored.key,
+            "content_hash": content_hash,
             "user_id": user_id
         }
+        enqueue_processing_jobs(JobQueue(self.session), audio_data["id"], file_ext)
+        if is_public:
+            await invalidate_public_listing(self.session)
         return await self.repository.create(Audio(**audio_data))
 
+    async def _acquire_blob(self, staged: StagedFile) -> StoredFile:
+        result = await self.session.execute(
+            insert(AudioBlob)
+            .values(
+                sha256=staged.sha256,
+                file_path=self.storage.blob_key(staged.sha256),
+                size=staged.size,
+                ref_count=1
+            )
+            .on_conflict_do_update(
+                index_elements=[AudioBlob.sha256],
+                set_={"ref_count": AudioBlob.ref_count + 1}
+            )
+            .returning(AudioBlob.file_path)
+        )
+        return await self.storage.store_blob(staged, result.scalar_one())
+
+    async def _release_blobs(self, counts: dict[str, int]) -> dict[str, str]:
+        """Drop ``counts`` references per blob; returns the keys of blobs left unreferenced."""
+        if not counts:
+            return {}
+        released = values(
+            column("sha256", String), column("count", Integer), name="released"
+        ).data(list(counts.items()))
+        result = await self.session.execute(
+            update(AudioBlob)
+            .where(AudioBlob.sha256 == released.c.sha256)
+            .values(ref_count=AudioBlob.ref_count - released.c.count)
+            .returning(AudioBlob.sha256, AudioBlob.ref_count, AudioBlob.file_path)
+            .execution_options(synchronize_session=False)
+        )
+        orphaned = {row.sha256: row.file_path for row in result if row.ref_count <= 0}
+        if orphaned:
+            await self.session.execute(
+                delete(AudioBlob)
+                .where(any_of(AudioBlob.sha256, list(orphaned)), AudioBlob.ref_count <= 0)
+                .execution_options(synchronize_session=False)
+            )
+        return orphaned
+
+    def _sidecar_keys(self, key: str) -> List[str]:
+        return sidecar_keys(key)
+
+    async def _purge_audios(self, audio_ids: List[UUID]) -> dict[UUID, bool]:
+        """Delete audio rows in one statement and remove their files.
+
+        Returns, per deleted id, whether all of its files are gone; failed
+        removals are queued for retry in the same transaction.
+        """
+        if not audio_ids:
+            return {}
+        result = await self.session.execute(
+            delete(Audio)
+            .where(any_of(Audio.id, audio_ids))
+            .returning(Audio.id, Audio.file_path, Audio.content_hash, Audio.is_public, Audio.user_id, Audio.size)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+        await QuotaService(self.session).release((row.user_id, row.size) for row in rows)
+        if any(row.is_public for row in rows):
+            await invalidate_public_listing(self.session)
+        orphaned = await self._release_blobs(Counter(row.content_hash for row in rows if row.content_hash))
+        keys: dict[UUID, List[str]] = {}
+        for row in rows:
+            key = orphaned.get(row.content_hash) if row.content_hash else row.file_path
+            keys[row.id] = [key, *self._sidecar_keys(key)] if key else []
+        failures = await self.storage.delete_many(
+            (key for audio_keys in keys.values() for key in audio_keys),
+            settings.storage.delete_concurrency
+        )
+        if failures:
+            logger.warning("Failed to remove %d stored files, queued for retry", len(failures))
+            enqueue_file_removals(JobQueue(self.session), failures)
+        return {
+            audio_id: not any(key in failures for key in audio_keys)
+            for audio_id, audio_keys in keys.items()
+        }
+
     async def get_audio(self, audio_id: UUID) -> Optional[Audio]:
         return await self.repository.get(audio_id)
 
-    async def get_user_audios(self, user_id: UUID) -> List[Audio]:
-        return await self.repository.get_many_by_field("user_id", user_id)
+    async def get_user_audios(self, user_id: UUID, params: AudioListParams) -> tuple[List[Row], Optional[str]]:
+        return await self._list_audios(Audio.user_id == user_id, params)
+
+    async def get_public_audios(self, params: AudioListParams) -> tuple[List[Row], Optional[str]]:
+        return await self._list_audios(Audio.is_public.is_(True), params)
+
+    async def get_public_audio_page(
+        self,
+        params: AudioListParams,
+        if_none_match: Optional[str] = None
+    ) -> Response:
+        key = params.model_dump_json()
+        cached = public_listing_cache.get(key)
+        if cached is None:
+            generation = public_listing_cache.generation
+            rows, next_cursor = await self.get_public_audios(params)
+            cached = public_listing_cache.put(key, page_body(rows, next_cursor), generation)
+        headers = {
+            "ETag": cached.etag,
+            "Cache-Control": "public, no-cache",
+        }
+        if cached.not_modified(if_none_match):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=cached.body, media_type="application/json", headers=headers)
+
+    async def _list_audios(self, scope, params: AudioListParams) -> tuple[List[Row], Optional[str]]:
+        query = select(*AUDIO_LIST_COLUMNS).where(scope)
+        if params.format:
+            query = query.where(func.lower(Audio.format) == params.format.lower())
+        if params.min_duration is not None:
+            query = query.where(Audio.duration >= params.min_duration)
+        if params.max_duration is not None:
+            query = query.where(Audio.duration <= params.max_duration)
+        if params.created_after is not None:
+            query = query.where(Audio.created_at >= params.created_after)
+        if params.created_before is not None:
+            query = query.where(Audio.created_at < params.created_before)
+        newest_first = params.sort == AudioSort.NEWEST
+        if params.cursor:
+            try:
+                created_at, last_id = decode_cursor(params.cursor, params.sort.value)
+            except InvalidCursor as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+            # Row comparison keeps the predicate on the (…, created_at, id) index.
+            key = tuple_(Audio.created_at, Audio.id)
+            bound = tuple_(literal(created_at, Audio.created_at.type), literal(last_id, Audio.id.type))
+            query = query.where(key < bound if newest_first else key > bound)
+        if newest_first:
+            query = query.order_by(Audio.created_at.desc(), Audio.id.desc())
+        else:
+            query = query.order_by(Audio.created_at.asc(), Audio.id.asc())
+        result = await self.session.execute(query.limit(params.limit + 1))
+        rows = list(result.all())
+        next_cursor = None
+        if len(rows) > params.limit:
+            rows = rows[:params.limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last.created_at, last.id, params.sort.value)
+        return rows, next_cursor
 
-    async def get_public_audios(self) -> List[Audio]:
-        return await self.repository.get_many_by_field("is_public", True)
+    async def search_audios(
+        self,
+        params: AudioSearchParams,
+        user_id: Optional[UUID] = None,
+        is_superuser: bool = False
+    ) -> tuple[List[Row], Optional[str]]:
+        terms = SEARCH_TERM.findall(params.q)
+        # The search text is rendered inline: match counts swing from a handful to
+        # a third of the table, and a cached generic plan tuned to one is wrong for the other.
+        q = literal(params.q, String, literal_execute=True)
+        matches = []
+        score = literal(0.0, Double)
+        if terms:
+            # Every term is a prefix so a half-typed last word still matches.
+            tsquery = func.to_tsquery("simple", literal(" & ".join(f"{term}:*" for term in terms), String, literal_execute=True))
+            matches.append(Audio.title_search.op("@@")(tsquery))
+            score = cast(func.ts_rank_cd(Audio.title_search, tsquery), Double)
+        if settings.search.fuzzy:
+            # word_similarity(q, title) above pg_trgm.word_similarity_threshold, served by the trigram index.
+            matches.append(Audio.title.op("%>")(q))
+            score = score + cast(func.word_similarity(q, Audio.title), Double)
+        if not matches:
+            return [], None
+        query = select(*AUDIO_LIST_COLUMNS, score.label("rank")).where(or_(*matches))
+        # Same visibility as get_audio_for_download.
+        if not is_superuser:
+            visible = Audio.is_public.is_(True)
+            if user_id:
+                visible = or_(visible, Audio.user_id == user_id)
+            query = query.where(visible)
+        if params.cursor:
+            try:
+                rank, last_id = decode_rank_cursor(params.cursor, params.q)
+            except InvalidCursor as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+            query = query.where(tuple_(score, Audio.id) < tuple_(literal(rank, Double), literal(last_id, Audio.id.type)))
+        query = query.order_by(score.desc(), Audio.id.desc()).limit(params.limit + 1)
+        rows = list((await self.session.execute(query)).all())
+        next_cursor = None
+        if len(rows) > params.limit:
+            rows = rows[:params.limit]
+            last = rows[-1]
+            next_cursor = encode_rank_cursor(last.rank, last.id, params.q)
+        return rows, next_cursor
 
     async def delete_user_audio(
         self,
@@ -87,11 +355,38 @@ class AudioService:
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized"
             )
-        try:
-            await asyncio.to_thread(os.remove, audio.file_path)
-        except OSError:
-            pass
-        await self.repository.delete(audio_id)
+        await self._purge_audios([audio_id])
+
+    async def delete_user_audios(
+        self,
+        audio_ids: List[UUID],
+        user_id: UUID,
+        is_superuser: bool = False
+    ) -> List[AudioDeleteResult]:
+        audio_ids = list(dict.fromkeys(audio_ids))
+        result = await self.session.execute(
+            select(Audio.id, Audio.user_id).where(any_of(Audio.id, audio_ids))
+        )
+        owners = {row.id: row.user_id for row in result}
+        allowed = [
+            audio_id for audio_id in audio_ids
+            if audio_id in owners and (is_superuser or owners[audio_id] == user_id)
+        ]
+        removed = await self._purge_audios(allowed)
+        results = []
+        for audio_id in audio_ids:
+            if audio_id in removed:
+                results.append(AudioDeleteResult(
+                    id=audio_id,
+                    status=AudioDeleteStatus.DELETED,
+                    files_pending=not removed[audio_id]
+                ))
+            elif audio_id in owners and audio_id not in allowed:
+                results.append(AudioDeleteResult(id=audio_id, status=AudioDeleteStatus.FORBIDDEN))
+            else:
+                # Missing, or deleted by a concurrent request after the lookup.
+                results.append(AudioDeleteResult(id=audio_id, status=AudioDeleteStatus.NOT_FOUND))
+        return results
 
     async def get_audio_for_download(self, audio_id: UUID, user_id: UUID = None, is_superuser: bool = False) -> Audio:
         audio = await self.get_audio(audio_id)
@@ -111,21 +406,67 @@ class AudioService:
         self,
         audio_id: UUID,
         user_id: UUID = None,
+        is_superuser: bool = False,
+        range_header: Optional[str] = None,
+        if_range: Optional[str] = None,
+        seek_seconds: Optional[float] = None
+    ) -> Response:
+        audio = await self.get_audio_for_download(audio_id, user_id, is_superuser)
+        grant = self._download_grant(audio)
+        return await self.delivery.respond(
+            grant.key, grant.media_type, grant.filename, grant.etag, range_header, if_range, seek_seconds
+        )
+
+    async def sign_download(
+        self,
+        audio_id: UUID,
+        user_id: UUID = None,
+        is_superuser: bool = False,
+        client: Optional[str] = None
+    ) -> tuple[str, int]:
+        audio = await self.get_audio_for_download(audio_id, user_id, is_superuser)
+        return download_signer.sign(self._download_grant(audio), client)
+
+    def _download_grant(self, audio: Audio) -> DownloadGrant:
+        filename = f"{audio.title}.{audio.format}" if audio.title else f"audio_{audio.id}.{audio.format}"
+        return DownloadGrant(
+            key=audio.file_path,
+            media_type=self._get_mime_type(audio.format),
+            filename=filename,
+            etag=f'"{audio.content_hash or audio.id}"',
+            audio_id=str(audio.id)
+        )
+
+    async def get_audio_peaks(
+        self,
+        audio_id: UUID,
+        resolution: Optional[int] = None,
+        if_none_match: Optional[str] = None,
+        user_id: UUID = None,
         is_superuser: bool = False
-    ) -> FileResponse:
+    ) -> Response:
         audio = await self.get_audio_for_download(audio_id, user_id, is_superuser)
-        file_path = PathLib(audio.file_path)
-        if not file_path.exists():
+        resolution = self._peaks_resolution(resolution)
+        etag = f'"{audio.content_hash or audio.id}-{resolution}-{settings.processing.peaks_bits}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"{'public' if audio.is_public else 'private'}, max-age={PEAKS_MAX_AGE}, immutable",
+        }
+        if if_none_match and etag in if_none_match:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        data = await self.storage.read_bytes(peaks_key(audio.file_path, resolution))
+        if data is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Audio file not found on server"
+                detail="Waveform peaks are not available"
             )
-        filename = f"{audio.title}.{audio.format}" if audio.title else f"audio_{audio_id}.{audio.format}"
-        return FileResponse(
-            path=str(file_path),
-            media_type=self._get_mime_type(audio.format),
-            filename=filename
-        )
+        return Response(content=data, media_type="application/octet-stream", headers=headers)
+
+    def _peaks_resolution(self, requested: Optional[int]) -> int:
+        resolutions = settings.processing.peaks_resolutions
+        if requested is None:
+            return resolutions[0]
+        return next((resolution for resolution in resolutions if resolution >= requested), resolutions[-1])
 
     def _get_mime_type(self, file_ext: str) -> str:
         mime_types = {
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Body, Depends, HTTPException, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.shared.utils.get_current_user import get_current_user
+from src.shared.utils.get_current_user import get_current_admin_user, get_current_user
+from src.shared.clients.yandex import yandex_client
+from src.shared.utils.password_utils import password_hasher
 from src.core.database import get_db
 from src.auth.service import AuthService
 from src.auth.schema import (RefreshTokenRequest, Token, UserCreate, UserLogin, 
@@ -77,4 +79,12 @@ async def refresh_token(
     token_data: RefreshTokenRequest = Body(...),
     db: AsyncSession = Depends(get_db)
 ):
-    return await AuthService(db).refresh_token(token_data.refresh_token)
\ No newline at end of file
+    return await AuthService(db).refresh_token(token_data.refresh_token)
+
+@AuthRouter.get("/hasher/stats")
+async def get_password_hasher_stats(current_admin: User = Depends(get_current_admin_user)):
+    return password_hasher.snapshot()
+
+@AuthRouter.get("/yandex/stats")
+async def get_yandex_client_stats(current_admin: User = Depends(get_current_admin_user)):
+    return yandex_client.snapshot()
\ No newline at end of file
@@ -1,13 +1,14 @@
+import time
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.config.config import settings
 from src.auth.schema import Token
 from src.users.service import UserService
 from src.users.schema import UserCreate, UserInDB, UserYandexCreate
 from src.shared.utils.auth_utils import create_access_token, create_refresh_token
-from src.shared.utils.password_utils import verify_password
+from src.shared.utils.password_utils import password_hasher
 from datetime import timedelta
 from fastapi import HTTPException, status
-from src.shared.clients.yandex import YandexAuthClient
+from src.shared.clients.yandex import yandex_client
 from jose import jwt, JWTError
 
 
@@ -17,12 +18,18 @@ class AuthService:
         self.user_service = UserService(session) if session else None
 
     def generate_yandex_auth_url(self) -> str:
-        return YandexAuthClient.get_auth_url()
+        return yandex_client.get_auth_url()
 
     async def process_yandex_callback(self, code: str) -> Token:
-        yandex_token = await YandexAuthClient.get_token(code)
-        user_info = await YandexAuthClient.get_user_info(yandex_token)
-        user = await self._sync_user_with_database(user_info)
+        started_at = time.perf_counter()
+        failed = True
+        try:
+            yandex_token = await yandex_client.get_token(code)
+            user_info = await yandex_client.get_user_info(yandex_token)
+            user = await self._sync_user_with_database(user_info)
+            failed = False
+        finally:
+            yandex_client.observe_callback(time.perf_counter() - started_at, failed)
         return self._issue_jwt_token(user)
 
     async def register_user(self, user_data: UserCreate) -> Token:
@@ -45,11 +52,14 @@ class AuthService:
                 detail="Password authentication not available for this user"
             )
         
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect password"
             )
+        if new_hash is not None:
+            await self.user_service.update_password_hash(user.id, new_hash)
         
         return self._issue_jwt_token(user)
 
@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import logging
+import os
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from src.audio.model import Audio, AudioBlob
+from src.core.config.config import settings
+from src.core.database import SessionLocal, shutdown_db
+from src.core.storage.service import StorageService, storage_backend
+
+logger = logging.getLogger("backfill_blobs")
+
+@dataclass
+class BackfillStats:
+    hashed: int = 0
+    blobs_created: int = 0
+    duplicates: int = 0
+    bytes_reclaimed: int = 0
+    missing: int = 0
+
+async def _hash(storage: StorageService, limiter: asyncio.Semaphore, key: str) -> Optional[tuple[int, str]]:
+    async with limiter:
+        return await storage.hash_object(key)
+
+async def _link_blob(storage: StorageService, key: str, blob_key: str) -> bool:
+    if await storage.backend.exists(blob_key):
+        return False
+    await storage.backend.copy(key, blob_key)
+    return True
+
+async def backfill(batch_size: int, workers: int) -> BackfillStats:
+    storage = StorageService(
+        storage_backend,
+        settings.storage.staging_dir,
+        chunk_size=settings.storage.upload_chunk_size,
+        shard_depth=settings.storage.shard_depth
+    )
+    stats = BackfillStats()
+    limiter = asyncio.Semaphore(workers)
+    last_id = None
+    while True:
+        query = (
+            select(Audio.id, Audio.file_path)
+            .where(Audio.content_hash.is_(None))
+            .order_by(Audio.id)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            query = query.where(Audio.id > last_id)
+        obsolete = []
+        async with SessionLocal() as session:
+            rows = (await session.execute(query)).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            hashes = await asyncio.gather(*(_hash(storage, limiter, row.file_path) for row in rows))
+            for row, hashed in zip(rows, hashes):
+                if hashed is None:
+                    stats.missing += 1
+                    logger.warning("File for audio %s is missing: %s", row.id, row.file_path)
+                    continue
+                size, sha256 = hashed
+                stats.hashed += 1
+                result = await session.execute(
+                    insert(AudioBlob)
+                    .values(
+                        sha256=sha256,
+                        file_path=storage.blob_key(sha256),
+                        size=size,
+                        ref_count=1
+                    )
+                    .on_conflict_do_update(
+                        index_elements=[AudioBlob.sha256],
+                        set_={"ref_count": AudioBlob.ref_count + 1}
+                    )
+                    .returning(AudioBlob.file_path)
+                )
+                blob_key = result.scalar_one()
+                if blob_key != row.file_path:
+                    if await _link_blob(storage, row.file_path, blob_key):
+                        stats.blobs_created += 1
+                    else:
+                        stats.duplicates += 1
+                        stats.bytes_reclaimed += size
+                    obsolete.append(row.file_path)
+                await session.execute(
+                    update(Audio)
+                    .where(Audio.id == row.id)
+                    .values(file_path=blob_key, content_hash=sha256)
+                )
+            await session.commit()
+        for key in obsolete:
+            await storage.delete(key)
+        logger.info("Processed batch up to %s: %s", last_id, stats)
+    return stats
+
+async def run(batch_size: int, workers: int) -> BackfillStats:
+    try:
+        return await backfill(batch_size, workers)
+    finally:
+        await storage_backend.close()
+        await shutdown_db()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Hash stored audio files and collapse duplicates into shared blobs"
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    stats = asyncio.run(run(args.batch_size, args.workers))
+    print(asdict(stats))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import select
+
+from src.audio.model import Audio
+from src.audio.processing import METADATA_JOB, PEAKS_JOB, SEEK_INDEX_JOB
+from src.core.database import SessionLocal, shutdown_db
+from src.jobs.service import JobQueue
+
+logger = logging.getLogger("enqueue_jobs")
+
+async def enqueue(kind: str, batch_size: int) -> int:
+    queued = 0
+    last_id = None
+    try:
+        while True:
+            query = select(Audio.id).order_by(Audio.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(Audio.id > last_id)
+            async with SessionLocal() as session:
+                ids = (await session.execute(query)).scalars().all()
+                if not ids:
+                    break
+                queue = JobQueue(session)
+                for audio_id in ids:
+                    queue.enqueue(kind, {"audio_id": str(audio_id)})
+                await session.commit()
+            queued += len(ids)
+            last_id = ids[-1]
+            logger.info("Queued %d %s jobs", queued, kind)
+    finally:
+        await shutdown_db()
+    return queued
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Queue a processing job for every stored audio")
+    parser.add_argument("kind", choices=[METADATA_JOB, PEAKS_JOB, SEEK_INDEX_JOB])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    print(asyncio.run(enqueue(args.kind, args.batch_size)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy import BigInteger, Column, DateTime, MetaData, Table, Text, and_, exists, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.audio.cache import invalidate_public_listing
+from src.audio.model import Audio, AudioBlob, AudioStatus
+from src.audio.schema import AudioDeleteStatus
+from src.audio.processing import FILE_DELETE_JOB
+from src.audio.service import AudioService, sidecar_owner
+from src.core.config.config import settings
+from src.core.database import SessionLocal, engine, shutdown_db
+from src.core.storage.service import StorageError, StorageService, storage_backend
+from src.jobs.model import Job, JobStatus
+from src.shared.repositories.base import any_of
+
+logger = logging.getLogger("reconcile_storage")
+
+QUARANTINE_PREFIX = ".quarantine"
+ACTIONS = ("report", "quarantine", "purge")
+
+# Session-local scratch table: the scan is streamed into Postgres so the
+# comparison with audios/audio_blobs is two anti-joins instead of a
+# Python set of every key.
+scanned_keys = Table(
+    "scanned_keys",
+    MetaData(),
+    Column("key", Text, primary_key=True),
+    Column("owner_key", Text, nullable=False),
+    Column("size", BigInteger, nullable=False),
+    Column("modified", DateTime(timezone=True), nullable=False),
+    prefixes=["TEMPORARY"]
+)
+
+@dataclass
+class ReconcileStats:
+    scanned: int = 0
+    scanned_bytes: int = 0
+    orphans: int = 0
+    orphan_bytes: int = 0
+    quarantined: int = 0
+    purged: int = 0
+    purged_bytes: int = 0
+    dangling: int = 0
+    marked_missing: int = 0
+    rows_deleted: int = 0
+
+class Pacer:
+    """Keeps an operation under ``rate`` per second on average; ``rate`` <= 0 disables it."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.started = time.monotonic()
+        self.count = 0
+
+    async def __call__(self, n: int = 1) -> None:
+        if self.rate <= 0:
+            return
+        self.count += n
+        ahead = self.count / self.rate - (time.monotonic() - self.started)
+        if ahead > 0:
+            await asyncio.sleep(ahead)
+
+class StorageReconciler:
+    """Compares stored files with ``audios``/``audio_blobs`` and cleans up both sides.
+
+    Orphan files (no row refers to them or to the audio they are a sidecar
+    of) older than ``grace`` are reported, moved under ``.quarantine/<date>/``
+    or, on later runs, deleted once they have sat in quarantine for
+    ``retention``. Dangling rows (created before the scan minus ``grace``
+    whose file is gone) are reported, marked ``missing``, and deleted after
+    ``retention``. Storage calls are paced so the scan does not starve
+    foreground I/O.
+    """
+
+    def __init__(
+        self,
+        storage: StorageService,
+        action: str,
+        grace: timedelta,
+        retention: timedelta,
+        batch_size: int,
+        scan_rate: float,
+        action_rate: float
+    ):
+        self.storage = storage
+        self.action = action
+        self.grace = grace
+        self.retention = retention
+        self.batch_size = batch_size
+        self.scan_pacer = Pacer(scan_rate)
+        self.action_pacer = Pacer(action_rate)
+        self.stats = ReconcileStats()
+
+    async def run(self) -> ReconcileStats:
+        started = datetime.now(timezone.utc)
+        async with engine.connect() as connection:
+            await connection.run_sync(scanned_keys.metadata.create_all)
+            await self._scan(connection)
+            await self._handle_orphans(connection, started - self.grace)
+            await self._handle_dangling(connection, started - self.grace)
+        if self.action == "purge":
+            await self._purge_quarantine(started - self.retention)
+            await self._purge_missing_rows(started - self.retention)
+        return self.stats
+
+    async def _scan(self, connection: AsyncConnection) -> None:
+        async for batch in self.storage.backend.iter_keys(batch_size=self.batch_size):
+            await self.scan_pacer(len(batch))
+            await connection.execute(insert(scanned_keys), [
+                {"key": key, "owner_key": sidecar_owner(key), "size": stat.size, "modified": stat.modified}
+                for key, stat in batch
+            ])
+            await connection.commit()
+            self.stats.scanned += len(batch)
+            self.stats.scanned_bytes += sum(stat.size for _, stat in batch)
+            if self.stats.scanned % (self.batch_size * 100) < len(batch):
+                logger.info("Scanned %d files", self.stats.scanned)
+        await connection.exec_driver_sql("ANALYZE scanned_keys")
+
+    def _unreferenced(self, key_column):
+        pending_removal = exists().where(
+            Job.kind == FILE_DELETE_JOB,
+            Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),
+            Job.payload["key"].astext == scanned_keys.c.key
+        )
+        return and_(
+            ~exists().where(Audio.file_path == key_column),
+            ~exists().where(AudioBlob.file_path == key_column),
+            ~pending_removal
+        )
+
+    async def _handle_orphans(self, connection: AsyncConnection, cutoff: datetime) -> None:
+        query = (
+            select(scanned_keys.c.key, scanned_keys.c.owner_key, scanned_keys.c.size)
+            .where(scanned_keys.c.modified < cutoff, self._unreferenced(scanned_keys.c.owner_key))
+            .order_by(scanned_keys.c.key)
+        )
+        result = await connection.stream(query)
+        async for rows in result.partitions(self.batch_size):
+            self.stats.orphans += len(rows)
+            self.stats.orphan_bytes += sum(row.size for row in rows)
+            for row in rows[:20]:
+                logger.info("Orphan file: %s (%d bytes)", row.key, row.size)
+            if self.action != "report":
+                await self._quarantine(rows)
+        await connection.commit()
+
+    async def _quarantine(self, rows) -> None:
+        # Re-check right before moving: a row may have appeared since the anti-join ran.
+        async with SessionLocal() as session:
+            owners = list({row.owner_key for row in rows})
+            referenced = set((await session.execute(
+                select(Audio.file_path).where(any_of(Audio.file_path, owners))
+                .union(select(AudioBlob.file_path).where(any_of(AudioBlob.file_path, owners)))
+            )).scalars())
+        day = datetime.now(timezone.utc).strftime("%Y%m%d")
+        for row in rows:
+            if row.owner_key in referenced:
+                continue
+            await self.action_pacer()
+            try:
+                await self.storage.backend.copy(row.key, f"{QUARANTINE_PREFIX}/{day}/{row.key}")
+                await self.storage.backend.delete(row.key)
+            except StorageError as e:
+                logger.warning("Could not quarantine %s: %s", row.key, e)
+                continue
+            self.stats.quarantined += 1
+
+    async def _handle_dangling(self, connection: AsyncConnection, cutoff: datetime) -> None:
+        query = (
+            select(Audio.id, Audio.file_path)
+            .where(
+                Audio.created_at < cutoff,
+                Audio.status != AudioStatus.MISSING,
+                ~exists().where(scanned_keys.c.key == Audio.file_path)
+            )
+            .order_by(Audio.id)
+        )
+        result = await connection.stream(query)
+        async for rows in result.partitions(self.batch_size):
+            missing: List = []
+            for row in rows:
+                # The file may have been moved (e.g. by shard_storage) after its directory was scanned.
+                await self.action_pacer()
+                if not await self.storage.backend.exists(row.file_path):
+                    missing.append(row.id)
+                    logger.info("Dangling row: audio %s -> %s", row.id, row.file_path)
+            self.stats.dangling += len(missing)
+            if missing and self.action != "report":
+                async with SessionLocal() as session:
+                    result = await session.execute(
+                        update(Audio)
+                        .where(any_of(Audio.id, missing), Audio.status != AudioStatus.MISSING)
+                        .values(status=AudioStatus.MISSING)
+                        .returning(Audio.is_public)
+                        .execution_options(synchronize_session=False)
+                    )
+                    marked = result.scalars().all()
+                    if any(marked):
+                        await invalidate_public_listing(session)
+                    await session.commit()
+                self.stats.marked_missing += len(marked)
+        await connection.commit()
+
+    async def _purge_quarantine(self, cutoff: datetime) -> None:
+        expired = cutoff.strftime("%Y%m%d")
+        async for batch in self.storage.backend.iter_keys(QUARANTINE_PREFIX, batch_size=self.batch_size):
+            await self.scan_pacer(len(batch))
+            for key, stat in batch:
+                day = key.split("/", 2)[1]
+                if day >= expired:
+                    continue
+                await self.action_pacer()
+                try:
+                    await self.storage.backend.delete(key)
+                except StorageError as e:
+                    logger.warning("Could not delete quarantined %s: %s", key, e)
+                    continue
+                self.stats.purged += 1
+                self.stats.purged_bytes += stat.size
+
+    async def _purge_missing_rows(self, cutoff: datetime) -> None:
+        last_id = None
+        while True:
+            query = (
+                select(Audio.id)
+                .where(Audio.status == AudioStatus.MISSING, Audio.updated_at < cutoff)
+                .order_by(Audio.id)
+                .limit(self.batch_size)
+            )
+            if last_id is not None:
+                query = query.where(Audio.id > last_id)
+            async with SessionLocal() as session:
+                ids = list((await session.execute(query)).scalars())
+                if not ids:
+                    break
+                last_id = ids[-1]
+                results = await AudioService(session).delete_user_audios(ids, user_id=None, is_superuser=True)
+                await session.commit()
+            self.stats.rows_deleted += sum(result.status == AudioDeleteStatus.DELETED for result in results)
+
+async def run(args: argparse.Namespace) -> ReconcileStats:
+    storage = StorageService(
+        storage_backend,
+        settings.storage.staging_dir,
+        chunk_size=settings.storage.upload_chunk_size,
+        shard_depth=settings.storage.shard_depth
+    )
+    reconciler = StorageReconciler(
+        storage,
+        action=args.action,
+        grace=timedelta(hours=args.grace_hours),
+        retention=timedelta(days=args.retention_days),
+        batch_size=args.batch_size,
+        scan_rate=args.scan_rate,
+        action_rate=args.action_rate
+    )
+    try:
+        return await reconciler.run()
+    finally:
+        await storage_backend.close()
+        await shutdown_db()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Find stored files without rows and rows without files, and clean them up"
+    )
+    parser.add_argument("--action", choices=ACTIONS, default="report",
+                        help="report only; quarantine orphans and mark dangling rows; "
+                             "or also purge what has been quarantined/marked for longer than --retention-days")
+    parser.add_argument("--grace-hours", type=float, default=24,
+                        help="ignore files and rows younger than this (uploads in flight)")
+    parser.add_argument("--retention-days", type=float, default=7)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--scan-rate", type=float, default=5000, help="max files listed per second, 0 = unlimited")
+    parser.add_argument("--action-rate", type=float, default=200,
+                        help="max per-file checks, moves and deletes per second, 0 = unlimited")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    print(asdict(asyncio.run(run(args))))
+
+if __name__ == "__main__":
+    main()
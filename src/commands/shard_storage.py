@@ -0,0 +1,221 @@
+import argparse
+import asyncio
+import logging
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import String, column, select, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.audio.cache import invalidate_public_listing
+from src.audio.model import Audio, AudioBlob
+from src.audio.processing import enqueue_file_removals
+from src.audio.service import sidecar_keys
+from src.core.config.config import settings
+from src.core.database import SessionLocal, shutdown_db
+from src.core.storage.service import StorageError, StorageService, storage_backend
+from src.jobs.service import JobQueue
+
+logger = logging.getLogger("shard_storage")
+
+@dataclass
+class ShardStats:
+    audios_moved: int = 0
+    blobs_moved: int = 0
+    files_linked: int = 0
+    missing: int = 0
+    conflicts: int = 0
+
+class StorageSharder:
+    """Moves stored audio onto the ``STORAGE_SHARD_DEPTH`` layout without downtime.
+
+    Each batch copies (hard-links on local storage) the file and its
+    sidecars to the new key, then switches ``file_path`` with a
+    compare-and-set UPDATE so rows changed or deleted meanwhile are left
+    alone. Old keys are not removed inline: their deletion is queued as
+    ``storage.delete`` jobs due after ``grace`` so in-flight downloads and
+    signed URLs issued before the switch keep working. Rows already on the
+    target layout are skipped, which makes the command safe to rerun after
+    an interruption.
+    """
+
+    def __init__(self, storage: StorageService, workers: int, grace: timedelta):
+        self.storage = storage
+        self.limiter = asyncio.Semaphore(workers)
+        self.grace = grace
+        self.stats = ShardStats()
+
+    def target_key(self, key: str) -> str:
+        return self.storage.shard_key(os.path.basename(key))
+
+    async def run(self, batch_size: int) -> ShardStats:
+        await self._move_audios(batch_size)
+        await self._move_blobs(batch_size)
+        return self.stats
+
+    async def _relocate(self, key: str, target: str) -> bool:
+        """Make ``target`` (and sidecars) hold the same bytes as ``key``; False if ``key`` is gone."""
+        async with self.limiter:
+            if not await self.storage.backend.exists(target):
+                if not await self.storage.backend.exists(key):
+                    return False
+                await self.storage.backend.copy(key, target)
+                self.stats.files_linked += 1
+            for source, copy in zip(sidecar_keys(key), sidecar_keys(target)):
+                if await self.storage.backend.exists(source) and not await self.storage.backend.exists(copy):
+                    await self.storage.backend.copy(source, copy)
+        return True
+
+    async def _relocate_batch(self, moves: dict) -> dict:
+        """Relocate ``{row_key: (old, new)}``; returns the moves whose source exists."""
+        async def relocate(item) -> Optional[tuple]:
+            row_key, (old, new) = item
+            try:
+                if await self._relocate(old, new):
+                    return item
+                logger.warning("Stored file is missing, leaving it in place: %s", old)
+            except StorageError as e:
+                logger.warning("Could not copy %s to %s: %s", old, new, e)
+            self.stats.missing += 1
+            return None
+
+        relocated = await asyncio.gather(*(relocate(item) for item in moves.items()))
+        return dict(item for item in relocated if item is not None)
+
+    async def _retire(self, session: AsyncSession, moved: list[tuple[str, str]], abandoned: list[str]) -> None:
+        """Queue removal of superseded keys after the grace period; drop copies nobody points to."""
+        retired = [key for old, _ in moved for key in (old, *sidecar_keys(old))]
+        enqueue_file_removals(JobQueue(session), retired, run_at=datetime.now(timezone.utc) + self.grace)
+        await session.commit()
+        if abandoned:
+            self.stats.conflicts += len(abandoned)
+            await self.storage.delete_many(
+                [key for new in abandoned for key in (new, *sidecar_keys(new))],
+                settings.storage.delete_concurrency
+            )
+
+    async def _move_audios(self, batch_size: int) -> None:
+        last_id = None
+        while True:
+            query = (
+                select(Audio.id, Audio.file_path)
+                .where(Audio.content_hash.is_(None))
+                .order_by(Audio.id)
+                .limit(batch_size)
+            )
+            if last_id is not None:
+                query = query.where(Audio.id > last_id)
+            async with SessionLocal() as session:
+                rows = (await session.execute(query)).all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+                moves = {
+                    row.id: (row.file_path, self.target_key(row.file_path))
+                    for row in rows if self.target_key(row.file_path) != row.file_path
+                }
+                moves = await self._relocate_batch(moves)
+                if not moves:
+                    continue
+                switched = values(
+                    column("id", Audio.id.type), column("old", String), column("new", String), name="switched"
+                ).data([(audio_id, old, new) for audio_id, (old, new) in moves.items()])
+                result = await session.execute(
+                    update(Audio)
+                    .where(Audio.id == switched.c.id, Audio.file_path == switched.c.old)
+                    .values(file_path=switched.c.new)
+                    .returning(Audio.id, Audio.is_public)
+                    .execution_options(synchronize_session=False)
+                )
+                updated = result.all()
+                if any(row.is_public for row in updated):
+                    await invalidate_public_listing(session)
+                done = {row.id for row in updated}
+                self.stats.audios_moved += len(done)
+                await self._retire(
+                    session,
+                    [moves[audio_id] for audio_id in done],
+                    [new for audio_id, (_, new) in moves.items() if audio_id not in done]
+                )
+            logger.info("Audios up to %s: %s", last_id, self.stats)
+
+    async def _move_blobs(self, batch_size: int) -> None:
+        last_sha = None
+        while True:
+            query = select(AudioBlob.sha256, AudioBlob.file_path).order_by(AudioBlob.sha256).limit(batch_size)
+            if last_sha is not None:
+                query = query.where(AudioBlob.sha256 > last_sha)
+            async with SessionLocal() as session:
+                rows = (await session.execute(query)).all()
+                if not rows:
+                    break
+                last_sha = rows[-1].sha256
+                moves = {
+                    row.sha256: (row.file_path, self.target_key(row.file_path))
+                    for row in rows if self.target_key(row.file_path) != row.file_path
+                }
+                moves = await self._relocate_batch(moves)
+                if not moves:
+                    continue
+                switched = values(
+                    column("sha256", String), column("old", String), column("new", String), name="switched"
+                ).data([(sha256, old, new) for sha256, (old, new) in moves.items()])
+                # The blob row first: uploads upsert it, so this waits for any in-flight
+                # upload of the same content and the audio UPDATE below then sees its row.
+                result = await session.execute(
+                    update(AudioBlob)
+                    .where(AudioBlob.sha256 == switched.c.sha256, AudioBlob.file_path == switched.c.old)
+                    .values(file_path=switched.c.new)
+                    .returning(AudioBlob.sha256)
+                    .execution_options(synchronize_session=False)
+                )
+                done = set(result.scalars())
+                result = await session.execute(
+                    update(Audio)
+                    .where(Audio.content_hash == switched.c.sha256, Audio.file_path == switched.c.old)
+                    .values(file_path=switched.c.new)
+                    .returning(Audio.is_public)
+                    .execution_options(synchronize_session=False)
+                )
+                if any(result.scalars()):
+                    await invalidate_public_listing(session)
+                self.stats.blobs_moved += len(done)
+                await self._retire(
+                    session,
+                    [moves[sha256] for sha256 in done],
+                    [new for sha256, (_, new) in moves.items() if sha256 not in done]
+                )
+            logger.info("Blobs up to %s: %s", last_sha, self.stats)
+
+async def run(batch_size: int, workers: int, grace_seconds: int) -> ShardStats:
+    storage = StorageService(
+        storage_backend,
+        settings.storage.staging_dir,
+        chunk_size=settings.storage.upload_chunk_size,
+        shard_depth=settings.storage.shard_depth
+    )
+    try:
+        return await StorageSharder(storage, workers, timedelta(seconds=grace_seconds)).run(batch_size)
+    finally:
+        await storage_backend.close()
+        await shutdown_db()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Move stored audio files onto the STORAGE_SHARD_DEPTH directory layout"
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument(
+        "--grace-seconds", type=int, default=settings.auth.download_url_ttl + 60,
+        help="keep old keys this long after switching so open downloads and signed URLs finish"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    stats = asyncio.run(run(args.batch_size, args.workers, args.grace_seconds))
+    print(asdict(stats))
+
+if __name__ == "__main__":
+    main()
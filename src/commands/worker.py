@@ -0,0 +1,37 @@
+import argparse
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from src.audio.processing import create_processing_worker
+from src.core.config.config import settings
+from src.core.database import shutdown_db
+from src.core.storage.service import storage_backend
+
+logger = logging.getLogger("worker")
+
+async def run(workers: int, once: bool) -> None:
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        worker = create_processing_worker(executor)
+        try:
+            if once:
+                while processed := await worker.run_once():
+                    logger.info("Processed %d jobs", processed)
+            else:
+                await worker.start()
+                await asyncio.Event().wait()
+        finally:
+            await worker.stop()
+            await storage_backend.close()
+            await shutdown_db()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background audio processing jobs")
+    parser.add_argument("--workers", type=int, default=settings.processing.workers)
+    parser.add_argument("--once", action="store_true", help="drain the queue and exit")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(args.workers, args.once))
+
+if __name__ == "__main__":
+    main()
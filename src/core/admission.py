@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import Depends, Request, status
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.core.config.config import AdmissionConfig, settings
+from src.core.database import get_db
+from src.core.metrics import ADMISSION_REJECTIONS, UPLOAD_QUEUE_DEPTH, UPLOAD_QUEUE_WAIT, UPLOAD_SLOTS_IN_USE
+from src.core.model import RateLimitState
+from src.shared.utils.get_current_user import get_current_user
+from src.users.model import User
+
+logger = logging.getLogger(__name__)
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: float):
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = max(math.ceil(retry_after), 1)
+
+class RateLimitStore(ABC):
+    """Generic cell rate algorithm (GCRA) storage.
+
+    A bucket refilling one token every ``interval`` seconds and holding
+    ``burst`` tokens is represented by a single timestamp, the theoretical
+    arrival time, so a check is one atomic read-modify-write.
+    """
+
+    @abstractmethod
+    async def take(self, key: str, cost: float, interval: float, burst: float) -> float:
+        """Take ``cost`` tokens; returns 0 if admitted, else seconds until they would be available."""
+
+    async def purge(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+class MemoryRateLimitStore(RateLimitStore):
+    """Per-process buckets, for a single worker or when limits per worker are good enough.
+
+    Keys are kept in the order they were last admitted, so once ``max_keys``
+    is exceeded the least recently used bucket is evicted from the front in
+    O(1) instead of sweeping the whole table.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._tat: OrderedDict[str, float] = OrderedDict()
+
+    async def take(self, key: str, cost: float, interval: float, burst: float) -> float:
+        now = time.time()
+        tat = max(self._tat.get(key, now), now) + cost * interval
+        wait = tat - now - burst * interval
+        if wait > 0:
+            return wait
+        self._tat[key] = tat
+        self._tat.move_to_end(key)
+        if len(self._tat) > self.max_keys:
+            self._tat.popitem(last=False)
+        return 0.0
+
+    async def purge(self) -> None:
+        now = time.time()
+        for key in [key for key, tat in self._tat.items() if tat <= now]:
+            del self._tat[key]
+
+class PostgresRateLimitStore(RateLimitStore):
+    """Buckets in the ``rate_limits`` table, shared by every worker and host.
+
+    Uses its own small autocommit pool with short timeouts so admission
+    checks never queue behind the request pool they are protecting.
+    """
+
+    def __init__(self, url: str, pool_size: int, timeout: float):
+        self.engine = create_async_engine(
+            url,
+            pool_size=pool_size,
+            max_overflow=0,
+            pool_timeout=timeout,
+            isolation_level="AUTOCOMMIT",
+            connect_args={"command_timeout": timeout, "timeout": timeout}
+        )
+
+    async def take(self, key: str, cost: float, interval: float, burst: float) -> float:
+        now = func.extract("epoch", func.now())
+        tat = func.greatest(RateLimitState.tat, now) + cost * interval
+        statement = insert(RateLimitState).values(key=key, tat=now + cost * interval)
+        async with self.engine.connect() as connection:
+            admitted = await connection.scalar(
+                statement.on_conflict_do_update(
+                    index_elements=[RateLimitState.key],
+                    set_={"tat": tat},
+                    where=tat - now <= burst * interval
+                )
+                .returning(RateLimitState.key)
+            )
+            if admitted is not None:
+                return 0.0
+            wait = await connection.scalar(
+                select(tat - now - burst * interval).where(RateLimitState.key == key)
+            )
+        return max(wait or 0.0, 0.0)
+
+    async def purge(self) -> None:
+        async with self.engine.connect() as connection:
+            await connection.execute(delete(RateLimitState).where(RateLimitState.tat < func.extract("epoch", func.now())))
+
+    async def close(self) -> None:
+        await self.engine.dispose()
+
+class UploadSlots:
+    """Caps concurrent uploads with a bounded, time-limited wait queue.
+
+    The semaphore and queue live in this process, so both limits apply per
+    worker: the service-wide cap is ``MAX_CONCURRENT_UPLOADS_PER_WORKER``
+    times the number of workers.
+    """
+
+    def __init__(self, concurrency: int, max_queue: int, timeout: float, retry_after: float):
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.queued = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @asynccontextmanager
+    async def hold(self) -> AsyncIterator[None]:
+        if self.concurrency <= 0:
+            yield
+            return
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        queued_at = time.perf_counter()
+        if not self._slots.locked():
+            # Free slot: acquire() returns without suspending, so the slot is ours before anyone else runs.
+            await self._slots.acquire()
+        else:
+            if self.queued >= self.max_queue:
+                ADMISSION_REJECTIONS.labels("upload", "queue_full").inc()
+                raise AdmissionRejected(
+                    status.HTTP_503_SERVICE_UNAVAILABLE, "Too many uploads in progress", self.retry_after
+                )
+            self.queued += 1
+            UPLOAD_QUEUE_DEPTH.inc()
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.timeout)
+            except asyncio.TimeoutError:
+                ADMISSION_REJECTIONS.labels("upload", "queue_timeout").inc()
+                raise AdmissionRejected(
+                    status.HTTP_503_SERVICE_UNAVAILABLE, "Too many uploads in progress", self.retry_after
+                )
+            finally:
+                self.queued -= 1
+                UPLOAD_QUEUE_DEPTH.dec()
+        UPLOAD_QUEUE_WAIT.observe(time.perf_counter() - queued_at)
+        UPLOAD_SLOTS_IN_USE.inc()
+        try:
+            yield
+        finally:
+            UPLOAD_SLOTS_IN_USE.dec()
+            self._slots.release()
+
+class AdmissionController:
+    """Per-user token buckets plus the per-worker upload concurrency cap."""
+
+    def __init__(self, config: AdmissionConfig, store: RateLimitStore):
+        self.config = config
+        self.store = store
+        self.upload_slots = UploadSlots(
+            config.max_concurrent_uploads_per_worker,
+            config.upload_queue_size_per_worker,
+            config.upload_queue_timeout,
+            config.busy_retry_after
+        )
+
+    async def limit(self, route: str, reason: str, key: str, rate: float, burst: float, cost: float = 1) -> None:
+        """Raise 429 unless ``key`` has ``cost`` tokens in a bucket refilled at ``rate``/s up to ``burst``."""
+        if rate <= 0:
+            return
+        # A single request larger than the bucket waits for a full bucket instead of never passing.
+        cost = min(cost, burst)
+        try:
+            wait = await self.store.take(f"{reason}:{key}", cost, 1 / rate, burst)
+        except Exception as e:
+            # Fail open: a slow or unavailable store must not take uploads and downloads down with it.
+            logger.warning("Rate limit store unavailable, admitting request: %s", e)
+            return
+        if wait > 0:
+            ADMISSION_REJECTIONS.labels(route, reason).inc()
+            raise AdmissionRejected(status.HTTP_429_TOO_MANY_REQUESTS, "Rate limit exceeded", wait)
+
+    async def close(self) -> None:
+        await self.store.close()
+
+def create_rate_limit_store(config: AdmissionConfig) -> RateLimitStore:
+    if config.store == "postgres":
+        return PostgresRateLimitStore(settings.db.url, config.store_pool_size, config.store_timeout)
+    return MemoryRateLimitStore()
+
+admission = AdmissionController(settings.admission, create_rate_limit_store(settings.admission))
+
+async def admit_upload(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> AsyncIterator[None]:
+    """Dependency for upload routes; they must not declare body parameters so this runs before the body is read."""
+    if not settings.admission.enabled:
+        yield
+        return
+    config = settings.admission
+    user_key = str(current_user.id)
+    await admission.limit("upload", "upload_requests", user_key, config.upload_rate, config.upload_burst)
+    length = request.headers.get("content-length")
+    if length and length.isdigit():
+        await admission.limit(
+            "upload", "upload_bytes", user_key, config.upload_bytes_rate, config.upload_bytes_burst, int(length)
+        )
+    # A user cache miss queried through the request's session: end that transaction so
+    # uploads queued for a slot do not each pin a pooled connection.
+    await db.commit()
+    async with admission.upload_slots.hold():
+        yield
+
+async def admit_download(current_user: User = Depends(get_current_user)) -> None:
+    if settings.admission.enabled:
+        config = settings.admission
+        await admission.limit(
+            "download", "download_requests", str(current_user.id), config.download_rate, config.download_burst
+        )
+
+async def admit_signed_download(audio_id: str, client: Optional[str]) -> None:
+    """Signed URLs carry no user, so their bucket is keyed on the audio and the requesting client."""
+    if settings.admission.enabled:
+        config = settings.admission
+        await admission.limit(
+            "signed_download", "download_requests", f"{audio_id}:{client}", config.download_rate, config.download_burst
+        )
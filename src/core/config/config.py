@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from environs import Env
 from typing import Optional
 from pathlib import Path
@@ -6,6 +7,42 @@ from pathlib import Path
 @dataclass
 class StorageConfig:
     audio_upload_dir: str
+    upload_chunk_size: int = 1024 * 1024
+    max_upload_size: int = 500 * 1024 * 1024
+    upload_sessions_dir: str = ''
+    upload_session_ttl: int = 24 * 60 * 60
+    upload_session_gc_interval: int = 10 * 60
+    upload_chunk_lease: int = 15 * 60
+    # Session data is always written to upload_sessions_dir on local disk, so
+    # every node must see the same directory. Defaults to on only for the
+    # local backend, whose audio_upload_dir (and the default sessions dir
+    # inside it) is shared already.
+    upload_sessions_shared: Optional[bool] = None
+    content_addressed: bool = False
+    backend: str = "local"
+    staging_dir: str = ''
+    s3_bucket: str = ''
+    s3_prefix: str = ''
+    s3_endpoint_url: Optional[str] = None
+    s3_region: Optional[str] = None
+    s3_access_key: Optional[str] = None
+    s3_secret_key: Optional[str] = None
+    s3_max_pool_connections: int = 32
+    s3_part_size: int = 8 * 1024 * 1024
+    batch_delete_max_ids: int = 500
+    delete_concurrency: int = 16
+    delivery_mode: str = "stream"
+    accel_redirect_prefix: str = "/_protected/audio/"
+    sendfile_root: str = ''
+    shard_depth: int = 2
+
+    def __post_init__(self):
+        if not self.upload_sessions_dir:
+            self.upload_sessions_dir = os.path.join(self.audio_upload_dir, ".sessions")
+        if self.upload_sessions_shared is None:
+            self.upload_sessions_shared = self.backend == "local"
+        if not self.staging_dir:
+            self.staging_dir = os.path.join(self.audio_upload_dir, ".staging")
 
 @dataclass
 class DatabaseConfig:
@@ -18,6 +55,9 @@ class DatabaseConfig:
     echo: bool = False
     pool_size: int = 5
     max_overflow: int = 10
+    query_profiling: bool = True
+    slow_query_ms: float = 200.0
+    n_plus_one_threshold: int = 0
 
     def __post_init__(self):
         self.url = (
@@ -33,12 +73,106 @@ class AuthConfig:
     jwt_secret: str
     jwt_algorithm: str = "HS256"
     jwt_expire_minutes: int = 30
+    user_cache_size: int = 10000
+    user_cache_ttl: float = 60.0
+    user_cache_notify: bool = False
+    bcrypt_rounds: int = 12
+    password_hash_concurrency: int = 2
+    password_hash_max_queue: int = 64
+    yandex_connect_timeout: float = 3.0
+    yandex_read_timeout: float = 10.0
+    yandex_max_retries: int = 2
+    yandex_max_connections: int = 20
+    download_url_secret: str = ''
+    download_url_ttl: int = 300
+
+@dataclass
+class ProcessingConfig:
+    enabled: bool = True
+    workers: int = 2
+    batch_size: int = 20
+    poll_interval: float = 1.0
+    lease_seconds: int = 300
+    max_attempts: int = 5
+    peaks_resolutions: list[int] = field(default_factory=lambda: [256, 1024, 4096])
+    peaks_bits: int = 8
+
+@dataclass
+class CacheConfig:
+    public_listing_max_bytes: int = 32 * 1024 * 1024
+    public_listing_ttl: float = 60.0
+    public_listing_notify: bool = False
+
+@dataclass
+class MetricsConfig:
+    enabled: bool = True
+    path: str = "/metrics"
+
+@dataclass
+class SearchConfig:
+    fuzzy: bool = True
+    max_query_length: int = 200
+
+DEFAULT_QUOTA_TIERS = f"free={5 * 1024 ** 3}/1000,pro={200 * 1024 ** 3}/100000,unlimited=0/0"
+
+@dataclass
+class QuotaTier:
+    max_bytes: int = 0
+    max_audios: int = 0
+
+def parse_quota_tiers(raw: str) -> dict[str, QuotaTier]:
+    """``name=max_bytes/max_audios,...``; 0 means unlimited."""
+    tiers = {}
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        name, _, limits = item.partition("=")
+        max_bytes, _, max_audios = limits.partition("/")
+        tiers[name.strip()] = QuotaTier(int(max_bytes or 0), int(max_audios or 0))
+    return tiers
+
+@dataclass
+class QuotaConfig:
+    enabled: bool = True
+    tiers: dict[str, QuotaTier] = field(default_factory=lambda: parse_quota_tiers(DEFAULT_QUOTA_TIERS))
+    default_tier: str = "free"
+    repair_interval: int = 60 * 60
+    repair_batch_size: int = 1000
+    multipart_overhead: int = 64 * 1024
+
+    def __post_init__(self):
+        if self.default_tier not in self.tiers:
+            raise ValueError(f"QUOTA_DEFAULT_TIER {self.default_tier!r} is not one of QUOTA_TIERS")
+
+    def tier(self, name: Optional[str]) -> QuotaTier:
+        return self.tiers.get(name or self.default_tier) or self.tiers[self.default_tier]
+
+@dataclass
+class AdmissionConfig:
+    enabled: bool = True
+    store: str = "memory"
+    upload_rate: float = 1.0
+    upload_burst: int = 10
+    upload_bytes_rate: int = 20 * 1024 * 1024
+    upload_bytes_burst: int = 500 * 1024 * 1024
+    download_rate: float = 10.0
+    download_burst: int = 50
+    max_concurrent_uploads_per_worker: int = 8
+    upload_queue_size_per_worker: int = 32
+    upload_queue_timeout: float = 10.0
+    busy_retry_after: int = 5
+    store_pool_size: int = 2
+    store_timeout: float = 0.5
 
 @dataclass
 class Config:
     db: DatabaseConfig
     auth: AuthConfig
     storage: StorageConfig
+    processing: ProcessingConfig
+    cache: CacheConfig
+    metrics: MetricsConfig
+    search: SearchConfig
+    quota: QuotaConfig
+    admission: AdmissionConfig
 
 def load_config(env_path: Optional[str] = None) -> Config:
     env = Env()
@@ -51,6 +185,9 @@ def load_config(env_path: Optional[str] = None) -> Config:
             user=env.str("POSTGRES_USER"),
             password=env.str("POSTGRES_PASSWORD"),
             name=env.str("POSTGRES_DB"),
+            query_profiling=env.bool("DB_QUERY_PROFILING", True),
+            slow_query_ms=env.float("DB_SLOW_QUERY_MS", 200.0),
+            n_plus_one_threshold=env.int("DB_N_PLUS_ONE_THRESHOLD", 0),
         ),
         auth=AuthConfig(
             yandex_redirect_url=env.str("YANDEX_REDIRECT_URI"),
@@ -59,9 +196,95 @@ def load_config(env_path: Optional[str] = None) -> Config:
             jwt_secret=env.str("JWT_SECRET"),
             jwt_algorithm=env.str("JWT_ALGORITHM", "HS256"),
             jwt_expire_minutes=env.int("JWT_EXPIRE_MINUTES", 30),
+            user_cache_size=env.int("USER_CACHE_SIZE", 10000),
+            user_cache_ttl=env.float("USER_CACHE_TTL", 60.0),
+            user_cache_notify=env.bool("USER_CACHE_NOTIFY", False),
+            bcrypt_rounds=env.int("BCRYPT_ROUNDS", 12),
+            password_hash_concurrency=env.int("PASSWORD_HASH_CONCURRENCY", 2),
+            password_hash_max_queue=env.int("PASSWORD_HASH_MAX_QUEUE", 64),
+            yandex_connect_timeout=env.float("YANDEX_CONNECT_TIMEOUT", 3.0),
+            yandex_read_timeout=env.float("YANDEX_READ_TIMEOUT", 10.0),
+            yandex_max_retries=env.int("YANDEX_MAX_RETRIES", 2),
+            yandex_max_connections=env.int("YANDEX_MAX_CONNECTIONS", 20),
+            download_url_secret=env.str("DOWNLOAD_URL_SECRET", ""),
+            download_url_ttl=env.int("DOWNLOAD_URL_TTL", 300),
         ),
         storage=StorageConfig(
-            audio_upload_dir=env.str("AUDIO_UPLOAD_DIR", "uploads/audio")
+            audio_upload_dir=env.str("AUDIO_UPLOAD_DIR", "uploads/audio"),
+            upload_chunk_size=env.int("UPLOAD_CHUNK_SIZE", 1024 * 1024),
+            max_upload_size=env.int("MAX_UPLOAD_SIZE", 500 * 1024 * 1024),
+            upload_sessions_dir=env.str("UPLOAD_SESSIONS_DIR", ""),
+            upload_session_ttl=env.int("UPLOAD_SESSION_TTL", 24 * 60 * 60),
+            upload_session_gc_interval=env.int("UPLOAD_SESSION_GC_INTERVAL", 10 * 60),
+            upload_chunk_lease=env.int("UPLOAD_CHUNK_LEASE", 15 * 60),
+            upload_sessions_shared=env.bool("UPLOAD_SESSIONS_SHARED", None),
+            content_addressed=env.bool("STORAGE_CONTENT_ADDRESSED", False),
+            backend=env.str("STORAGE_BACKEND", "local"),
+            staging_dir=env.str("STORAGE_STAGING_DIR", ""),
+            s3_bucket=env.str("S3_BUCKET", ""),
+            s3_prefix=env.str("S3_PREFIX", ""),
+            s3_endpoint_url=env.str("S3_ENDPOINT_URL", None),
+            s3_region=env.str("S3_REGION", None),
+            s3_access_key=env.str("S3_ACCESS_KEY", None),
+            s3_secret_key=env.str("S3_SECRET_KEY", None),
+            s3_max_pool_connections=env.int("S3_MAX_POOL_CONNECTIONS", 32),
+            s3_part_size=env.int("S3_PART_SIZE", 8 * 1024 * 1024),
+            batch_delete_max_ids=env.int("AUDIO_BATCH_DELETE_MAX_IDS", 500),
+            delete_concurrency=env.int("STORAGE_DELETE_CONCURRENCY", 16),
+            delivery_mode=env.str(
+                "STORAGE_DELIVERY_MODE", "stream",
+                validate=lambda mode: mode in ("stream", "x-accel-redirect", "x-sendfile")
+            ),
+            accel_redirect_prefix=env.str("STORAGE_ACCEL_REDIRECT_PREFIX", "/_protected/audio/"),
+            sendfile_root=env.str("STORAGE_SENDFILE_ROOT", ""),
+            shard_depth=env.int("STORAGE_SHARD_DEPTH", 2, validate=lambda depth: 0 <= depth <= 4),
+        ),
+        processing=ProcessingConfig(
+            enabled=env.bool("PROCESSING_ENABLED", True),
+            workers=env.int("PROCESSING_WORKERS", 2),
+            batch_size=env.int("PROCESSING_BATCH_SIZE", 20),
+            poll_interval=env.float("PROCESSING_POLL_INTERVAL", 1.0),
+            lease_seconds=env.int("PROCESSING_LEASE_SECONDS", 300),
+            max_attempts=env.int("PROCESSING_MAX_ATTEMPTS", 5),
+            peaks_resolutions=sorted(env.list("PEAKS_RESOLUTIONS", [256, 1024, 4096], subcast=int)),
+            peaks_bits=env.int("PEAKS_BITS", 8, validate=lambda bits: bits in (8, 16)),
+        ),
+        cache=CacheConfig(
+            public_listing_max_bytes=env.int("PUBLIC_LISTING_CACHE_MAX_BYTES", 32 * 1024 * 1024),
+            public_listing_ttl=env.float("PUBLIC_LISTING_CACHE_TTL", 60.0),
+            public_listing_notify=env.bool("PUBLIC_LISTING_CACHE_NOTIFY", False),
+        ),
+        metrics=MetricsConfig(
+            enabled=env.bool("METRICS_ENABLED", True),
+            path=env.str("METRICS_PATH", "/metrics"),
+        ),
+        search=SearchConfig(
+            fuzzy=env.bool("AUDIO_SEARCH_FUZZY", True),
+            max_query_length=env.int("AUDIO_SEARCH_MAX_QUERY_LENGTH", 200),
+        ),
+        quota=QuotaConfig(
+            enabled=env.bool("QUOTA_ENABLED", True),
+            tiers=parse_quota_tiers(env.str("QUOTA_TIERS", DEFAULT_QUOTA_TIERS)),
+            default_tier=env.str("QUOTA_DEFAULT_TIER", "free"),
+            repair_interval=env.int("QUOTA_REPAIR_INTERVAL", 60 * 60),
+            repair_batch_size=env.int("QUOTA_REPAIR_BATCH_SIZE", 1000),
+            multipart_overhead=env.int("QUOTA_MULTIPART_OVERHEAD", 64 * 1024),
+        ),
+        admission=AdmissionConfig(
+            enabled=env.bool("ADMISSION_ENABLED", True),
+            store=env.str("ADMISSION_STORE", "memory", validate=lambda store: store in ("memory", "postgres")),
+            upload_rate=env.float("UPLOAD_RATE", 1.0),
+            upload_burst=env.int("UPLOAD_BURST", 10),
+            upload_bytes_rate=env.int("UPLOAD_BYTES_RATE", 20 * 1024 * 1024),
+            upload_bytes_burst=env.int("UPLOAD_BYTES_BURST", 500 * 1024 * 1024),
+            download_rate=env.float("DOWNLOAD_RATE", 10.0),
+            download_burst=env.int("DOWNLOAD_BURST", 50),
+            max_concurrent_uploads_per_worker=env.int("MAX_CONCURRENT_UPLOADS_PER_WORKER", 8),
+            upload_queue_size_per_worker=env.int("UPLOAD_QUEUE_SIZE_PER_WORKER", 32),
+            upload_queue_timeout=env.float("UPLOAD_QUEUE_TIMEOUT", 10.0),
+            busy_retry_after=env.int("ADMISSION_BUSY_RETRY_AFTER", 5),
+            store_pool_size=env.int("ADMISSION_STORE_POOL_SIZE", 2),
+            store_timeout=env.float("ADMISSION_STORE_TIMEOUT", 0.5),
         )
     )
 
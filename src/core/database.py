@@ -1,14 +1,33 @@
-from typing import AsyncGenerator
+import time
+from typing import AsyncGenerator, Callable
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from src.core.config.config import settings
+from src.core.metrics import DB_POOL_WAIT, register_pool_metrics
+from src.core.query_profiler import install_query_profiler
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
 
 engine = create_async_engine(
     settings.db.url,
     echo=settings.db.echo,
+    poolclass=InstrumentedPool,
     pool_size=settings.db.pool_size,
     max_overflow=settings.db.max_overflow
 )
+register_pool_metrics(engine.pool)
+if settings.db.query_profiling:
+    install_query_profiler(engine, settings.db.slow_query_ms, settings.db.n_plus_one_threshold)
 
 SessionLocal = async_sessionmaker(
     bind=engine,
@@ -19,11 +38,54 @@ SessionLocal = async_sessionmaker(
 
 Base = declarative_base()
 
+def run_after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Call ``callback`` once the session's current transaction commits."""
+    session.sync_session.info.setdefault("after_commit", []).append(callback)
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    """Whether the current transaction changed anything that must be committed."""
+    sync_session = session.sync_session
+    return bool(
+        sync_session.info.get("has_writes")
+        or sync_session.info.get("after_commit")
+        or sync_session.new
+        or sync_session.dirty
+        or sync_session.deleted
+    )
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_written(session: Session, flush_context) -> None:
+    session.info["has_writes"] = True
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_written(orm_execute_state) -> None:
+    # Anything that is not a plain SELECT (DML, textual SQL such as
+    # pg_notify) is treated as a write.
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["has_writes"] = True
+
+@event.listens_for(Session, "after_commit")
+def _run_commit_callbacks(session: Session) -> None:
+    session.info.pop("has_writes", None)
+    for callback in session.info.pop("after_commit", []):
+        callback()
+
+@event.listens_for(Session, "after_rollback")
+def _discard_commit_callbacks(session: Session) -> None:
+    session.info.pop("has_writes", None)
+    session.info.pop("after_commit", None)
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Request-scoped unit of work.
+
+    Repositories and services only flush; the request's changes are committed
+    once here. Requests that only read skip the commit round trip.
+    """
     session = SessionLocal()
     try:
         yield session
-        await session.commit()
+        if has_pending_writes(session):
+            await session.commit()
     except Exception:
         await session.rollback()
         raise
@@ -34,5 +96,9 @@ async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+async def has_extension(name: str) -> bool:
+    async with engine.connect() as connection:
+        return bool(await connection.scalar(text("SELECT 1 FROM pg_extension WHERE extname = :name"), {"name": name}))
+
 async def shutdown_db():
     await engine.dispose()
\ No newline at end of file
@@ -0,0 +1,240 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterable, AsyncIterator, Optional
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+UNMATCHED_ROUTE = "<unmatched>"
+KNOWN_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+THROUGHPUT_BUCKETS = (
+    64 * 1024, 256 * 1024, 1024 ** 2, 4 * 1024 ** 2, 16 * 1024 ** 2,
+    64 * 1024 ** 2, 256 * 1024 ** 2, 1024 ** 3,
+)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"]
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    ["method", "route"]
+)
+UPLOAD_BYTES = Counter("audio_upload_bytes", "Audio bytes received from clients")
+DOWNLOAD_BYTES = Counter("audio_download_bytes", "Audio bytes streamed to clients")
+OFFLOADED_DOWNLOADS = Counter(
+    "audio_offloaded_downloads",
+    "Downloads handed to the fronting proxy instead of streamed by the app",
+    ["mode"]
+)
+TRANSFER_THROUGHPUT = Histogram(
+    "audio_transfer_throughput_bytes_per_second",
+    "Per-transfer throughput of uploads and downloads",
+    ["direction"],
+    buckets=THROUGHPUT_BUCKETS
+)
+QUOTA_REJECTIONS = Counter(
+    "quota_rejected_uploads",
+    "Uploads refused for exceeding the storage quota, before the body (early) or at commit",
+    ["stage"]
+)
+USAGE_DRIFT_REPAIRED = Counter("quota_usage_drift_repaired", "Per-user usage counters corrected by the repair job")
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejected_requests",
+    "Requests refused by admission control",
+    ["route", "reason"]
+)
+UPLOAD_SLOTS_IN_USE = Gauge("admission_upload_slots_in_use", "Uploads currently holding a concurrency slot")
+UPLOAD_QUEUE_DEPTH = Gauge("admission_upload_queue_depth", "Uploads waiting for a concurrency slot")
+UPLOAD_QUEUE_WAIT = Histogram(
+    "admission_upload_queue_wait_seconds",
+    "Time an admitted upload waited for a concurrency slot",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+SAVE_DURATION = Histogram("audio_save_duration_seconds", "Time spent staging an uploaded file")
+PROCESSING_DURATION = Histogram(
+    "audio_processing_duration_seconds",
+    "Time spent on one file by a processing job",
+    ["kind"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+def observe_upload(size: int, elapsed: float) -> None:
+    UPLOAD_BYTES.inc(size)
+    if size and elapsed > 0:
+        TRANSFER_THROUGHPUT.labels("upload").observe(size / elapsed)
+
+async def metered_download(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    size = 0
+    started = time.perf_counter()
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+    finally:
+        DOWNLOAD_BYTES.inc(size)
+        elapsed = time.perf_counter() - started
+        if size and elapsed > 0:
+            TRANSFER_THROUGHPUT.labels("download").observe(size / elapsed)
+
+class PoolCollector:
+    """Reports SQLAlchemy QueuePool occupancy at scrape time."""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def collect(self):
+        for name, doc, value in (
+            ("db_pool_size", "Configured pool size", self.pool.size()),
+            ("db_pool_checked_out", "Connections currently checked out", self.pool.checkedout()),
+            ("db_pool_checked_in", "Idle connections in the pool", self.pool.checkedin()),
+            ("db_pool_overflow", "Connections open beyond pool_size", max(self.pool.overflow(), 0)),
+        ):
+            yield GaugeMetricFamily(name, doc, value=value)
+
+class ExecutorCollector:
+    """Reports the backlog of the event loop's default (``to_thread``) executor."""
+
+    def __init__(self):
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def collect(self):
+        if self.executor is None:
+            return
+        yield GaugeMetricFamily(
+            "to_thread_queue_depth",
+            "Calls waiting for a to_thread worker",
+            value=self.executor._work_queue.qsize()
+        )
+        yield GaugeMetricFamily(
+            "to_thread_workers",
+            "Threads started by the to_thread executor",
+            value=len(self.executor._threads)
+        )
+
+class UserCacheCollector:
+    """Reports the in-process authenticated-user cache at scrape time."""
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    def collect(self):
+        snapshot = self.cache.snapshot()
+        for name, doc in (
+            ("hits", "User lookups served from the cache"),
+            ("misses", "User lookups that went to the database"),
+            ("evictions", "Cached users dropped to stay within the size limit"),
+            ("invalidations", "Cached users dropped after a change to the user"),
+        ):
+            yield CounterMetricFamily(f"user_cache_{name}", doc, value=snapshot[name])
+        yield GaugeMetricFamily("user_cache_entries", "Users currently cached", value=snapshot["size"])
+
+class PasswordHasherCollector:
+    """Reports the bcrypt pool's occupancy and queue at scrape time."""
+
+    def __init__(self, hasher):
+        self.hasher = hasher
+
+    def collect(self):
+        snapshot = self.hasher.snapshot()
+        for name, doc in (
+            ("in_flight", "Password hashes running in the bcrypt pool"),
+            ("queued", "Password hashes waiting for a bcrypt slot"),
+            ("concurrency", "Configured bcrypt pool size"),
+            ("max_queue", "Configured bcrypt queue limit"),
+            ("wait_seconds_max", "Longest wait for a bcrypt slot"),
+        ):
+            yield GaugeMetricFamily(f"password_hash_{name}", doc, value=snapshot[name])
+        for name, doc, value in (
+            ("completed", "Password hashes finished", snapshot["completed"]),
+            ("rejected", "Password hashes refused because the queue was full", snapshot["rejected"]),
+            ("rehashed", "Stored hashes upgraded on login", snapshot["rehashed"]),
+            ("wait_seconds", "Time spent waiting for a bcrypt slot", snapshot["wait_seconds_total"]),
+            ("run_seconds", "Time spent hashing", snapshot["run_seconds_total"]),
+        ):
+            yield CounterMetricFamily(f"password_hash_{name}", doc, value=value)
+
+class YandexClientCollector:
+    """Reports Yandex OAuth call counts, retries and latency per endpoint at scrape time."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def collect(self):
+        families = {
+            "requests": CounterMetricFamily("yandex_requests", "Yandex OAuth calls, each attempt counted", labels=["endpoint"]),
+            "errors": CounterMetricFamily("yandex_request_errors", "Yandex OAuth attempts that failed or got a 5xx", labels=["endpoint"]),
+            "retries": CounterMetricFamily("yandex_request_retries", "Yandex OAuth attempts that were retried", labels=["endpoint"]),
+            "seconds_total": CounterMetricFamily("yandex_request_seconds", "Time spent in Yandex OAuth calls", labels=["endpoint"]),
+            "seconds_max": GaugeMetricFamily("yandex_request_seconds_max", "Slowest Yandex OAuth call", labels=["endpoint"]),
+        }
+        for endpoint, stats in self.client.snapshot().items():
+            for field, family in families.items():
+                family.add_metric([endpoint], stats[field])
+        yield from families.values()
+
+def register_pool_metrics(pool) -> None:
+    REGISTRY.register(PoolCollector(pool))
+
+_executor_collector = ExecutorCollector()
+REGISTRY.register(_executor_collector)
+
+def instrument_default_executor(loop) -> ThreadPoolExecutor:
+    """Install a default executor whose queue depth can be observed."""
+    executor = ThreadPoolExecutor(thread_name_prefix="to_thread")
+    loop.set_default_executor(executor)
+    _executor_collector.executor = executor
+    return executor
+
+class MetricsMiddleware:
+    """Per-route latency and in-flight requests.
+
+    Routes are labelled by their path template (``/api/audio/{audio_id}``),
+    never by the concrete URL, so label cardinality is bounded by the route
+    table.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"] if scope["method"] in KNOWN_METHODS else "OTHER"
+        route = self._route_template(scope)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            REQUEST_DURATION.labels(method, route, str(status_code)).observe(time.perf_counter() - started)
+
+    def _route_template(self, scope: Scope) -> str:
+        partial: Optional[str] = None
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+            if match == Match.PARTIAL and partial is None:
+                partial = route.path
+        return partial or UNMATCHED_ROUTE
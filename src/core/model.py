@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Double, String
+from src.shared.models.base import Base
+
+class RateLimitState(Base):
+    """Token-bucket state shared by all workers: one theoretical arrival time per key."""
+    __tablename__ = "rate_limits"
+    # Losing it on a crash only resets the buckets, so skip the WAL.
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key = Column(String, primary_key=True)
+    tat = Column(Double, nullable=False)
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Callable, Optional
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config.config import settings
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[[str], None]
+
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+
+async def notify(session: AsyncSession, channel: str, payload: str) -> None:
+    """Queue a notification; Postgres delivers it when the transaction commits."""
+    await session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+
+class PgNotifier:
+    """Dispatches Postgres NOTIFY messages to in-process listeners.
+
+    Keeps one dedicated connection outside the SQLAlchemy pool and reconnects
+    with backoff when it drops.
+    """
+
+    def __init__(self):
+        self._listeners: dict[str, list[Listener]] = defaultdict(list)
+        self._resets: list[Callable[[], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._connection: Optional[asyncpg.Connection] = None
+
+    def subscribe(self, channel: str, listener: Listener, reset: Optional[Callable[[], None]] = None) -> None:
+        """Register ``listener`` for ``channel``.
+
+        ``reset`` runs after every (re)connect, since messages sent while the
+        connection was down are lost.
+        """
+        self._listeners[channel].append(listener)
+        if reset is not None:
+            self._resets.append(reset)
+
+    async def start(self) -> None:
+        if self._listeners and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="pg-notifier")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._listeners.clear()
+        self._resets.clear()
+
+    def _dispatch(self, connection, pid, channel: str, payload: str) -> None:
+        for listener in self._listeners.get(channel, ()):
+            try:
+                listener(payload)
+            except Exception:
+                logger.exception("Notification listener for %s failed", channel)
+
+    async def _connect(self) -> asyncpg.Connection:
+        connection = await asyncpg.connect(
+            host=settings.db.host,
+            port=settings.db.port,
+            user=settings.db.user,
+            password=settings.db.password,
+            database=settings.db.name
+        )
+        for channel in self._listeners:
+            await connection.add_listener(channel, self._dispatch)
+        return connection
+
+    async def _run(self) -> None:
+        delay = RECONNECT_DELAY
+        while True:
+            closed = asyncio.Event()
+            try:
+                self._connection = await self._connect()
+                self._connection.add_termination_listener(lambda _: closed.set())
+                for reset in self._resets:
+                    reset()
+                delay = RECONNECT_DELAY
+                await closed.wait()
+                logger.warning("Notification connection lost, reconnecting")
+            except asyncio.CancelledError:
+                if self._connection is not None:
+                    await self._connection.close()
+                raise
+            except (OSError, asyncpg.PostgresError):
+                logger.warning("Failed to connect for notifications, retrying in %.0fs", delay, exc_info=True)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+            finally:
+                self._connection = None
+
+notifier = PgNotifier()
@@ -0,0 +1,114 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("sql.profile")
+slow_logger = logging.getLogger("sql.slow")
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s")
+# "(?, ?, ?)" from IN lists and multi-row VALUES, however long.
+_VALUES_LIST = re.compile(r"\((?:\?,\s*)*\?\)(?:,\s*\((?:\?,\s*)*\?\))*")
+
+def normalize_sql(statement: str) -> str:
+    """Statement shape with literals and parameter lists collapsed."""
+    sql = _STRING.sub("?", statement)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _VALUES_LIST.sub("(...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+def install_query_profiler(engine: AsyncEngine, slow_query_ms: float, n_plus_one_threshold: int) -> None:
+    """Attribute every statement on ``engine`` to the request being served.
+
+    ``n_plus_one_threshold`` > 0 warns once per request when one statement
+    shape runs more often than that, which is what lazy loads in a loop
+    look like.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        context._profiler_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._profiler_started
+        if slow_query_ms and elapsed * 1000 >= slow_query_ms:
+            slow_logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, normalize_sql(statement))
+        stats = _current_stats.get()
+        if stats is None:
+            return
+        stats.count += 1
+        stats.duration += elapsed
+        if n_plus_one_threshold:
+            shape = normalize_sql(statement)
+            stats.shapes[shape] += 1
+            if stats.shapes[shape] == n_plus_one_threshold + 1:
+                logger.warning(
+                    "Possible N+1: statement ran more than %d times in one request: %s",
+                    n_plus_one_threshold, shape
+                )
+
+class QueryProfilingMiddleware:
+    """Collects per-request query count and DB time.
+
+    Reports them in a ``Server-Timing`` header and one log line per request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+            logger.info(
+                "%s %s %d db_queries=%d db_time_ms=%.1f duration_ms=%.1f",
+                scope["method"], scope["path"], status_code, stats.count,
+                stats.duration * 1000, (time.perf_counter() - started) * 1000,
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "db_queries": stats.count,
+                    "db_time_ms": round(stats.duration * 1000, 1),
+                }
+            )
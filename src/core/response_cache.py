@@ -0,0 +1,87 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    expires_at: float
+
+    def not_modified(self, if_none_match: Optional[str]) -> bool:
+        # Only the ETag, a hash of the body: it agrees across workers, while a
+        # Last-Modified taken from each process's own invalidation time would not.
+        if if_none_match is None:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or self.etag in tags
+
+@dataclass
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+class ResponseCache:
+    """LRU cache of serialized response bodies bounded by total body size.
+
+    ``invalidate`` bumps a generation counter; bodies computed from data read
+    before the bump are not stored, so a concurrent request cannot put a
+    stale page back right after an invalidation.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = ResponseCacheStats()
+        self.generation = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._size = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry
+
+    def put(self, key: str, body: bytes, generation: int) -> CachedResponse:
+        entry = CachedResponse(
+            body=body,
+            etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            expires_at=time.monotonic() + self.ttl
+        )
+        if generation != self.generation or len(body) > self.max_bytes:
+            return entry
+        self._remove(key)
+        self._entries[key] = entry
+        self._size += len(body)
+        while self._size > self.max_bytes:
+            oldest, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.body)
+            self.stats.evictions += 1
+        return entry
+
+    def invalidate(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+        self._size = 0
+        self.stats.invalidations += 1
+
+    def handle_notification(self, payload: str) -> None:
+        self.invalidate()
+
+    def snapshot(self) -> dict:
+        return {**asdict(self.stats), "entries": len(self._entries), "bytes": self._size, "max_bytes": self.max_bytes}
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry.body)
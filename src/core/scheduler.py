@@ -0,0 +1,36 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[], Awaitable[None]]
+
+class Scheduler:
+    def __init__(self):
+        self._jobs: list[tuple[str, float, Job]] = []
+        self._tasks: list[asyncio.Task] = []
+
+    def add_job(self, name: str, interval: float, func: Job) -> None:
+        self._jobs.append((name, interval, func))
+
+    async def start(self) -> None:
+        for name, interval, func in self._jobs:
+            self._tasks.append(asyncio.create_task(self._run(name, interval, func), name=name))
+
+    async def shutdown(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._jobs.clear()
+
+    async def _run(self, name: str, interval: float, func: Job) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await func()
+            except Exception:
+                logger.exception("Scheduled job %s failed", name)
+
+scheduler = Scheduler()
@@ -0,0 +1,66 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+class StorageError(Exception):
+    pass
+
+class FileTooLargeError(StorageError):
+    def __init__(self, max_size: int):
+        super().__init__(f"File exceeds maximum size of {max_size} bytes")
+        self.max_size = max_size
+
+@dataclass
+class ObjectStat:
+    size: int
+    modified: datetime
+
+class StorageBackend(ABC):
+    @abstractmethod
+    async def put_stream(self, key: str, chunks: AsyncIterator[bytes]) -> int:
+        ...
+
+    @abstractmethod
+    async def put_file(self, key: str, source_path: str) -> None:
+        """Move a local file into the backend under ``key``."""
+
+    @abstractmethod
+    def get_stream(
+        self,
+        key: str,
+        offset: int = 0,
+        length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    async def stat(self, key: str) -> Optional[ObjectStat]:
+        ...
+
+    @abstractmethod
+    async def copy(self, source_key: str, target_key: str) -> None:
+        ...
+
+    @abstractmethod
+    def iter_keys(self, prefix: str = "", batch_size: int = 1000) -> AsyncIterator[list[tuple[str, ObjectStat]]]:
+        """Stream stored objects under ``prefix`` in batches of at most ``batch_size``.
+
+        Entries whose path has a component starting with ``.`` (staging,
+        upload sessions, quarantine) are skipped unless ``prefix`` points
+        inside them.
+        """
+
+    def local_path(self, key: str) -> Optional[str]:
+        return None
+
+    async def close(self) -> None:
+        pass
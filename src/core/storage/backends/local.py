@@ -0,0 +1,172 @@
+import os
+import asyncio
+import itertools
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Optional
+import aiofiles
+
+from src.core.storage.backends.base import FileTooLargeError, ObjectStat, StorageBackend, StorageError
+
+class LocalStorageBackend(StorageBackend):
+    def __init__(self, root: str, chunk_size: int = 1024 * 1024):
+        self.root = os.path.normpath(os.path.join(Path.cwd(), root))
+        self.chunk_size = chunk_size
+
+    def _path(self, key: str) -> str:
+        path = os.path.normpath(os.path.join(self.root, key))
+        if not path.startswith(self.root + os.sep):
+            raise StorageError(f"Invalid storage key: {key}")
+        return path
+
+    def local_path(self, key: str) -> Optional[str]:
+        return self._path(key)
+
+    async def _ensure_parent(self, path: str) -> None:
+        await asyncio.to_thread(os.makedirs, os.path.dirname(path), exist_ok=True)
+
+    async def put_stream(self, key: str, chunks: AsyncIterator[bytes]) -> int:
+        path = self._path(key)
+        partial_path = f"{path}.part"
+        await self._ensure_parent(path)
+        size = 0
+        try:
+            async with aiofiles.open(partial_path, "wb") as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+                    size += len(chunk)
+            await asyncio.to_thread(os.replace, partial_path, path)
+        except BaseException:
+            await asyncio.to_thread(self._remove_quietly, partial_path)
+            raise
+        return size
+
+    async def put_file(self, key: str, source_path: str) -> None:
+        path = self._path(key)
+        await self._ensure_parent(path)
+        try:
+            await asyncio.to_thread(shutil.move, source_path, path)
+        except OSError as e:
+            raise StorageError(f"Failed to store {key}: {e}") from e
+
+    async def get_stream(
+        self,
+        key: str,
+        offset: int = 0,
+        length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        remaining = length
+        try:
+            async with aiofiles.open(self._path(key), "rb") as f:
+                await f.seek(offset)
+                while remaining is None or remaining > 0:
+                    size = self.chunk_size if remaining is None else min(self.chunk_size, remaining)
+                    chunk = await f.read(size)
+                    if not chunk:
+                        break
+                    if remaining is not None:
+                        remaining -= len(chunk)
+                    yield chunk
+        except FileNotFoundError as e:
+            raise StorageError(f"Object not found: {key}") from e
+
+    async def delete(self, key: str) -> bool:
+        try:
+            await asyncio.to_thread(os.remove, self._path(key))
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            raise StorageError(f"Failed to delete {key}: {e}") from e
+        return True
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(os.path.exists, self._path(key))
+
+    async def stat(self, key: str) -> Optional[ObjectStat]:
+        try:
+            st = await asyncio.to_thread(os.stat, self._path(key))
+        except FileNotFoundError:
+            return None
+        return ObjectStat(
+            size=st.st_size,
+            modified=datetime.fromtimestamp(st.st_mtime, tz=timezone.utc)
+        )
+
+    async def copy(self, source_key: str, target_key: str) -> None:
+        source, target = self._path(source_key), self._path(target_key)
+        await self._ensure_parent(target)
+        try:
+            await asyncio.to_thread(self._link_or_copy, source, target)
+        except OSError as e:
+            raise StorageError(f"Failed to copy {source_key} to {target_key}: {e}") from e
+
+    async def iter_keys(self, prefix: str = "", batch_size: int = 1000) -> AsyncIterator[list[tuple[str, ObjectStat]]]:
+        # One generator advanced a batch at a time on a worker thread: scandir
+        # streams directory entries, so memory stays bounded even in a flat
+        # directory with millions of files.
+        entries = self._scan(self._path(prefix) if prefix else self.root)
+        try:
+            while batch := await asyncio.to_thread(lambda: list(itertools.islice(entries, batch_size))):
+                yield batch
+        finally:
+            entries.close()
+
+    def _scan(self, start: str) -> Iterator[tuple[str, ObjectStat]]:
+        directories = [start]
+        while directories:
+            try:
+                with os.scandir(directories.pop()) as it:
+                    for entry in it:
+                        if entry.name.startswith(".") or entry.name.endswith(".part"):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            directories.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            st = entry.stat(follow_symlinks=False)
+                            key = os.path.relpath(entry.path, self.root).replace(os.sep, "/")
+                            yield key, ObjectStat(
+                                size=st.st_size,
+                                modified=datetime.fromtimestamp(st.st_mtime, tz=timezone.utc)
+                            )
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+
+    async def create_empty(self, key: str) -> str:
+        path = self._path(key)
+        await self._ensure_parent(path)
+        async with aiofiles.open(path, "wb"):
+            pass
+        return path
+
+    async def write_at(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        offset: int,
+        limit: int
+    ) -> int:
+        written = 0
+        async with aiofiles.open(self._path(key), "r+b") as f:
+            await f.seek(offset)
+            async for chunk in chunks:
+                if written + len(chunk) > limit:
+                    raise FileTooLargeError(offset + limit)
+                await f.write(chunk)
+                written += len(chunk)
+            await f.flush()
+        return written
+
+    def _link_or_copy(self, source: str, target: str) -> None:
+        try:
+            os.link(source, target)
+        except FileExistsError:
+            raise
+        except OSError:
+            shutil.copyfile(source, target)
+
+    def _remove_quietly(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
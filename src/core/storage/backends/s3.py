@@ -0,0 +1,191 @@
+import os
+import asyncio
+from contextlib import AsyncExitStack
+from typing import AsyncIterator, Optional
+import aiofiles
+
+from src.core.storage.backends.base import ObjectStat, StorageBackend, StorageError
+
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+class S3StorageBackend(StorageBackend):
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        max_pool_connections: int = 32,
+        part_size: int = 8 * 1024 * 1024,
+        chunk_size: int = 1024 * 1024
+    ):
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.max_pool_connections = max_pool_connections
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.chunk_size = chunk_size
+        self._client = None
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._lock = asyncio.Lock()
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    async def _get_client(self):
+        if self._client is not None:
+            return self._client
+        async with self._lock:
+            if self._client is None:
+                from aiobotocore.config import AioConfig
+                from aiobotocore.session import get_session
+
+                exit_stack = AsyncExitStack()
+                self._client = await exit_stack.enter_async_context(
+                    get_session().create_client(
+                        "s3",
+                        endpoint_url=self.endpoint_url,
+                        region_name=self.region,
+                        aws_access_key_id=self.access_key,
+                        aws_secret_access_key=self.secret_key,
+                        config=AioConfig(max_pool_connections=self.max_pool_connections)
+                    )
+                )
+                self._exit_stack = exit_stack
+        return self._client
+
+    async def close(self) -> None:
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+        self._client = None
+        self._exit_stack = None
+
+    async def put_stream(self, key: str, chunks: AsyncIterator[bytes]) -> int:
+        client = await self._get_client()
+        object_key = self._key(key)
+        buffer = bytearray()
+        size = 0
+        upload_id = None
+        parts = []
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                size += len(chunk)
+                if len(buffer) < self.part_size:
+                    continue
+                if upload_id is None:
+                    response = await client.create_multipart_upload(Bucket=self.bucket, Key=object_key)
+                    upload_id = response["UploadId"]
+                parts.append(await self._upload_part(client, object_key, upload_id, len(parts) + 1, bytes(buffer)))
+                buffer.clear()
+            if upload_id is None:
+                await client.put_object(Bucket=self.bucket, Key=object_key, Body=bytes(buffer))
+                return size
+            if buffer:
+                parts.append(await self._upload_part(client, object_key, upload_id, len(parts) + 1, bytes(buffer)))
+            await client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=object_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+        except BaseException as e:
+            if upload_id is not None:
+                await client.abort_multipart_upload(Bucket=self.bucket, Key=object_key, UploadId=upload_id)
+            if isinstance(e, Exception) and not isinstance(e, StorageError):
+                raise StorageError(f"Failed to store {key}: {e}") from e
+            raise
+        return size
+
+    async def _upload_part(self, client, object_key: str, upload_id: str, number: int, body: bytes) -> dict:
+        response = await client.upload_part(
+            Bucket=self.bucket,
+            Key=object_key,
+            UploadId=upload_id,
+            PartNumber=number,
+            Body=body
+        )
+        return {"ETag": response["ETag"], "PartNumber": number}
+
+    async def put_file(self, key: str, source_path: str) -> None:
+        await self.put_stream(key, self._read_file(source_path))
+        await asyncio.to_thread(os.remove, source_path)
+
+    async def _read_file(self, path: str) -> AsyncIterator[bytes]:
+        async with aiofiles.open(path, "rb") as f:
+            while chunk := await f.read(self.part_size):
+                yield chunk
+
+    async def get_stream(
+        self,
+        key: str,
+        offset: int = 0,
+        length: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        client = await self._get_client()
+        params = {"Bucket": self.bucket, "Key": self._key(key)}
+        if offset or length is not None:
+            end = "" if length is None else str(offset + length - 1)
+            params["Range"] = f"bytes={offset}-{end}"
+        try:
+            response = await client.get_object(**params)
+        except client.exceptions.NoSuchKey as e:
+            raise StorageError(f"Object not found: {key}") from e
+        async with response["Body"] as body:
+            while chunk := await body.read(self.chunk_size):
+                yield chunk
+
+    async def delete(self, key: str) -> bool:
+        client = await self._get_client()
+        try:
+            await client.delete_object(Bucket=self.bucket, Key=self._key(key))
+        except Exception as e:
+            raise StorageError(f"Failed to delete {key}: {e}") from e
+        return True
+
+    async def exists(self, key: str) -> bool:
+        return await self.stat(key) is not None
+
+    async def stat(self, key: str) -> Optional[ObjectStat]:
+        client = await self._get_client()
+        try:
+            response = await client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise StorageError(f"Failed to stat {key}: {e}") from e
+        return ObjectStat(size=response["ContentLength"], modified=response["LastModified"])
+
+    async def iter_keys(self, prefix: str = "", batch_size: int = 1000) -> AsyncIterator[list[tuple[str, ObjectStat]]]:
+        client = await self._get_client()
+        root = self._key("")
+        pages = client.get_paginator("list_objects_v2").paginate(
+            Bucket=self.bucket,
+            Prefix=self._key(prefix),
+            PaginationConfig={"PageSize": min(batch_size, 1000)}
+        )
+        async for page in pages:
+            batch = []
+            for obj in page.get("Contents", []):
+                key = obj["Key"][len(root):]
+                if not prefix and any(part.startswith(".") for part in key.split("/")):
+                    continue
+                batch.append((key, ObjectStat(size=obj["Size"], modified=obj["LastModified"])))
+            if batch:
+                yield batch
+
+    async def copy(self, source_key: str, target_key: str) -> None:
+        client = await self._get_client()
+        try:
+            await client.copy_object(
+                Bucket=self.bucket,
+                Key=self._key(target_key),
+                CopySource={"Bucket": self.bucket, "Key": self._key(source_key)}
+            )
+        except Exception as e:
+            raise StorageError(f"Failed to copy {source_key} to {target_key}: {e}") from e
@@ -1,30 +1,228 @@
 import os
+import re
+import uuid
 import asyncio
+import hashlib
+import shutil
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Iterable, Optional, Protocol
+import aiofiles
+
+from src.core.config.config import StorageConfig, settings
+from src.core.storage.backends.base import FileTooLargeError, StorageBackend, StorageError
+from src.core.storage.backends.local import LocalStorageBackend
+
+HEX_PREFIX = re.compile(r"[0-9a-f]*")
+
+class AsyncReadable(Protocol):
+    async def read(self, size: int = -1) -> bytes: ...
+
+@dataclass
+class StagedFile:
+    path: str
+    size: int
+    sha256: str
+
+@dataclass
+class StoredFile:
+    key: str
+    size: int
+    sha256: str
+
+def create_storage_backend(config: StorageConfig) -> StorageBackend:
+    if config.backend == "local":
+        return LocalStorageBackend(config.audio_upload_dir, chunk_size=config.upload_chunk_size)
+    if config.backend == "s3":
+        from src.core.storage.backends.s3 import S3StorageBackend
+
+        return S3StorageBackend(
+            bucket=config.s3_bucket,
+            prefix=config.s3_prefix,
+            endpoint_url=config.s3_endpoint_url,
+            region=config.s3_region,
+            access_key=config.s3_access_key,
+            secret_key=config.s3_secret_key,
+            max_pool_connections=config.s3_max_pool_connections,
+            part_size=config.s3_part_size,
+            chunk_size=config.upload_chunk_size
+        )
+    raise ValueError(f"Unknown storage backend: {config.backend}")
+
+storage_backend = create_storage_backend(settings.storage)
 
 class StorageService:
-    def __init__(self, base_path: str):
-        self.base_path = base_path
-        self._full_base_path = self._get_full_path(base_path)
-    
-    @classmethod
-    async def create(cls, base_path: str) -> "StorageService":
-        instance = cls(base_path)
-        await instance.ensure_directory_exists() 
-        return instance
-
-    def _get_full_path(self, relative_path: str) -> str:
-        return os.path.join(Path.cwd(), relative_path)
-    
-    async def ensure_directory_exists(self, path: Optional[str] = None) -> str:
-        relative_path = os.path.join(self.base_path, path) if path else self.base_path
-        full_path = self._get_full_path(relative_path)
-        await asyncio.to_thread(Path(full_path).mkdir, parents=True, exist_ok=True)
-        return relative_path
-    
-    async def get_full_path(self, relative_path: str) -> str:
-        return self._get_full_path(os.path.join(self.base_path, relative_path))
-    
-    async def get_storage_path(self, relative_path: str) -> str:
-        return os.path.join(self.base_path, relative_path)
\ No newline at end of file
+    def __init__(
+        self,
+        backend: StorageBackend,
+        staging_dir: str,
+        chunk_size: int = 1024 * 1024,
+        max_file_size: Optional[int] = None,
+        content_addressed: bool = False,
+        shard_depth: int = 0
+    ):
+        self.backend = backend
+        self.staging_dir = os.path.join(Path.cwd(), staging_dir)
+        self.chunk_size = chunk_size
+        self.max_file_size = max_file_size
+        self.content_addressed = content_addressed
+        self.shard_depth = shard_depth
+
+    async def ensure_directory_exists(self) -> str:
+        await asyncio.to_thread(Path(self.staging_dir).mkdir, parents=True, exist_ok=True)
+        return self.staging_dir
+
+    def _staging_path(self) -> str:
+        return os.path.join(self.staging_dir, f"{uuid.uuid4()}.part")
+
+    async def stage_stream(self, source: AsyncReadable) -> StagedFile:
+        staging_path = self._staging_path()
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with aiofiles.open(staging_path, "wb") as f:
+                while chunk := await source.read(self.chunk_size):
+                    size += len(chunk)
+                    if self.max_file_size is not None and size > self.max_file_size:
+                        raise FileTooLargeError(self.max_file_size)
+                    digest.update(chunk)
+                    await f.write(chunk)
+        except BaseException:
+            await self._remove_local(staging_path)
+            raise
+        return StagedFile(path=staging_path, size=size, sha256=digest.hexdigest())
+
+    async def stage_file(self, file_path: str) -> StagedFile:
+        """Stage a hard link to (or, across filesystems, a copy of) ``file_path``.
+
+        :meth:`store` moves what it is given; staging a link leaves the
+        original in place until the caller decides it can go.
+        """
+        await self.ensure_directory_exists()
+        staging_path = self._staging_path()
+        try:
+            await asyncio.to_thread(self._link_or_copy, file_path, staging_path)
+            size, sha256 = await asyncio.to_thread(self.hash_file, staging_path)
+        except BaseException:
+            await self._remove_local(staging_path)
+            raise
+        return StagedFile(path=staging_path, size=size, sha256=sha256)
+
+    async def store(self, staged: StagedFile, key: str) -> StoredFile:
+        await self.backend.put_file(key, staged.path)
+        return StoredFile(key=key, size=staged.size, sha256=staged.sha256)
+
+    async def store_blob(self, staged: StagedFile, key: str) -> StoredFile:
+        if await self.backend.exists(key):
+            await self.discard(staged)
+            return StoredFile(key=key, size=staged.size, sha256=staged.sha256)
+        return await self.store(staged, key)
+
+    async def put_bytes(self, key: str, data: bytes) -> None:
+        async def chunks() -> AsyncIterator[bytes]:
+            yield data
+
+        await self.backend.put_stream(key, chunks())
+
+    async def read_bytes(self, key: str, offset: int = 0, length: Optional[int] = None) -> Optional[bytes]:
+        try:
+            return b"".join([chunk async for chunk in self.backend.get_stream(key, offset, length)])
+        except StorageError:
+            return None
+
+    async def discard(self, staged: StagedFile) -> None:
+        await self._remove_local(staged.path)
+
+    @asynccontextmanager
+    async def local_copy(self, key: str) -> AsyncIterator[str]:
+        local_path = self.backend.local_path(key)
+        if local_path is not None:
+            yield local_path
+            return
+        await self.ensure_directory_exists()
+        staging_path = self._staging_path()
+        try:
+            async with aiofiles.open(staging_path, "wb") as f:
+                async for chunk in self.backend.get_stream(key):
+                    await f.write(chunk)
+            yield staging_path
+        finally:
+            await self._remove_local(staging_path)
+
+    def shard_key(self, name: str) -> str:
+        """Place ``name`` under ``shard_depth`` two-character directories (``ab/cd/<name>``).
+
+        Generated names (UUIDs, SHA-256 digests) are uniformly random hex, so
+        their own leading characters are used; anything else is sharded by
+        the MD5 of the name.
+        """
+        if not self.shard_depth:
+            return name
+        width = 2 * self.shard_depth
+        prefix = name[:width]
+        if len(prefix) < width or not HEX_PREFIX.fullmatch(prefix):
+            prefix = hashlib.md5(name.encode()).hexdigest()[:width]
+        return "/".join([*(prefix[i:i + 2] for i in range(0, width, 2)), name])
+
+    def audio_key(self, file_ext: str) -> str:
+        return self.shard_key(f"{uuid.uuid4()}.{file_ext}")
+
+    def blob_key(self, sha256: str) -> str:
+        return self.shard_key(sha256)
+
+    async def delete(self, key: str) -> bool:
+        return await self.backend.delete(key)
+
+    async def delete_many(self, keys: Iterable[str], concurrency: int) -> dict[str, str]:
+        """Delete ``keys`` with at most ``concurrency`` calls in flight; returns errors by key."""
+        semaphore = asyncio.Semaphore(concurrency)
+        failures: dict[str, str] = {}
+
+        async def remove(key: str) -> None:
+            async with semaphore:
+                try:
+                    await self.backend.delete(key)
+                except StorageError as e:
+                    failures[key] = str(e)
+
+        await asyncio.gather(*(remove(key) for key in dict.fromkeys(keys)))
+        return failures
+
+    async def hash_object(self, key: str) -> Optional[tuple[int, str]]:
+        local_path = self.backend.local_path(key)
+        if local_path is not None:
+            try:
+                return await asyncio.to_thread(self.hash_file, local_path)
+            except FileNotFoundError:
+                return None
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async for chunk in self.backend.get_stream(key):
+                size += len(chunk)
+                digest.update(chunk)
+        except StorageError:
+            return None
+        return size, digest.hexdigest()
+
+    def hash_file(self, file_path: str) -> tuple[int, str]:
+        digest = hashlib.sha256()
+        size = 0
+        with open(file_path, "rb") as f:
+            while chunk := f.read(self.chunk_size):
+                size += len(chunk)
+                digest.update(chunk)
+        return size, digest.hexdigest()
+
+    def _link_or_copy(self, source: str, target: str) -> None:
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copyfile(source, target)
+
+    async def _remove_local(self, path: str) -> None:
+        try:
+            await asyncio.to_thread(os.remove, path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,27 @@
+from sqlalchemy import BigInteger, Column, Integer, Index, String, DateTime, Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from src.shared.models.base import Base
+
+class JobStatus:
+    PENDING = "pending"
+    RUNNING = "running"
+    FAILED = "failed"
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        Index("ix_jobs_kind_status_run_at", "kind", "status", "run_at"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    kind = Column(String(50), nullable=False)
+    payload = Column(JSONB, nullable=False, default=dict)
+    status = Column(String(20), nullable=False, default=JobStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_until = Column(DateTime(timezone=True))
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, List, Optional
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config.config import settings
+from src.jobs.model import Job, JobStatus
+
+MAX_RETRY_DELAY = 60 * 60
+
+class JobQueue:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: dict[str, Any],
+        run_at: Optional[datetime] = None,
+        max_attempts: Optional[int] = None
+    ) -> Job:
+        job = Job(
+            kind=kind,
+            payload=payload,
+            status=JobStatus.PENDING,
+            attempts=0,
+            max_attempts=max_attempts or settings.processing.max_attempts
+        )
+        if run_at is not None:
+            job.run_at = run_at
+        self.session.add(job)
+        return job
+
+    async def claim(self, kinds: Iterable[str], limit: int, lease_seconds: int) -> List[Job]:
+        now = func.now()
+        claimable = (
+            select(Job.id)
+            .where(
+                Job.kind.in_(list(kinds)),
+                or_(
+                    and_(Job.status == JobStatus.PENDING, Job.run_at <= now),
+                    and_(Job.status == JobStatus.RUNNING, Job.locked_until < now)
+                )
+            )
+            .order_by(Job.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            update(Job)
+            .where(Job.id.in_(claimable.scalar_subquery()))
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                locked_until=now + timedelta(seconds=lease_seconds)
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
+
+    async def finish(self, job_ids: Iterable[int]) -> None:
+        job_ids = list(job_ids)
+        if job_ids:
+            await self.session.execute(delete(Job).where(Job.id.in_(job_ids)))
+
+    async def retry(self, job: Job, error: str) -> None:
+        values: dict[str, Any] = {"last_error": error[:2000], "locked_until": None}
+        if job.attempts >= job.max_attempts:
+            values["status"] = JobStatus.FAILED
+        else:
+            delay = min(2 ** job.attempts, MAX_RETRY_DELAY)
+            values["status"] = JobStatus.PENDING
+            values["run_at"] = datetime.now(timezone.utc) + timedelta(seconds=delay)
+        await self.session.execute(update(Job).where(Job.id == job.id).values(**values))
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Awaitable, Callable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import SessionLocal
+from src.jobs.model import Job
+from src.jobs.service import JobQueue
+
+logger = logging.getLogger(__name__)
+
+# A handler processes a batch of jobs of one kind and returns ``{job_id: error}``
+# for the jobs that should be retried. Everything else is considered done.
+JobHandler = Callable[[AsyncSession, List[Job]], Awaitable[dict[int, str]]]
+
+class JobWorker:
+    def __init__(
+        self,
+        handlers: dict[str, JobHandler],
+        batch_size: int = 20,
+        poll_interval: float = 1.0,
+        lease_seconds: int = 300
+    ):
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="job-worker")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def run_once(self) -> int:
+        async with SessionLocal() as session:
+            jobs = await JobQueue(session).claim(self.handlers, self.batch_size, self.lease_seconds)
+            await session.commit()
+        by_kind: dict[str, List[Job]] = defaultdict(list)
+        for job in jobs:
+            by_kind[job.kind].append(job)
+        for kind, batch in by_kind.items():
+            await self._handle(kind, batch)
+        return len(jobs)
+
+    async def _handle(self, kind: str, jobs: List[Job]) -> None:
+        async with SessionLocal() as session:
+            try:
+                failures = await self.handlers[kind](session, jobs)
+            except Exception as e:
+                logger.exception("Job handler %s failed", kind)
+                await session.rollback()
+                failures = {job.id: f"{type(e).__name__}: {e}" for job in jobs}
+            queue = JobQueue(session)
+            await queue.finish(job.id for job in jobs if job.id not in failures)
+            for job in jobs:
+                if job.id in failures:
+                    await queue.retry(job, failures[job.id])
+            await session.commit()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception("Job worker iteration failed")
+                processed = 0
+            if processed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
@@ -0,0 +1,12 @@
+from sqlalchemy import UUID, BigInteger, Column, DateTime, ForeignKey, Integer
+from sqlalchemy.sql import func
+from src.shared.models.base import Base
+
+class UserUsage(Base):
+    """Running per-user totals over ``audios``, kept in step by uploads and deletes."""
+    __tablename__ = "user_usage"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    bytes_used = Column(BigInteger, nullable=False, default=0)
+    audio_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
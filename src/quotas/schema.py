@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel
+
+class UsageInDB(BaseModel):
+    tier: str
+    bytes_used: int
+    audio_count: int
+    max_bytes: Optional[int] = None
+    max_audios: Optional[int] = None
+    bytes_remaining: Optional[int] = None
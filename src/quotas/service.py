@@ -0,0 +1,216 @@
+import logging
+from collections import Counter
+from typing import Iterable, Optional
+from uuid import UUID
+from fastapi import HTTPException, status
+from sqlalchemy import BigInteger, Integer, and_, column, func, select, update, values
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.audio.model import Audio
+from src.core.config.config import QuotaTier, settings
+from src.core.database import SessionLocal
+from src.core.metrics import QUOTA_REJECTIONS, USAGE_DRIFT_REPAIRED
+from src.quotas.model import UserUsage
+from src.quotas.schema import UsageInDB
+from src.shared.repositories.base import any_of
+from src.users.model import User
+
+logger = logging.getLogger(__name__)
+
+def _quota_exceeded(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+class QuotaService:
+    """Per-user storage accounting.
+
+    ``user_usage`` holds running totals that uploads and deletes adjust in
+    their own transaction, so enforcing a quota is a single-row read or
+    conditional upsert instead of ``SUM(size)`` over the user's audios.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def _load(self, user_id: UUID) -> tuple[str, int, int]:
+        row = (await self.session.execute(
+            select(User.quota_tier, UserUsage.bytes_used, UserUsage.audio_count)
+            .outerjoin(UserUsage, UserUsage.user_id == User.id)
+            .where(User.id == user_id)
+        )).first()
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        return row.quota_tier or settings.quota.default_tier, row.bytes_used or 0, row.audio_count or 0
+
+    async def get_usage(self, user_id: UUID) -> UsageInDB:
+        tier_name, bytes_used, audio_count = await self._load(user_id)
+        tier = settings.quota.tier(tier_name)
+        return UsageInDB(
+            tier=tier_name,
+            bytes_used=bytes_used,
+            audio_count=audio_count,
+            max_bytes=tier.max_bytes or None,
+            max_audios=tier.max_audios or None,
+            bytes_remaining=max(tier.max_bytes - bytes_used, 0) if tier.max_bytes else None
+        )
+
+    async def check_upload(self, user_id: UUID, incoming: Optional[int], overhead: int = 0) -> None:
+        """Refuse an upload up front when it cannot fit.
+
+        ``incoming`` is the announced size (``Content-Length`` or a
+        resumable session's declared length), ``overhead`` the slack allowed
+        for multipart framing. Advisory only: :meth:`charge` makes the
+        binding decision once the real size is known.
+        """
+        if not settings.quota.enabled:
+            return
+        tier_name, bytes_used, audio_count = await self._load(user_id)
+        tier = settings.quota.tier(tier_name)
+        if tier.max_audios and audio_count >= tier.max_audios:
+            QUOTA_REJECTIONS.labels("early").inc()
+            raise _quota_exceeded(f"Audio count quota of {tier.max_audios} reached")
+        if tier.max_bytes and incoming is not None and incoming - overhead > tier.max_bytes - bytes_used:
+            QUOTA_REJECTIONS.labels("early").inc()
+            raise _quota_exceeded(
+                f"Upload exceeds storage quota: {max(tier.max_bytes - bytes_used, 0)} of {tier.max_bytes} bytes left"
+            )
+
+    async def charge(self, user_id: UUID, size: int) -> None:
+        """Add one audio of ``size`` bytes to the user's totals, or raise 413 if it does not fit.
+
+        The conditional upsert checks and increments in one statement and
+        holds the row lock until commit, so concurrent uploads by the same
+        user cannot both squeeze under the limit.
+        """
+        tier = self._limits(await self._tier_name(user_id))
+        statement = insert(UserUsage).values(user_id=user_id, bytes_used=size, audio_count=1)
+        conditions = []
+        if tier.max_bytes:
+            conditions.append(UserUsage.bytes_used + statement.excluded.bytes_used <= tier.max_bytes)
+        if tier.max_audios:
+            conditions.append(UserUsage.audio_count + 1 <= tier.max_audios)
+        result = await self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[UserUsage.user_id],
+                set_={
+                    "bytes_used": UserUsage.bytes_used + statement.excluded.bytes_used,
+                    "audio_count": UserUsage.audio_count + 1,
+                    "updated_at": func.now(),
+                },
+                where=and_(*conditions) if conditions else None
+            )
+            .returning(UserUsage.user_id)
+        )
+        # The insert branch (first audio) is not covered by the WHERE clause above.
+        if result.first() is None or (tier.max_bytes and size > tier.max_bytes):
+            QUOTA_REJECTIONS.labels("commit").inc()
+            raise _quota_exceeded("Storage quota exceeded")
+
+    async def release(self, removed: Iterable[tuple[UUID, Optional[int]]]) -> None:
+        """Subtract deleted ``(user_id, size)`` audios from their owners' totals in one statement."""
+        sizes: Counter = Counter()
+        counts: Counter = Counter()
+        for user_id, size in removed:
+            sizes[user_id] += size or 0
+            counts[user_id] += 1
+        if not counts:
+            return
+        released = values(
+            column("user_id", UserUsage.user_id.type), column("bytes", BigInteger), column("count", Integer),
+            name="released"
+        ).data([(user_id, sizes[user_id], count) for user_id, count in counts.items()])
+        await self.session.execute(
+            update(UserUsage)
+            .where(UserUsage.user_id == released.c.user_id)
+            .values(
+                bytes_used=func.greatest(UserUsage.bytes_used - released.c.bytes, 0),
+                audio_count=func.greatest(UserUsage.audio_count - released.c.count, 0)
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    async def _tier_name(self, user_id: UUID) -> Optional[str]:
+        return await self.session.scalar(select(User.quota_tier).where(User.id == user_id))
+
+    def _limits(self, tier_name: Optional[str]) -> QuotaTier:
+        if not settings.quota.enabled:
+            return QuotaTier()
+        return settings.quota.tier(tier_name)
+
+    async def repair_drift(self, batch_size: int) -> int:
+        """Recompute totals from ``audios`` and fix rows that disagree; returns how many were fixed.
+
+        Existing counters are locked before the audios are summed, so an
+        upload or delete that touched them either committed before the sum
+        (and is counted) or waits for the repair to finish (and applies its
+        delta on top). Missing counters are only inserted, never overwritten:
+        a first upload racing the repair keeps its value until the next run.
+        """
+        repaired = 0
+        last_id = None
+        while True:
+            query = select(User.id).order_by(User.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(User.id > last_id)
+            user_ids = list((await self.session.execute(query)).scalars())
+            if not user_ids:
+                break
+            last_id = user_ids[-1]
+            stored = {
+                row.user_id: (row.bytes_used, row.audio_count)
+                for row in await self.session.execute(
+                    select(UserUsage.user_id, UserUsage.bytes_used, UserUsage.audio_count)
+                    .where(any_of(UserUsage.user_id, user_ids))
+                    .order_by(UserUsage.user_id)
+                    .with_for_update()
+                )
+            }
+            actual = {
+                row.user_id: (row.bytes_used, row.audio_count)
+                for row in await self.session.execute(
+                    select(
+                        Audio.user_id,
+                        func.coalesce(func.sum(Audio.size), 0).label("bytes_used"),
+                        func.count().label("audio_count")
+                    )
+                    .where(any_of(Audio.user_id, user_ids))
+                    .group_by(Audio.user_id)
+                )
+            }
+            drifted = [
+                {"user_id": user_id, "bytes_used": totals[0], "audio_count": totals[1]}
+                for user_id in user_ids
+                if (totals := actual.get(user_id, (0, 0))) != stored.get(user_id, (0, 0))
+            ]
+            for row in drifted[:20]:
+                logger.warning(
+                    "Usage drift for user %s: stored %s, actual %s",
+                    row["user_id"], stored.get(row["user_id"]), (row["bytes_used"], row["audio_count"])
+                )
+            existing = [row for row in drifted if row["user_id"] in stored]
+            if existing:
+                fixed = values(
+                    column("user_id", UserUsage.user_id.type), column("bytes_used", BigInteger),
+                    column("audio_count", Integer), name="fixed"
+                ).data([(row["user_id"], row["bytes_used"], row["audio_count"]) for row in existing])
+                await self.session.execute(
+                    update(UserUsage)
+                    .where(UserUsage.user_id == fixed.c.user_id)
+                    .values(bytes_used=fixed.c.bytes_used, audio_count=fixed.c.audio_count)
+                    .execution_options(synchronize_session=False)
+                )
+            missing = [row for row in drifted if row["user_id"] not in stored]
+            if missing:
+                await self.session.execute(
+                    insert(UserUsage).values(missing).on_conflict_do_nothing(index_elements=[UserUsage.user_id])
+                )
+            await self.session.commit()
+            repaired += len(drifted)
+        USAGE_DRIFT_REPAIRED.inc(repaired)
+        return repaired
+
+async def repair_usage_drift() -> None:
+    async with SessionLocal() as session:
+        repaired = await QuotaService(session).repair_drift(settings.quota.repair_batch_size)
+    if repaired:
+        logger.warning("Repaired usage counters for %d users", repaired)
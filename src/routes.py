@@ -2,6 +2,7 @@ from fastapi import APIRouter
 from src.audio.router import AudioRouter
 from src.users.router import UserRouter
 from src.auth.router import AuthRouter
+from src.uploads.router import UploadRouter
 
 api_router = APIRouter()
 
@@ -13,6 +14,10 @@ api_router.include_router(
     AuthRouter,
     prefix="/auth",
 )
+api_router.include_router(
+    UploadRouter,
+    prefix="/audio/uploads",
+)
 api_router.include_router(
     AudioRouter,
     prefix="/audio",
@@ -1,10 +1,71 @@
+import asyncio
+import importlib.util
+import logging
+import random
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Optional
 import httpx
 from fastapi import HTTPException
 from src.core.config.config import settings
+from src.core.metrics import REGISTRY, YandexClientCollector
+
+logger = logging.getLogger(__name__)
+
+TOKEN_URL = "https://oauth.yandex.ru/token"
+USER_INFO_URL = "https://login.yandex.ru/info"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_BACKOFF = 0.2
+MAX_RETRY_BACKOFF = 2.0
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    seconds_total: float = 0.0
+    seconds_max: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.requests += 1
+        self.seconds_total += seconds
+        self.seconds_max = max(self.seconds_max, seconds)
 
 class YandexAuthClient:
-    @staticmethod
-    def get_auth_url() -> str:
+    """Yandex OAuth client sharing one pooled ``httpx.AsyncClient`` for the app lifetime."""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.transport = transport
+        self.stats: dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        if self._client is not None:
+            return
+        self._client = httpx.AsyncClient(
+            transport=self.transport,
+            http2=self.transport is None and importlib.util.find_spec("h2") is not None,
+            timeout=httpx.Timeout(
+                settings.auth.yandex_read_timeout,
+                connect=settings.auth.yandex_connect_timeout
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.auth.yandex_max_connections,
+                max_keepalive_connections=settings.auth.yandex_max_connections
+            )
+        )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def snapshot(self) -> dict:
+        return {name: asdict(stats) for name, stats in self.stats.items()}
+
+    def get_auth_url(self) -> str:
         return (
             f"https://oauth.yandex.ru/authorize?"
             f"response_type=code&"
@@ -12,40 +73,77 @@ class YandexAuthClient:
             f"redirect_uri={settings.auth.yandex_redirect_url}"
         )
 
-    @staticmethod
-    async def get_token(code: str) -> str:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://oauth.yandex.ru/token",
-                data={
-                    "grant_type": "authorization_code",
-                    "code": code,
-                    "client_id": settings.auth.yandex_client_id,
-                    "client_secret": settings.auth.yandex_client_secret,
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
+    async def get_token(self, code: str) -> str:
+        # The authorization code is single-use, so only retry when the
+        # request provably never reached Yandex.
+        response = await self._request(
+            "token",
+            "POST",
+            TOKEN_URL,
+            idempotent=False,
+            data={
+                "grant_type": "authorization_code",
+                "code": code,
+                "client_id": settings.auth.yandex_client_id,
+                "client_secret": settings.auth.yandex_client_secret,
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        if response is None or response.status_code != 200:
+            raise HTTPException(
+                status_code=400,
+                detail="Failed to exchange authorization code"
             )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Failed to exchange authorization code"
-                )
-            
-            return response.json().get("access_token")
-
-    @staticmethod
-    async def get_user_info(access_token: str) -> dict:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://login.yandex.ru/info",
-                headers={"Authorization": f"OAuth {access_token}"},
+        return response.json().get("access_token")
+
+    async def get_user_info(self, access_token: str) -> dict:
+        response = await self._request(
+            "user_info",
+            "GET",
+            USER_INFO_URL,
+            idempotent=True,
+            headers={"Authorization": f"OAuth {access_token}"},
+        )
+        if response is None or response.status_code != 200:
+            raise HTTPException(
+                status_code=400,
+                detail="Failed to fetch user profile"
             )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Failed to fetch user profile"
-                )
-            
-            return response.json()
\ No newline at end of file
+        return response.json()
+
+    def observe_callback(self, seconds: float, failed: bool) -> None:
+        stats = self.stats["callback"]
+        stats.observe(seconds)
+        if failed:
+            stats.errors += 1
+
+    async def _request(self, name: str, method: str, url: str, idempotent: bool, **kwargs) -> Optional[httpx.Response]:
+        if self._client is None:
+            await self.start()
+        stats = self.stats[name]
+        attempts = settings.auth.yandex_max_retries + 1
+        for attempt in range(attempts):
+            started_at = time.perf_counter()
+            response, retryable = None, False
+            try:
+                response = await self._client.request(method, url, **kwargs)
+                retryable = idempotent and response.status_code in RETRY_STATUSES
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                retryable = True
+            except httpx.TransportError:
+                retryable = idempotent
+            stats.observe(time.perf_counter() - started_at)
+            failed = response is None or response.status_code >= 500
+            if failed:
+                stats.errors += 1
+            if not retryable or attempt == attempts - 1:
+                if failed:
+                    logger.warning("Yandex %s request failed after %d attempt(s)", name, attempt + 1)
+                return response
+            stats.retries += 1
+            delay = min(RETRY_BACKOFF * 2 ** attempt, MAX_RETRY_BACKOFF)
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+        return None
+
+yandex_client = YandexAuthClient()
+REGISTRY.register(YandexClientCollector(yandex_client))
@@ -1,5 +1,6 @@
-from typing import TypeVar, Generic, Optional, List, Any, Union
-from sqlalchemy import select, update, delete
+from typing import TypeVar, Generic, Optional, List, Any, Sequence, Union
+from sqlalchemy import any_, bindparam, delete, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.ext.declarative import DeclarativeMeta
 from pydantic import BaseModel
@@ -8,6 +9,14 @@ ModelType = TypeVar("ModelType", bound=DeclarativeMeta)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+def any_of(column, values: Sequence[Any]):
+    """``column = ANY(:values)`` with the values bound as one array parameter.
+
+    Unlike an expanded IN list the statement text (and its prepared plan)
+    stays the same for any batch size.
+    """
+    return column == any_(bindparam(None, list(values), type_=ARRAY(column.type)))
+
 class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: type[ModelType], session: AsyncSession):
         self.model = model
@@ -17,6 +26,12 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         result = await self.session.execute(select(self.model).where(self.model.id == id))
         return result.scalars().first()
 
+    async def get_for_update(self, id: Any, nowait: bool = False) -> Optional[ModelType]:
+        result = await self.session.execute(
+            select(self.model).where(self.model.id == id).with_for_update(nowait=nowait)
+        )
+        return result.scalars().first()
+
     async def get_by_field(self, field_name: str, value: Any) -> Optional[ModelType]:
         field = getattr(self.model, field_name)
         result = await self.session.execute(select(self.model).where(field == value))
@@ -38,20 +53,20 @@ class BaseRepository(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db_obj = obj_in
             
         self.session.add(db_obj)
-        await self.session.commit()
-        await self.session.refresh(db_obj)
+        # Server defaults come back via INSERT ... RETURNING, no refresh needed.
+        await self.session.flush()
         return db_obj
-    
+
     async def update(self, id: Any, obj_in: UpdateSchemaType) -> Optional[ModelType]:
-        await self.session.execute(
+        result = await self.session.execute(
             update(self.model)
             .where(self.model.id == id)
             .values(**obj_in.model_dump(exclude_unset=True))
+            .returning(self.model)
+            .execution_options(populate_existing=True)
         )
-        await self.session.commit()
-        return await self.get(id)
+        return result.scalars().first()
 
     async def delete(self, id: Any) -> bool:
-        await self.session.execute(delete(self.model).where(self.model.id == id))
-        await self.session.commit()
-        return True
\ No newline at end of file
+        result = await self.session.execute(delete(self.model).where(self.model.id == id))
+        return result.rowcount > 0
@@ -1,16 +1,19 @@
 from fastapi import Depends
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from src.core.database import get_db
 from src.core.config.config import settings
 from src.auth.schema import TokenData
+from src.users.cache import user_cache
 from src.users.service import UserService
 from src.users.model import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
@@ -28,11 +31,20 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
     except JWTError:
         raise credentials_exception
         
+    user = user_cache.get(email)
+    if user is not None:
+        return user
     user = await UserService(db).get_user_by_email(email)
     if user is None:
         raise credentials_exception
+    user_cache.set(email, user)
     return user
 
+async def get_optional_user(token: Optional[str] = Depends(optional_oauth2_scheme), db: AsyncSession = Depends(get_db)):
+    if token is None:
+        return None
+    return await get_current_user(token, db)
+
 async def get_current_admin_user(current_user: User = Depends(get_current_user)):
     if not current_user.is_superuser:
         raise HTTPException(
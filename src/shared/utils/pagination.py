@@ -0,0 +1,40 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(created_at: datetime, id: UUID, sort: str) -> str:
+    raw = json.dumps([created_at.isoformat(), str(id), sort], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def encode_rank_cursor(rank: float, id: UUID, query: str) -> str:
+    raw = json.dumps([rank, str(id), query], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_rank_cursor(cursor: str, query: str) -> tuple[float, UUID]:
+    try:
+        raw: Any = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        rank, id, cursor_query = raw
+        if cursor_query != query:
+            raise InvalidCursor("Cursor was issued for a different query")
+        return float(rank), UUID(id)
+    except InvalidCursor:
+        raise
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+
+def decode_cursor(cursor: str, sort: str) -> tuple[datetime, UUID]:
+    try:
+        raw: Any = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        created_at, id, cursor_sort = raw
+        if cursor_sort != sort:
+            raise InvalidCursor("Cursor was issued for a different sort order")
+        return datetime.fromisoformat(created_at), UUID(id)
+    except InvalidCursor:
+        raise
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
@@ -1,7 +1,16 @@
-from typing import Optional
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional, TypeVar
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from src.core.config.config import settings
+from src.core.metrics import REGISTRY, PasswordHasherCollector
+
+T = TypeVar("T")
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.auth.bcrypt_rounds)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -9,4 +18,90 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: Optional[str]) -> Optional[str]:
     if password is None:
         return None
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context.hash(password)
+
+class PasswordHasherBusy(Exception):
+    pass
+
+@dataclass
+class HasherStats:
+    in_flight: int = 0
+    queued: int = 0
+    completed: int = 0
+    rejected: int = 0
+    rehashed: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    run_seconds_total: float = 0.0
+
+class PasswordHasher:
+    """Runs bcrypt in a dedicated thread pool so it never blocks the event loop.
+
+    At most ``concurrency`` hashes run at once; up to ``max_queue`` callers
+    wait for a slot and the rest are rejected with ``PasswordHasherBusy``.
+    """
+
+    def __init__(self, context: CryptContext, concurrency: int, max_queue: int):
+        self.context = context
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.stats = HasherStats()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def hash(self, password: Optional[str]) -> Optional[str]:
+        if password is None:
+            return None
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(self.context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """Verify ``password`` and return a new hash if the stored one uses outdated settings."""
+        valid, new_hash = await self._run(self.context.verify_and_update, password, hashed_password)
+        if new_hash is not None:
+            self.stats.rehashed += 1
+        return valid, new_hash
+
+    def snapshot(self) -> dict:
+        return {**asdict(self.stats), "concurrency": self.concurrency, "max_queue": self.max_queue}
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._slots = None
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="bcrypt")
+            self._slots = asyncio.Semaphore(self.concurrency)
+        if self._slots.locked() and self.stats.queued >= self.max_queue:
+            self.stats.rejected += 1
+            raise PasswordHasherBusy()
+        queued_at = time.perf_counter()
+        self.stats.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.stats.queued -= 1
+        started_at = time.perf_counter()
+        wait = started_at - queued_at
+        self.stats.wait_seconds_total += wait
+        self.stats.wait_seconds_max = max(self.stats.wait_seconds_max, wait)
+        self.stats.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.stats.in_flight -= 1
+            self.stats.completed += 1
+            self.stats.run_seconds_total += time.perf_counter() - started_at
+            self._slots.release()
+
+password_hasher = PasswordHasher(
+    pwd_context,
+    concurrency=settings.auth.password_hash_concurrency,
+    max_queue=settings.auth.password_hash_max_queue
+)
+REGISTRY.register(PasswordHasherCollector(password_hasher))
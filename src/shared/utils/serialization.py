@@ -0,0 +1,35 @@
+from typing import Any, Iterable, List, Optional
+from uuid import UUID
+import orjson
+from fastapi.responses import Response
+from sqlalchemy import Row
+
+# Matches Pydantic's JSON output for timezone-aware datetimes ("...Z").
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+def _default(value: Any) -> Any:
+    # asyncpg returns its own UUID subclass, which orjson does not recognise.
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+def rows_to_dicts(rows: Iterable[Row]) -> List[dict]:
+    return [row._asdict() for row in rows]
+
+def page_body(rows: Iterable[Row], next_cursor: Optional[str]) -> bytes:
+    return dumps({"items": rows_to_dicts(rows), "next_cursor": next_cursor})
+
+class FastJSONResponse(Response):
+    """JSON response for content that is already plain dicts/lists.
+
+    Skips FastAPI's ``response_model`` validation; the query projection is
+    responsible for producing exactly the documented fields.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return content if isinstance(content, bytes) else dumps(content)
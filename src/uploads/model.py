@@ -0,0 +1,20 @@
+import uuid
+from sqlalchemy import UUID, BigInteger, Boolean, Column, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from src.shared.models.base import Base
+
+class UploadSession(Base):
+    __tablename__ = "upload_sessions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    filename = Column(String, nullable=False)
+    title = Column(String, nullable=False)
+    is_public = Column(Boolean, default=False)
+    size = Column(BigInteger, nullable=False)
+    offset = Column(BigInteger, nullable=False, default=0)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    # Set while a PATCH streams its chunk; a lease, so a crashed worker does not block the session forever.
+    claimed_until = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,88 @@
+from typing import AsyncIterator
+from uuid import UUID
+from fastapi import APIRouter, Depends, Header, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import ClientDisconnect
+
+from src.core.admission import admit_upload
+from src.core.database import get_db
+from src.shared.utils.get_current_user import get_current_user
+from src.users.model import User
+from src.audio.schema import AudioInDB
+from src.uploads.schema import UploadSessionCreate, UploadSessionInDB
+from src.uploads.service import UploadSessionService
+
+UploadRouter = APIRouter(tags=["Resumable uploads"])
+
+def _upload_headers(upload) -> dict[str, str]:
+    return {
+        "Upload-Offset": str(upload.offset),
+        "Upload-Length": str(upload.size),
+        "Upload-Expires": upload.expires_at.isoformat(),
+        "Cache-Control": "no-store",
+    }
+
+async def _receive_body(request: Request) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                yield chunk
+    except ClientDisconnect:
+        return
+
+@UploadRouter.post("", response_model=UploadSessionInDB, status_code=201)
+async def create_upload_session(
+    data: UploadSessionCreate,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    upload = await UploadSessionService(db).create_session(data, current_user.id)
+    response.headers.update(_upload_headers(upload))
+    response.headers["Location"] = str(request.url_for("get_upload_session", session_id=upload.id))
+    return UploadSessionInDB.model_validate(upload)
+
+@UploadRouter.api_route("/{session_id}", methods=["GET", "HEAD"], response_model=UploadSessionInDB)
+async def get_upload_session(
+    session_id: UUID,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    upload = await UploadSessionService(db).get_session(session_id, current_user.id)
+    response.headers.update(_upload_headers(upload))
+    return UploadSessionInDB.model_validate(upload)
+
+@UploadRouter.patch("/{session_id}", status_code=204, dependencies=[Depends(admit_upload)])
+async def upload_chunk(
+    session_id: UUID,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    upload = await UploadSessionService(db).append_chunk(
+        session_id=session_id,
+        user_id=current_user.id,
+        offset=upload_offset,
+        chunks=_receive_body(request)
+    )
+    return Response(status_code=204, headers=_upload_headers(upload))
+
+@UploadRouter.post("/{session_id}/complete", response_model=AudioInDB, status_code=201)
+async def complete_upload_session(
+    session_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    audio = await UploadSessionService(db).complete_session(session_id, current_user.id)
+    return AudioInDB.model_validate(audio)
+
+@UploadRouter.delete("/{session_id}", status_code=204)
+async def abort_upload_session(
+    session_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    await UploadSessionService(db).abort_session(session_id, current_user.id)
@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from uuid import UUID
+from datetime import datetime
+
+class UploadSessionCreate(BaseModel):
+    filename: str
+    title: str
+    is_public: bool = False
+    size: int = Field(..., gt=0, description="Total file size in bytes")
+
+class UploadSessionInDB(BaseModel):
+    id: UUID
+    filename: str
+    title: str
+    is_public: bool
+    size: int
+    offset: int
+    expires_at: datetime
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,218 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, List
+from uuid import UUID
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, or_, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.audio.model import Audio
+from src.audio.service import AudioService
+from src.core.config.config import settings
+from src.core.database import SessionLocal
+from src.core.metrics import observe_upload
+from src.core.storage.backends.base import FileTooLargeError
+from src.core.storage.backends.local import LocalStorageBackend
+from src.quotas.service import QuotaService
+from src.shared.repositories.base import BaseRepository
+from src.uploads.model import UploadSession
+from src.uploads.schema import UploadSessionCreate
+
+class UploadSessionService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.repository = BaseRepository(UploadSession, session)
+        self.storage = LocalStorageBackend(
+            settings.storage.upload_sessions_dir,
+            chunk_size=settings.storage.upload_chunk_size
+        )
+
+    def _data_file(self, session_id: UUID) -> str:
+        return f"{session_id}.upload"
+
+    def _expires_at(self) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=settings.storage.upload_session_ttl)
+
+    async def create_session(self, data: UploadSessionCreate, user_id: UUID) -> UploadSession:
+        if not settings.storage.upload_sessions_shared:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Resumable uploads are disabled: UPLOAD_SESSIONS_DIR is not shared between nodes"
+            )
+        if data.size > settings.storage.max_upload_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds maximum upload size of {settings.storage.max_upload_size} bytes"
+            )
+        await QuotaService(self.session).check_upload(user_id, data.size)
+        upload = UploadSession(
+            filename=data.filename,
+            title=data.title,
+            is_public=data.is_public,
+            size=data.size,
+            offset=0,
+            expires_at=self._expires_at(),
+            user_id=user_id
+        )
+        upload = await self.repository.create(upload)
+        await self.storage.create_empty(self._data_file(upload.id))
+        return upload
+
+    async def get_session(self, session_id: UUID, user_id: UUID, lock: bool = False) -> UploadSession:
+        try:
+            if lock:
+                upload = await self.repository.get_for_update(session_id, nowait=True)
+            else:
+                upload = await self.repository.get(session_id)
+        except DBAPIError:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Upload session is busy"
+            )
+        if not upload or upload.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Upload session not found"
+            )
+        if upload.expires_at <= datetime.now(timezone.utc):
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Upload session expired"
+            )
+        return upload
+
+    async def append_chunk(
+        self,
+        session_id: UUID,
+        user_id: UUID,
+        offset: int,
+        chunks: AsyncIterator[bytes]
+    ) -> UploadSession:
+        upload = await self.get_session(session_id, user_id)
+        if offset != upload.offset:
+            raise self._offset_mismatch(upload.offset)
+        await self._claim(upload, offset)
+        started = time.perf_counter()
+        try:
+            written = await self.storage.write_at(
+                self._data_file(upload.id),
+                chunks,
+                offset=offset,
+                limit=upload.size - offset
+            )
+        except FileTooLargeError:
+            await self._release(upload, offset)
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Chunk exceeds declared upload size"
+            )
+        except FileNotFoundError:
+            await self._release(upload, offset)
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Upload session data is missing"
+            )
+        except Exception:
+            await self._release(upload, offset)
+            raise
+        observe_upload(written, time.perf_counter() - started)
+        result = await self.session.execute(
+            update(UploadSession)
+            .where(UploadSession.id == upload.id, UploadSession.offset == offset)
+            .values(offset=offset + written, expires_at=self._expires_at(), claimed_until=None)
+        )
+        if result.rowcount == 0:
+            # Aborted, or the lease ran out and another PATCH moved the offset first.
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Upload session changed while the chunk was being written"
+            )
+        return upload
+
+    def _offset_mismatch(self, expected: int) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Upload-Offset mismatch, expected {expected}",
+            headers={"Upload-Offset": str(expected)}
+        )
+
+    async def _claim(self, upload: UploadSession, offset: int) -> None:
+        """Mark the session as receiving a chunk at ``offset`` and commit.
+
+        The claim replaces a row lock held for the whole body: the
+        transaction ends here, so no pooled connection waits on a slow
+        client, while a concurrent PATCH sees the claim and gets 409
+        instead of writing over the same bytes.
+        """
+        claimed = await self.session.execute(
+            update(UploadSession)
+            .where(
+                UploadSession.id == upload.id,
+                UploadSession.offset == offset,
+                or_(UploadSession.claimed_until.is_(None), UploadSession.claimed_until < func.now())
+            )
+            .values(claimed_until=func.now() + timedelta(seconds=settings.storage.upload_chunk_lease))
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+        if claimed.rowcount == 0:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Upload session is busy"
+            )
+
+    async def _release(self, upload: UploadSession, offset: int) -> None:
+        # Committed here: the request's transaction is rolled back on the error being raised.
+        await self.session.execute(
+            update(UploadSession)
+            .where(UploadSession.id == upload.id, UploadSession.offset == offset)
+            .values(claimed_until=None)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.commit()
+
+    async def complete_session(self, session_id: UUID, user_id: UUID) -> Audio:
+        upload = await self.get_session(session_id, user_id, lock=True)
+        if upload.offset != upload.size:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload incomplete: {upload.offset} of {upload.size} bytes received",
+                headers={"Upload-Offset": str(upload.offset)}
+            )
+        data_file = self._data_file(upload.id)
+        await self.session.delete(upload)
+        # The data file is staged as a link, so it survives until the audio
+        # row is committed: a failed completion (quota, storage, commit)
+        # leaves the session intact for a retry.
+        audio = await AudioService(self.session).create_audio_from_file(
+            source_path=self.storage.local_path(data_file),
+            filename=upload.filename,
+            title=upload.title,
+            is_public=upload.is_public,
+            user_id=user_id
+        )
+        await self.session.commit()
+        await self.storage.delete(data_file)
+        return audio
+
+    async def abort_session(self, session_id: UUID, user_id: UUID) -> None:
+        upload = await self.get_session(session_id, user_id, lock=True)
+        await self.repository.delete(upload.id)
+        await self.storage.delete(self._data_file(upload.id))
+
+    async def purge_expired(self) -> List[UUID]:
+        result = await self.session.execute(
+            delete(UploadSession)
+            .where(UploadSession.expires_at < datetime.now(timezone.utc))
+            .returning(UploadSession.id)
+        )
+        expired = list(result.scalars().all())
+        await self.session.commit()
+        for session_id in expired:
+            await self.storage.delete(self._data_file(session_id))
+        return expired
+
+async def purge_expired_upload_sessions() -> None:
+    async with SessionLocal() as session:
+        await UploadSessionService(session).purge_expired()
@@ -0,0 +1,82 @@
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Optional
+from uuid import UUID
+
+from src.core.config.config import settings
+from src.core.metrics import REGISTRY, UserCacheCollector
+from src.users.schema import UserInDB
+
+USER_CACHE_CHANNEL = "user_cache_invalidate"
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+class UserCache:
+    """Bounded TTL + LRU cache of authenticated users keyed by token subject."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, tuple[float, UserInDB]] = OrderedDict()
+        self._subjects: dict[UUID, str] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, subject: str) -> Optional[UserInDB]:
+        entry = self._entries.get(subject)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                self._remove(subject)
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(subject)
+        self.stats.hits += 1
+        return entry[1]
+
+    def set(self, subject: str, user: UserInDB) -> None:
+        if not self.enabled:
+            return
+        self._remove(subject)
+        self._entries[subject] = (time.monotonic() + self.ttl, user)
+        self._subjects[user.id] = subject
+        while len(self._entries) > self.max_size:
+            oldest, (_, evicted) = self._entries.popitem(last=False)
+            self._forget(oldest, evicted.id)
+            self.stats.evictions += 1
+
+    def invalidate(self, user_id: UUID) -> None:
+        subject = self._subjects.get(user_id)
+        if subject is not None:
+            self._remove(subject)
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._subjects.clear()
+
+    def handle_notification(self, payload: str) -> None:
+        self.invalidate(UUID(payload))
+
+    def snapshot(self) -> dict:
+        return {**asdict(self.stats), "size": len(self._entries), "max_size": self.max_size, "ttl": self.ttl}
+
+    def _remove(self, subject: str) -> None:
+        entry = self._entries.pop(subject, None)
+        if entry is not None:
+            self._forget(subject, entry[1].id)
+
+    def _forget(self, subject: str, user_id: UUID) -> None:
+        if self._subjects.get(user_id) == subject:
+            del self._subjects[user_id]
+
+user_cache = UserCache(settings.auth.user_cache_size, settings.auth.user_cache_ttl)
+REGISTRY.register(UserCacheCollector(user_cache))
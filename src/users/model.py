@@ -14,6 +14,7 @@ class User(Base):
     is_superuser = Column(Boolean, default=False)
     name = Column(String, nullable=True)
     yandex_id = Column(String, unique=True, nullable=True)
+    quota_tier = Column(String(32), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -3,13 +3,36 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.users.schema import UserCreate, UserUpdate, UserInDB
+from src.users.cache import user_cache
 from src.users.service import UserService
+from src.shared.utils.serialization import FastJSONResponse, rows_to_dicts
 from src.core.database import get_db
 from src.shared.utils.get_current_user import get_current_user, get_current_admin_user
 from src.users.model import User
+from src.quotas.schema import UsageInDB
+from src.quotas.service import QuotaService
 
 UserRouter = APIRouter(tags=["Users"])
 
+@UserRouter.get("/cache/stats")
+async def read_user_cache_stats(current_admin: User = Depends(get_current_admin_user)):
+    return user_cache.snapshot()
+
+@UserRouter.get("/me/usage", response_model=UsageInDB)
+async def read_my_usage(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return await QuotaService(db).get_usage(current_user.id)
+
+@UserRouter.get("/{user_id}/usage", response_model=UsageInDB)
+async def read_user_usage(
+    user_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_admin: User = Depends(get_current_admin_user)
+):
+    return await QuotaService(db).get_usage(user_id)
+
 @UserRouter.get("/{user_id}", response_model=UserInDB)
 async def read_user(
     user_id: UUID,
@@ -30,7 +53,7 @@ async def read_users(
     current_user: User = Depends(get_current_user)
 ):
     service = UserService(db)
-    return await service.get_all_users(skip, limit)
+    return FastJSONResponse(rows_to_dicts(await service.get_all_users(skip, limit)))
 
 @UserRouter.put("/{user_id}", response_model=UserInDB)
 async def update_user(
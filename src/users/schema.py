@@ -1,7 +1,8 @@
 from datetime import datetime
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from typing import Optional
 from uuid import UUID
+from src.core.config.config import settings
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -17,6 +18,14 @@ class UserUpdate(BaseModel):
     name: Optional[str] = None
     is_superuser: Optional[bool] = False
     email: Optional[str] = None
+    quota_tier: Optional[str] = None
+
+    @field_validator("quota_tier")
+    @classmethod
+    def known_tier(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None and value not in settings.quota.tiers:
+            raise ValueError(f"Unknown quota tier, expected one of {sorted(settings.quota.tiers)}")
+        return value
 
 class UserInDB(BaseModel):
     email: str
@@ -24,9 +33,13 @@ class UserInDB(BaseModel):
     id: UUID
     is_active: bool
     is_superuser: bool
+    quota_tier: str | None = None
     created_at: datetime | None = None
     updated_at: datetime | None = None
 
+    class Config:
+        from_attributes = True
+
 class UserInDBwithPassword(UserBase):
     id: UUID 
     hashed_password: str
@@ -1,33 +1,40 @@
 from typing import List, Optional, Union
 from uuid import UUID
-from sqlalchemy import select
+from sqlalchemy import Row, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.shared.utils.password_utils import get_password_hash
+from src.core.config.config import settings
+from src.core.database import run_after_commit
+from src.core.notifications import notify
+from src.shared.utils.password_utils import password_hasher
+from src.users.cache import USER_CACHE_CHANNEL, user_cache
 from src.users.schema import UserCreate, UserInDBwithPassword, UserUpdate, UserInDB, UserYandexCreate
 from src.shared.repositories.base import BaseRepository
 from src.users.model import User
 
+USER_COLUMNS = [getattr(User, name) for name in UserInDB.model_fields]
+
 class UserService:
     def __init__(self, session: AsyncSession):
+        self.session = session
         self.repository = BaseRepository(User, session)
     
     async def get_user(self, user_id: UUID) -> Optional[UserInDB]:
         user = await self.repository.get(user_id)
-        return UserInDB.model_validate(user.__dict__) if user else None
+        return UserInDB.model_validate(user) if user else None
     
     async def get_user_by_email(self, email: str) -> Optional[UserInDB]:
         user = await self.repository.get_by_field("email", email)
         if not user:
             return None
-        return UserInDB.model_validate(user, from_attributes=True)
+        return UserInDB.model_validate(user)
 
     async def get_user_by_email_with_password(self, email: str) -> Optional[UserInDBwithPassword]:
         user = await self.repository.get_by_field("email", email)
-        return UserInDBwithPassword.model_validate(user.__dict__) if user else None
+        return UserInDBwithPassword.model_validate(user) if user else None
     
-    async def get_all_users(self, skip: int = 0, limit: int = 100) -> List[UserInDB]:
-        users = await self.repository.get_all(skip, limit)
-        return [UserInDB.model_validate(user.__dict__) for user in users]
+    async def get_all_users(self, skip: int = 0, limit: int = 100) -> List[Row]:
+        result = await self.session.execute(select(*USER_COLUMNS).offset(skip).limit(limit))
+        return list(result.all())
     
     async def create_user(self, user_data: Union[UserCreate, UserYandexCreate]) -> UserInDB:
         if hasattr(user_data, 'password'):  
@@ -37,7 +44,7 @@ class UserService:
             user_kwargs = {
                 'email': user_data.email,
                 'name': user_data.name,
-                'hashed_password': get_password_hash(user_data.password),
+                'hashed_password': await password_hasher.hash(user_data.password),
                 'yandex_id': None
             }
         elif hasattr(user_data, 'yandex_id'):
@@ -55,15 +62,31 @@ class UserService:
         if hasattr(user_data, 'password') and created_user.hashed_password is None:
             raise ValueError("Failed to set password hash during user creation")
         
-        return UserInDB.model_validate(created_user.__dict__)
+        return UserInDB.model_validate(created_user)
+
+    async def update_password_hash(self, user_id: UUID, hashed_password: str) -> None:
+        await self.session.execute(
+            update(User).where(User.id == user_id).values(hashed_password=hashed_password)
+        )
 
     async def get_by_yandex_id(self, yandex_id: str) -> Optional[UserInDB]:
         user = await self.repository.get_by_field("yandex_id", yandex_id)
-        return UserInDB.model_validate(user.__dict__) if user else None
+        return UserInDB.model_validate(user) if user else None
     
     async def update_user(self, user_id: UUID, user_data: UserUpdate) -> Optional[UserInDB]:
+        await self._notify_user_changed(user_id)
         user = await self.repository.update(user_id, user_data)
-        return UserInDB.model_validate(user.__dict__) if user else None
+        run_after_commit(self.session, lambda: user_cache.invalidate(user_id))
+        return UserInDB.model_validate(user) if user else None
     
     async def delete_user(self, user_id: UUID) -> bool:
-        return await self.repository.delete(user_id)
\ No newline at end of file
+        await self._notify_user_changed(user_id)
+        deleted = await self.repository.delete(user_id)
+        run_after_commit(self.session, lambda: user_cache.invalidate(user_id))
+        return deleted
+
+    async def _notify_user_changed(self, user_id: UUID) -> None:
+        # Sent inside the write transaction, so other workers drop their
+        # cached copy only once the change is committed.
+        if settings.auth.user_cache_notify:
+            await notify(self.session, USER_CACHE_CHANNEL, str(user_id))
\ No newline at end of file
@@ -0,0 +1,151 @@
+import asyncio
+import uuid
+
+import pytest
+
+from src.core.admission import (AdmissionController, AdmissionRejected, MemoryRateLimitStore,
+                                PostgresRateLimitStore, RateLimitStore, UploadSlots)
+from src.core.config.config import AdmissionConfig, settings
+
+pytestmark = pytest.mark.anyio
+
+async def check_bucket(store: RateLimitStore) -> None:
+    key = f"test:{uuid.uuid4()}"
+    # Burst of 3 at one token per 10 s: three pass, the fourth waits about one interval.
+    for _ in range(3):
+        assert await store.take(key, 1, 10, 3) == 0
+    wait = await store.take(key, 1, 10, 3)
+    assert 9 < wait <= 10
+    # A rejected request does not consume tokens.
+    assert 9 < await store.take(key, 1, 10, 3) <= 10
+    # Another key has its own bucket.
+    assert await store.take(f"{key}:other", 1, 10, 3) == 0
+
+async def test_memory_store_bucket():
+    await check_bucket(MemoryRateLimitStore())
+
+async def test_memory_store_refills():
+    store = MemoryRateLimitStore()
+    assert await store.take("k", 1, 0.05, 1) == 0
+    assert await store.take("k", 1, 0.05, 1) > 0
+    await asyncio.sleep(0.06)
+    assert await store.take("k", 1, 0.05, 1) == 0
+
+async def test_memory_store_evicts_least_recently_admitted():
+    store = MemoryRateLimitStore(max_keys=3)
+    for key in "abc":
+        await store.take(key, 1, 10, 1)
+    await store.take("a", 1, 10, 5)
+    await store.take("d", 1, 10, 1)
+    assert list(store._tat) == ["c", "a", "d"]
+    # "b" was evicted and starts with a full bucket again.
+    assert await store.take("b", 1, 10, 1) == 0
+
+async def test_memory_store_purge_drops_full_buckets():
+    store = MemoryRateLimitStore()
+    await store.take("short", 1, 0.01, 1)
+    await store.take("long", 1, 60, 1)
+    await asyncio.sleep(0.02)
+    await store.purge()
+    assert list(store._tat) == ["long"]
+
+async def test_postgres_store_bucket(app):
+    store = PostgresRateLimitStore(settings.db.url, pool_size=1, timeout=5)
+    try:
+        await check_bucket(store)
+        await store.purge()
+    finally:
+        await store.close()
+
+class BrokenStore(RateLimitStore):
+    async def take(self, key: str, cost: float, interval: float, burst: float) -> float:
+        raise ConnectionError("store is down")
+
+async def test_controller_rejects_with_retry_after():
+    controller = AdmissionController(AdmissionConfig(), MemoryRateLimitStore())
+    await controller.limit("upload", "upload_requests", "user", rate=0.5, burst=1)
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.limit("upload", "upload_requests", "user", rate=0.5, burst=1)
+    assert rejected.value.status_code == 429
+    assert rejected.value.retry_after == 2
+
+async def test_controller_caps_cost_at_burst():
+    controller = AdmissionController(AdmissionConfig(), MemoryRateLimitStore())
+    await controller.limit("upload", "upload_bytes", "user", rate=100, burst=1000, cost=10_000)
+    with pytest.raises(AdmissionRejected):
+        await controller.limit("upload", "upload_bytes", "user", rate=100, burst=1000, cost=1)
+
+async def test_controller_fails_open():
+    controller = AdmissionController(AdmissionConfig(), BrokenStore())
+    await controller.limit("upload", "upload_requests", "user", rate=1, burst=1)
+
+async def hold(slots: UploadSlots, seconds: float):
+    try:
+        async with slots.hold():
+            await asyncio.sleep(seconds)
+        return "ok"
+    except AdmissionRejected as e:
+        return e.status_code
+
+async def test_upload_slots_reject_when_queue_is_full():
+    slots = UploadSlots(concurrency=1, max_queue=1, timeout=1, retry_after=5)
+    assert await asyncio.gather(hold(slots, 0.05), hold(slots, 0), hold(slots, 0)) == ["ok", "ok", 503]
+    assert slots.queued == 0
+
+async def test_upload_slots_reject_after_queue_timeout():
+    slots = UploadSlots(concurrency=1, max_queue=5, timeout=0.02, retry_after=5)
+    assert await asyncio.gather(hold(slots, 0.1), hold(slots, 0)) == ["ok", 503]
+    assert await hold(slots, 0) == "ok"
+
+@pytest.fixture
+def download_limits(monkeypatch):
+    monkeypatch.setattr(settings.admission, "enabled", True)
+    monkeypatch.setattr(settings.admission, "download_rate", 0.01)
+    monkeypatch.setattr(settings.admission, "download_burst", 2)
+
+async def test_signed_downloads_are_rate_limited(client, user, download_limits):
+    _, headers = user
+    response = await client.post(
+        "/api/audio/upload", headers=headers, files={"file": ("a.mp3", b"\xff" * 100)}, data={"title": "signed"}
+    )
+    audio_id = response.json()["id"]
+    url = (await client.get(f"/api/audio/{audio_id}/download-url", headers=headers)).json()["url"]
+    assert [(await client.get(url)).status_code for _ in range(3)] == [200, 200, 429]
+    # Minting shares the user's download bucket: one URL above, one more now, then 429.
+    minted = [(await client.get(f"/api/audio/{audio_id}/download-url", headers=headers)).status_code for _ in range(2)]
+    assert minted == [200, 429]
+
+async def test_queued_uploads_hold_no_database_connection(client, user, monkeypatch):
+    from src.core.admission import admission
+    from src.core.database import engine
+    from src.users.cache import user_cache
+
+    _, headers = user
+    slots = UploadSlots(concurrency=1, max_queue=3, timeout=5, retry_after=5)
+    monkeypatch.setattr(settings.admission, "enabled", True)
+    monkeypatch.setattr(admission, "upload_slots", slots)
+    # Force the user lookup through the request session, as on a cache miss.
+    user_cache.clear()
+    release = asyncio.Event()
+
+    async def occupy():
+        async with slots.hold():
+            await release.wait()
+
+    holder = asyncio.create_task(occupy())
+    await asyncio.sleep(0)
+    idle = engine.pool.checkedout()
+    uploads = [
+        asyncio.create_task(client.post(
+            "/api/audio/upload", headers=headers, files={"file": ("a.mp3", b"\xff" * 100)}, data={"title": f"q{i}"}
+        ))
+        for i in range(4)
+    ]
+    while slots.queued < 3:
+        await asyncio.sleep(0.01)
+    # The queue is full: a fourth upload is refused, and the three waiting hold no connections.
+    assert engine.pool.checkedout() == idle
+    release.set()
+    await holder
+    codes = sorted([(await upload).status_code for upload in uploads])
+    assert codes == [201, 201, 201, 503]
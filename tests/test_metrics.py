@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from uuid import uuid4
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.core.metrics import PasswordHasherCollector, UserCacheCollector
+from src.shared.utils.password_utils import PasswordHasher, PasswordHasherBusy, password_hasher
+from src.users.cache import UserCache, user_cache
+from src.users.schema import UserInDB
+
+def samples(collector) -> dict:
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in collector.collect()
+        for sample in family.samples
+    }
+
+def cached_user() -> UserInDB:
+    return UserInDB(id=uuid4(), email="cached@example.com", name=None, is_active=True, is_superuser=False)
+
+def test_user_cache_collector():
+    cache = UserCache(max_size=1, ttl=60)
+    first, second = cached_user(), cached_user()
+    cache.get("a")
+    cache.set("a", first)
+    cache.get("a")
+    cache.set("b", second)
+    cache.invalidate(second.id)
+    assert samples(UserCacheCollector(cache)) == {
+        ("user_cache_hits_total", ()): 1,
+        ("user_cache_misses_total", ()): 1,
+        ("user_cache_evictions_total", ()): 1,
+        ("user_cache_invalidations_total", ()): 1,
+        ("user_cache_entries", ()): 0,
+    }
+
+def test_user_cache_is_registered():
+    assert REGISTRY.get_sample_value("user_cache_hits_total") == user_cache.stats.hits
+
+class GatedContext:
+    """Hashes only once ``release`` is set, so callers pile up in the queue."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def hash(self, password: str) -> str:
+        self.release.wait(5)
+        return password[::-1]
+
+@pytest.mark.anyio
+async def test_password_hasher_collector():
+    context = GatedContext()
+    hasher = PasswordHasher(context, concurrency=1, max_queue=1)
+    collector = PasswordHasherCollector(hasher)
+    running = asyncio.create_task(hasher.hash("first"))
+    await asyncio.sleep(0.05)
+    queued = asyncio.create_task(hasher.hash("second"))
+    await asyncio.sleep(0.05)
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.hash("third")
+    busy = samples(collector)
+    assert busy[("password_hash_in_flight", ())] == 1
+    assert busy[("password_hash_queued", ())] == 1
+    assert busy[("password_hash_rejected_total", ())] == 1
+    context.release.set()
+    assert await asyncio.gather(running, queued) == ["tsrif", "dnoces"]
+    idle = samples(collector)
+    assert idle[("password_hash_in_flight", ())] == idle[("password_hash_queued", ())] == 0
+    assert idle[("password_hash_completed_total", ())] == 2
+    assert idle[("password_hash_wait_seconds_total", ())] > 0
+    hasher.shutdown()
+
+def test_password_hasher_is_registered():
+    assert REGISTRY.get_sample_value("password_hash_rejected_total") == password_hasher.stats.rejected
@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from src.shared.utils.pagination import (InvalidCursor, decode_cursor, decode_rank_cursor, encode_cursor,
+                                         encode_rank_cursor)
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+    id = uuid4()
+    cursor = encode_cursor(created_at, id, "-created_at")
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "-created_at") == (created_at, id)
+
+def test_cursor_is_bound_to_sort_order():
+    cursor = encode_cursor(datetime.now(timezone.utc), uuid4(), "-created_at")
+    with pytest.raises(InvalidCursor, match="sort order"):
+        decode_cursor(cursor, "created_at")
+
+def test_rank_cursor_round_trip():
+    id = uuid4()
+    cursor = encode_rank_cursor(0.0607927, id, "night drive")
+    assert decode_rank_cursor(cursor, "night drive") == (0.0607927, id)
+
+def test_rank_cursor_is_bound_to_query():
+    cursor = encode_rank_cursor(0.5, uuid4(), "night drive")
+    with pytest.raises(InvalidCursor, match="different query"):
+        decode_rank_cursor(cursor, "day drive")
+
+@pytest.mark.parametrize("cursor", ["", "!!!", "bm90IGpzb24", "WzEsMl0", "WyJ4IiwieSIsIi1jcmVhdGVkX2F0Il0"])
+def test_malformed_cursors(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "-created_at")
+    with pytest.raises(InvalidCursor):
+        decode_rank_cursor(cursor, "-created_at")
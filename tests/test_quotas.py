@@ -0,0 +1,91 @@
+import pytest
+from fastapi import HTTPException
+
+from src.core.config.config import QuotaTier, settings
+from src.core.database import SessionLocal
+from src.quotas.service import QuotaService
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(settings.quota, "enabled", True)
+    monkeypatch.setitem(settings.quota.tiers, settings.quota.default_tier, QuotaTier(max_bytes=1000, max_audios=3))
+
+async def usage(user_id):
+    async with SessionLocal() as session:
+        return await QuotaService(session).get_usage(user_id)
+
+async def charge(user_id, size):
+    async with SessionLocal() as session:
+        await QuotaService(session).charge(user_id, size)
+        await session.commit()
+
+async def test_charge_and_release(user, limits):
+    user_id, _ = user
+    await charge(user_id, 400)
+    await charge(user_id, 600)
+    current = await usage(user_id)
+    assert (current.bytes_used, current.audio_count, current.bytes_remaining) == (1000, 2, 0)
+    async with SessionLocal() as session:
+        await QuotaService(session).release([(user_id, 400), (user_id, 600)])
+        await session.commit()
+    current = await usage(user_id)
+    assert (current.bytes_used, current.audio_count) == (0, 0)
+
+async def test_charge_rejected_at_byte_limit(user, limits):
+    user_id, _ = user
+    await charge(user_id, 900)
+    with pytest.raises(HTTPException) as rejected:
+        await charge(user_id, 101)
+    assert rejected.value.status_code == 413
+    assert (await usage(user_id)).bytes_used == 900
+    await charge(user_id, 100)
+
+async def test_first_charge_rejected_over_limit(user, limits):
+    user_id, _ = user
+    with pytest.raises(HTTPException):
+        await charge(user_id, 1001)
+    assert (await usage(user_id)).bytes_used == 0
+
+async def test_charge_rejected_at_audio_count_limit(user, limits):
+    user_id, _ = user
+    for _ in range(3):
+        await charge(user_id, 1)
+    with pytest.raises(HTTPException) as rejected:
+        await charge(user_id, 1)
+    assert rejected.value.status_code == 413
+    assert (await usage(user_id)).audio_count == 3
+
+async def test_release_does_not_go_negative(user, limits):
+    user_id, _ = user
+    await charge(user_id, 10)
+    async with SessionLocal() as session:
+        await QuotaService(session).release([(user_id, 500), (user_id, None)])
+        await session.commit()
+    current = await usage(user_id)
+    assert (current.bytes_used, current.audio_count) == (0, 0)
+
+async def test_check_upload_refuses_announced_size(user, limits):
+    user_id, _ = user
+    await charge(user_id, 600)
+    async with SessionLocal() as session:
+        service = QuotaService(session)
+        await service.check_upload(user_id, 400)
+        await service.check_upload(user_id, 450, overhead=50)
+        with pytest.raises(HTTPException) as rejected:
+            await service.check_upload(user_id, 401)
+    assert rejected.value.status_code == 413
+
+async def test_upload_over_quota_is_refused_and_not_charged(client, user, limits):
+    user_id, headers = user
+    response = await client.post(
+        "/api/audio/upload", headers=headers, files={"file": ("a.mp3", b"\xff" * 2000)}, data={"title": "big"}
+    )
+    assert response.status_code == 413
+    response = await client.post(
+        "/api/audio/upload", headers=headers, files={"file": ("a.mp3", b"\xff" * 500)}, data={"title": "small"}
+    )
+    assert response.status_code == 201
+    response = await client.get("/api/users/me/usage", headers=headers)
+    assert (response.json()["bytes_used"], response.json()["audio_count"]) == (500, 1)
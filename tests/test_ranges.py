@@ -0,0 +1,136 @@
+import os
+from email.utils import format_datetime
+
+import pytest
+from fastapi import HTTPException
+
+from src.audio.delivery import AudioDelivery
+from src.audio.seek import SEEK_ENTRY, SEEK_HEADER, SEEK_INTERVAL_MS, SEEK_MAGIC, seek_index_key
+from src.core.storage.backends.local import LocalStorageBackend
+from src.core.storage.ranges import MAX_RANGES, MultipartRanges, RangeNotSatisfiable, parse_range_header
+from src.core.storage.service import StorageService
+
+DATA = bytes(range(256)) * 40
+KEY = "ab/cd/abcd.mp3"
+ETAG = '"abcd"'
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-9", [(0, 10)]),
+    ("bytes=100-", [(100, 1000)]),
+    ("bytes=-10", [(990, 1000)]),
+    ("bytes=-5000", [(0, 1000)]),
+    ("bytes=990-5000", [(990, 1000)]),
+    ("bytes=20-29, 0-9", [(0, 10), (20, 30)]),
+    ("bytes=0-9,5-14,15-19", [(0, 20)]),
+    ("bytes=0-9,2000-", [(0, 10)]),
+])
+def test_parse(header, expected):
+    assert parse_range_header(header, 1000) == expected
+
+@pytest.mark.parametrize("header", ["items=0-9", "bytes=", "bytes=9-0", "bytes=a-b", "bytes=5", "bytes=--1",
+                                    "bytes=" + ",".join(f"{i * 10}-{i * 10}" for i in range(MAX_RANGES + 1))])
+def test_ignored(header):
+    assert parse_range_header(header, 1000) is None
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=2000-3000", "bytes=-0"])
+def test_not_satisfiable(header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range_header(header, 1000)
+
+@pytest.fixture
+def storage(tmp_path):
+    path = tmp_path / "audio" / KEY
+    path.parent.mkdir(parents=True)
+    path.write_bytes(DATA)
+    return StorageService(LocalStorageBackend(str(tmp_path / "audio"), chunk_size=1000), str(tmp_path / "staging"))
+
+async def body(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+@pytest.mark.anyio
+async def test_multipart_body(storage):
+    parts = MultipartRanges(storage.backend, KEY, [(0, 10), (5000, 10240)], len(DATA), "audio/mpeg")
+    content = b"".join([chunk async for chunk in parts])
+    assert len(content) == parts.content_length
+    assert parts.content_type == f"multipart/byteranges; boundary={parts.boundary}"
+    sections = content.split(f"--{parts.boundary}".encode())
+    assert sections[0] == b"" and sections[-1] == b"--\r\n"
+    assert sections[1].endswith(b"\r\n\r\n" + DATA[:10] + b"\r\n")
+    assert b"Content-Range: bytes 5000-10239/10240" in sections[2]
+    assert sections[2].endswith(b"\r\n\r\n" + DATA[5000:] + b"\r\n")
+
+@pytest.mark.anyio
+async def test_single_range_response(storage):
+    response = await AudioDelivery(storage).respond(KEY, "audio/mpeg", "a.mp3", ETAG, "bytes=-100")
+    assert response.status_code == 206
+    assert response.headers["content-range"] == "bytes 10140-10239/10240"
+    assert response.headers["content-length"] == "100"
+    assert await body(response) == DATA[-100:]
+
+@pytest.mark.anyio
+async def test_multipart_response(storage):
+    response = await AudioDelivery(storage).respond(KEY, "audio/mpeg", "a.mp3", ETAG, "bytes=0-1,100-101")
+    content = await body(response)
+    assert response.status_code == 206
+    assert response.media_type.startswith("multipart/byteranges; boundary=")
+    assert int(response.headers["content-length"]) == len(content)
+
+@pytest.mark.anyio
+async def test_unsatisfiable_response(storage):
+    response = await AudioDelivery(storage).respond(KEY, "audio/mpeg", "a.mp3", ETAG, "bytes=20000-")
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */10240"
+
+@pytest.mark.anyio
+async def test_if_range_matching_etag_or_date_serves_range(storage):
+    delivery = AudioDelivery(storage)
+    stat = await storage.backend.stat(KEY)
+    for validator in (ETAG, format_datetime(stat.modified, usegmt=True)):
+        response = await delivery.respond(KEY, "audio/mpeg", "a.mp3", ETAG, "bytes=0-9", if_range=validator)
+        assert response.status_code == 206
+        assert await body(response) == DATA[:10]
+
+@pytest.mark.anyio
+async def test_if_range_stale_serves_full_file(storage):
+    delivery = AudioDelivery(storage)
+    os.utime(storage.backend.local_path(KEY), (0, 0))
+    for validator in ('"stale"', "Mon, 01 Jan 2024 00:00:00 GMT"):
+        response = await delivery.respond(KEY, "audio/mpeg", "a.mp3", ETAG, "bytes=0-9", if_range=validator)
+        assert response.status_code == 200
+        assert response.headers["content-length"] == str(len(DATA))
+        assert await body(response) == DATA
+
+def write_index(storage, data: bytes) -> None:
+    with open(storage.backend.local_path(seek_index_key(KEY)), "wb") as f:
+        f.write(data)
+
+@pytest.mark.anyio
+async def test_seek_uses_index_entry(storage):
+    write_index(storage, SEEK_HEADER.pack(SEEK_MAGIC, SEEK_INTERVAL_MS, 3) + b"".join(
+        SEEK_ENTRY.pack(offset) for offset in (0, 4000, 8000)
+    ))
+    delivery = AudioDelivery(storage)
+    response = await delivery.respond(KEY, "audio/mpeg", "a.mp3", ETAG, seek_seconds=1.5)
+    assert response.status_code == 206
+    assert response.headers["content-range"] == "bytes 4000-10239/10240"
+    # Past the last entry: seek to the last indexed frame.
+    assert await delivery.seek_offset(KEY, 3600) == 8000
+
+@pytest.mark.anyio
+async def test_seek_with_truncated_index_serves_full_file(storage):
+    # The header promises three entries, but the file ends inside the second.
+    write_index(storage, SEEK_HEADER.pack(SEEK_MAGIC, SEEK_INTERVAL_MS, 3) + SEEK_ENTRY.pack(0) + b"\x01\x02")
+    delivery = AudioDelivery(storage)
+    assert await delivery.seek_offset(KEY, 2) is None
+    response = await delivery.respond(KEY, "audio/mpeg", "a.mp3", ETAG, seek_seconds=2)
+    assert response.status_code == 200
+    assert await body(response) == DATA
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("index", [None, b"SEEK", b"JUNK" + b"\x00" * 8])
+async def test_seek_without_usable_index_is_rejected(storage, index):
+    if index is not None:
+        write_index(storage, index)
+    with pytest.raises(HTTPException) as rejected:
+        await AudioDelivery(storage).respond(KEY, "audio/mpeg", "a.mp3", ETAG, seek_seconds=1)
+    assert rejected.value.status_code == 400
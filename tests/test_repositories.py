@@ -0,0 +1,54 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from src.core.database import SessionLocal, has_pending_writes
+from src.shared.repositories.base import BaseRepository, any_of
+from src.users.model import User
+from src.users.schema import UserUpdate
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture
+async def session(app):
+    """A session whose work is rolled back at the end of the test."""
+    async with SessionLocal() as session:
+        yield session
+        await session.rollback()
+
+def new_user() -> User:
+    return User(email=f"repo-{uuid.uuid4().hex[:12]}@example.com", hashed_password="x")
+
+async def test_create_flushes_without_committing(session):
+    repository = BaseRepository(User, session)
+    assert not has_pending_writes(session)
+    created = await repository.create(new_user())
+    # Server defaults are returned by the INSERT itself.
+    assert created.created_at is not None
+    assert has_pending_writes(session)
+    assert await repository.get(created.id) is created
+    async with SessionLocal() as other:
+        assert await BaseRepository(User, other).get(created.id) is None
+
+async def test_update_returns_the_fresh_row(session):
+    repository = BaseRepository(User, session)
+    created = await repository.create(new_user())
+    updated = await repository.update(created.id, UserUpdate(name="Renamed"))
+    assert updated is created
+    assert (updated.name, updated.updated_at is not None) == ("Renamed", True)
+    assert await repository.update(uuid.uuid4(), UserUpdate(name="Nobody")) is None
+
+async def test_delete(session):
+    repository = BaseRepository(User, session)
+    created = await repository.create(new_user())
+    assert await repository.delete(created.id)
+    assert not await repository.delete(created.id)
+    assert await repository.get_by_field("email", created.email) is None
+
+async def test_any_of_matches_an_array_of_ids(session):
+    repository = BaseRepository(User, session)
+    users = [await repository.create(new_user()) for _ in range(3)]
+    for ids in ([users[0].id], [user.id for user in users] + [uuid.uuid4()]):
+        result = await session.scalars(select(User.id).where(any_of(User.id, ids)))
+        assert set(result) == set(ids) & {user.id for user in users}
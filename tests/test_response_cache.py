@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from src.core.response_cache import ResponseCache
+
+def test_etag_is_derived_from_body():
+    first, second = ResponseCache(1024, 60), ResponseCache(1024, 60)
+    # Two workers with different invalidation histories agree on the validator.
+    second.invalidate()
+    a = first.put("page", b'{"items":[]}', first.generation)
+    b = second.put("page", b'{"items":[]}', second.generation)
+    assert a.etag == b.etag
+    assert a.etag != first.put("page", b'{"items":[1]}', first.generation).etag
+
+def test_not_modified_only_by_etag():
+    cache = ResponseCache(1024, 60)
+    entry = cache.put("page", b"body", cache.generation)
+    assert entry.not_modified(entry.etag)
+    assert entry.not_modified(f'"other", W/{entry.etag}')
+    assert entry.not_modified("*")
+    assert not entry.not_modified('"other"')
+    assert not entry.not_modified(None)
+
+def test_invalidate_drops_entries_and_refuses_stale_puts():
+    cache = ResponseCache(1024, 60)
+    generation = cache.generation
+    cache.put("page", b"body", generation)
+    cache.invalidate()
+    assert cache.get("page") is None
+    cache.put("page", b"stale", generation)
+    assert cache.get("page") is None
+
+def test_evicts_least_recently_used_over_max_bytes():
+    cache = ResponseCache(10, 60)
+    cache.put("a", b"aaaa", 0)
+    cache.put("b", b"bbbb", 0)
+    cache.get("a")
+    cache.put("c", b"cccc", 0)
+    assert cache.get("b") is None and cache.get("a") is not None
+    assert cache.stats.evictions == 1
+
+def test_entries_expire():
+    cache = ResponseCache(1024, 0.01)
+    cache.put("page", b"body", 0)
+    time.sleep(0.02)
+    assert cache.get("page") is None
+
+@pytest.mark.anyio
+async def test_public_listing_conditional_get(client):
+    response = await client.get("/api/audio/public")
+    assert "last-modified" not in response.headers
+    etag = response.headers["etag"]
+    assert (await client.get("/api/audio/public", headers={"If-None-Match": etag})).status_code == 304
+    ims = {"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}
+    assert (await client.get("/api/audio/public", headers=ims)).status_code == 200
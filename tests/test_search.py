@@ -0,0 +1,28 @@
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+async def test_search_ranks_and_paginates(client, user):
+    _, headers = user
+    word = f"w{uuid.uuid4().hex[:10]}"
+    for title in (f"{word} {word}", f"{word} live", "unrelated"):
+        response = await client.post(
+            "/api/audio/upload", headers=headers, files={"file": ("a.mp3", b"\xff" * 100)}, data={"title": title}
+        )
+        assert response.status_code == 201
+    # Works whether or not pg_trgm is installed: without it the app ranks by full text only.
+    response = await client.get("/api/audio/search", params={"q": word[:-2], "limit": 1}, headers=headers)
+    assert response.status_code == 200, response.text
+    first = response.json()
+    assert len(first["items"]) == 1 and first["next_cursor"]
+    response = await client.get(
+        "/api/audio/search", params={"q": word[:-2], "limit": 1, "cursor": first["next_cursor"]}, headers=headers
+    )
+    second = response.json()
+    assert {first["items"][0]["title"], second["items"][0]["title"]} == {f"{word} {word}", f"{word} live"}
+    response = await client.get(
+        "/api/audio/search", params={"q": "other", "cursor": first["next_cursor"]}, headers=headers
+    )
+    assert response.status_code == 400
@@ -0,0 +1,84 @@
+import uuid
+
+import orjson
+import pytest
+
+from src.audio.signed_urls import (DownloadGrant, DownloadSigner, DownloadUrlExpired, InvalidDownloadSignature,
+                                   _b64encode)
+
+GRANT = DownloadGrant(
+    key="ab/cd/abcd.mp3", media_type="audio/mpeg", filename="song.mp3", etag='"abcd"', audio_id=str(uuid.uuid4())
+)
+
+@pytest.fixture
+def signer():
+    return DownloadSigner(b"secret", ttl=300)
+
+def signed(signer: DownloadSigner, data: dict) -> str:
+    payload = _b64encode(orjson.dumps(data))
+    return f"{payload}.{signer._mac(payload, None)}"
+
+def test_round_trip(signer):
+    token, expires = signer.sign(GRANT)
+    grant = signer.verify(token)
+    assert (grant.key, grant.media_type, grant.filename, grant.etag, grant.audio_id) == (
+        GRANT.key, GRANT.media_type, GRANT.filename, GRANT.etag, GRANT.audio_id
+    )
+    assert grant.expires == expires
+    assert not grant.bound
+
+def test_bound_token_only_accepted_from_its_client(signer):
+    token, _ = signer.sign(GRANT, client="10.0.0.1")
+    assert signer.verify(token, "10.0.0.1").bound
+    with pytest.raises(InvalidDownloadSignature):
+        signer.verify(token, "10.0.0.2")
+
+def test_rejects_other_key(signer):
+    token, _ = DownloadSigner(b"other", ttl=300).sign(GRANT)
+    with pytest.raises(InvalidDownloadSignature):
+        signer.verify(token)
+
+def test_rejects_tampered_payload(signer):
+    token, _ = signer.sign(GRANT)
+    _, signature = token.split(".")
+    forged = _b64encode(orjson.dumps({"k": "other.mp3", "m": "audio/mpeg", "f": "x", "t": "x", "e": 2**40, "c": False}))
+    with pytest.raises(InvalidDownloadSignature):
+        signer.verify(f"{forged}.{signature}")
+
+@pytest.mark.parametrize("signature", ["é", "\udc80", "", "a" * 43])
+def test_rejects_bad_signature(signer, signature):
+    token, _ = signer.sign(GRANT)
+    payload, _ = token.split(".")
+    with pytest.raises(InvalidDownloadSignature):
+        signer.verify(f"{payload}.{signature}")
+
+@pytest.mark.parametrize("token", ["", "not-base64!.x", "é.x", f"{_b64encode(b'[1, 2]')}.x"])
+def test_rejects_malformed_token(signer, token):
+    with pytest.raises(InvalidDownloadSignature):
+        signer.verify(token)
+
+@pytest.mark.parametrize("data", [
+    {"m": "audio/mpeg", "f": "x", "t": "x", "e": 2**40, "c": False, "a": "x"},
+    {"k": 1, "m": "audio/mpeg", "f": "x", "t": "x", "e": 2**40, "c": False, "a": "x"},
+    {"k": "x", "m": "audio/mpeg", "f": "x", "t": "x", "e": "never", "c": False, "a": "x"},
+    {"k": "x", "m": "audio/mpeg", "f": "x", "t": "x", "e": True, "c": False, "a": "x"},
+    {"k": "x", "m": "audio/mpeg", "f": "x", "t": "x", "e": 2**40, "a": "x"},
+    {"k": "x", "m": "audio/mpeg", "f": "x", "t": "x", "e": 2**40, "c": False},
+])
+def test_rejects_correctly_signed_payload_with_wrong_shape(signer, data):
+    with pytest.raises(InvalidDownloadSignature, match="Malformed"):
+        signer.verify(signed(signer, data))
+
+def test_expired(signer):
+    token, _ = DownloadSigner(b"secret", ttl=-1).sign(GRANT)
+    with pytest.raises(DownloadUrlExpired):
+        signer.verify(token)
+
+@pytest.mark.anyio
+async def test_non_ascii_signature_is_forbidden(client, signer):
+    from src.audio.signed_urls import download_signer
+
+    token, _ = download_signer.sign(GRANT)
+    payload, _ = token.split(".")
+    response = await client.get(f"/api/audio/signed/{payload}.%C3%A9")
+    assert response.status_code == 403
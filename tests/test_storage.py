@@ -0,0 +1,51 @@
+import io
+import os
+
+import pytest
+
+from src.core.config.config import settings
+from src.core.storage.backends.base import FileTooLargeError
+from src.core.storage.backends.local import LocalStorageBackend
+from src.core.storage.service import StorageService
+
+pytestmark = pytest.mark.anyio
+
+class Source:
+    """An ``UploadFile``-like reader over bytes."""
+
+    def __init__(self, data: bytes):
+        self.buffer = io.BytesIO(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self.buffer.read(size)
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = StorageService(
+        LocalStorageBackend(str(tmp_path / "audio")), str(tmp_path / "staging"), chunk_size=16, max_file_size=100
+    )
+    os.makedirs(storage.staging_dir)
+    return storage
+
+async def test_stage_stream_at_limit(storage):
+    staged = await storage.stage_stream(Source(b"x" * 100))
+    assert staged.size == 100
+    assert os.listdir(storage.staging_dir) == [os.path.basename(staged.path)]
+
+async def test_stage_stream_over_limit_removes_partial_file(storage):
+    with pytest.raises(FileTooLargeError):
+        await storage.stage_stream(Source(b"x" * 101))
+    assert os.listdir(storage.staging_dir) == []
+
+async def test_upload_over_max_size_is_refused(client, user, monkeypatch):
+    _, headers = user
+    monkeypatch.setattr(settings.storage, "max_upload_size", 1000)
+    response = await client.post(
+        "/api/audio/upload", headers=headers, files={"file": ("a.mp3", b"x" * 1001)}, data={"title": "big"}
+    )
+    assert response.status_code == 413
+    assert not [name for name in os.listdir(settings.storage.staging_dir) if name.endswith(".part")]
+    response = await client.post(
+        "/api/audio/upload", headers=headers, files={"file": ("a.mp3", b"x" * 1000)}, data={"title": "fits"}
+    )
+    assert response.status_code == 201
@@ -0,0 +1,106 @@
+import asyncio
+import os
+
+import pytest
+
+from src.core.config.config import QuotaTier, settings
+
+pytestmark = pytest.mark.anyio
+
+DATA = os.urandom(64 * 1024)
+
+async def create_session(client, headers, size=len(DATA)) -> str:
+    response = await client.post(
+        "/api/audio/uploads", headers=headers, json={"filename": "a.mp3", "title": "resumable", "size": size}
+    )
+    assert response.status_code == 201, response.text
+    return f"/api/audio/uploads/{response.json()['id']}"
+
+async def patch(client, headers, url, offset, content):
+    return await client.patch(url, headers={**headers, "Upload-Offset": str(offset)}, content=content)
+
+async def test_chunks_and_complete(client, user):
+    _, headers = user
+    url = await create_session(client, headers)
+    response = await patch(client, headers, url, 0, DATA[:1000])
+    assert (response.status_code, response.headers["upload-offset"]) == (204, "1000")
+    response = await patch(client, headers, url, 1000, DATA[1000:])
+    assert (response.status_code, response.headers["upload-offset"]) == (204, str(len(DATA)))
+    response = await client.post(f"{url}/complete", headers=headers)
+    assert response.status_code == 201
+    download = await client.get(f"/api/audio/download/{response.json()['id']}", headers=headers)
+    assert download.content == DATA
+    assert (await client.head(url, headers=headers)).status_code == 404
+
+async def test_offset_mismatch(client, user):
+    _, headers = user
+    url = await create_session(client, headers)
+    await patch(client, headers, url, 0, DATA[:100])
+    for offset in (0, 50, 200):
+        response = await patch(client, headers, url, offset, DATA[offset:offset + 10])
+        assert response.status_code == 409
+        assert response.headers["upload-offset"] == "100"
+    assert (await client.head(url, headers=headers)).headers["upload-offset"] == "100"
+
+async def test_concurrent_patch_is_refused_without_corrupting_data(client, user):
+    _, headers = user
+    url = await create_session(client, headers)
+    first_chunk_sent = asyncio.Event()
+
+    async def slow_body():
+        for start in range(0, 4000, 1000):
+            yield DATA[start:start + 1000]
+            first_chunk_sent.set()
+            await asyncio.sleep(0.05)
+
+    slow = asyncio.create_task(patch(client, headers, url, 0, slow_body()))
+    await first_chunk_sent.wait()
+    competing = await patch(client, headers, url, 0, b"\x00" * 4000)
+    assert competing.status_code == 409
+    assert (await slow).headers["upload-offset"] == "4000"
+    assert (await patch(client, headers, url, 4000, DATA[4000:])).status_code == 204
+    response = await client.post(f"{url}/complete", headers=headers)
+    download = await client.get(f"/api/audio/download/{response.json()['id']}", headers=headers)
+    assert download.content == DATA
+
+async def test_chunk_past_declared_size_releases_claim(client, user):
+    _, headers = user
+    url = await create_session(client, headers, size=100)
+    assert (await patch(client, headers, url, 0, b"x" * 101)).status_code == 413
+    response = await patch(client, headers, url, 0, b"x" * 100)
+    assert (response.status_code, response.headers["upload-offset"]) == (204, "100")
+
+async def test_incomplete_session_cannot_complete(client, user):
+    _, headers = user
+    url = await create_session(client, headers)
+    await patch(client, headers, url, 0, DATA[:10])
+    response = await client.post(f"{url}/complete", headers=headers)
+    assert (response.status_code, response.headers["upload-offset"]) == (409, "10")
+
+async def test_failed_complete_can_be_retried(client, user, monkeypatch):
+    _, headers = user
+    url = await create_session(client, headers)
+    await patch(client, headers, url, 0, DATA)
+    monkeypatch.setattr(settings.quota, "enabled", True)
+    monkeypatch.setitem(settings.quota.tiers, settings.quota.default_tier, QuotaTier(max_bytes=len(DATA) - 1))
+    assert (await client.post(f"{url}/complete", headers=headers)).status_code == 413
+    monkeypatch.undo()
+    response = await client.post(f"{url}/complete", headers=headers)
+    assert response.status_code == 201
+    download = await client.get(f"/api/audio/download/{response.json()['id']}", headers=headers)
+    assert download.content == DATA
+
+async def test_sessions_refused_without_shared_directory(client, user, monkeypatch):
+    _, headers = user
+    monkeypatch.setattr(settings.storage, "upload_sessions_shared", False)
+    response = await client.post(
+        "/api/audio/uploads", headers=headers, json={"filename": "a.mp3", "title": "resumable", "size": 10}
+    )
+    assert response.status_code == 501
+
+def test_sessions_shared_by_default_only_for_local_backend():
+    from src.core.config.config import StorageConfig
+
+    assert StorageConfig(audio_upload_dir="media", backend="local").upload_sessions_shared
+    assert not StorageConfig(audio_upload_dir="media", backend="s3").upload_sessions_shared
+    assert StorageConfig(audio_upload_dir="media", backend="s3", upload_sessions_shared=True).upload_sessions_shared
@@ -0,0 +1,78 @@
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.core.config.config import settings
+from src.core.metrics import YandexClientCollector
+from src.shared.clients import yandex
+from src.shared.clients.yandex import TOKEN_URL, USER_INFO_URL, YandexAuthClient
+
+pytestmark = pytest.mark.anyio
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings.auth, "yandex_max_retries", 2)
+    monkeypatch.setattr(yandex, "RETRY_BACKOFF", 0)
+
+def scripted(*outcomes):
+    """A client whose transport answers with ``outcomes`` in turn (exceptions are raised)."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        outcome = outcomes[len(calls) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    return YandexAuthClient(transport=httpx.MockTransport(handler)), calls
+
+def stats(client: YandexAuthClient, endpoint: str) -> dict:
+    return {
+        family.name: sample.value
+        for family in YandexClientCollector(client).collect()
+        for sample in family.samples
+        if sample.labels == {"endpoint": endpoint}
+    }
+
+async def test_user_info_retries_timeouts_and_server_errors():
+    client, calls = scripted(
+        httpx.ReadTimeout("slow"),
+        httpx.Response(503),
+        httpx.Response(200, json={"id": "42"}),
+    )
+    assert await client.get_user_info("token") == {"id": "42"}
+    assert [str(request.url) for request in calls] == [USER_INFO_URL] * 3
+    observed = stats(client, "user_info")
+    assert (observed["yandex_requests"], observed["yandex_request_errors"], observed["yandex_request_retries"]) == (3, 2, 2)
+    assert observed["yandex_request_seconds"] >= observed["yandex_request_seconds_max"] > 0
+    await client.close()
+
+async def test_user_info_gives_up_after_max_retries():
+    client, calls = scripted(*[httpx.ConnectTimeout("down")] * 3)
+    with pytest.raises(HTTPException) as failed:
+        await client.get_user_info("token")
+    assert failed.value.status_code == 400
+    assert len(calls) == 3
+    assert stats(client, "user_info")["yandex_request_retries"] == 2
+    await client.close()
+
+async def test_token_exchange_is_retried_only_when_never_sent():
+    client, calls = scripted(
+        httpx.ConnectTimeout("down"),
+        httpx.ReadTimeout("slow"),
+    )
+    # The read timeout may have reached Yandex and spent the single-use code.
+    with pytest.raises(HTTPException):
+        await client.get_token("code")
+    assert [str(request.url) for request in calls] == [TOKEN_URL] * 2
+    assert stats(client, "token")["yandex_request_retries"] == 1
+    await client.close()
+
+async def test_token_exchange_does_not_retry_server_errors():
+    client, calls = scripted(httpx.Response(503), httpx.Response(200, json={"access_token": "t"}))
+    with pytest.raises(HTTPException):
+        await client.get_token("code")
+    assert len(calls) == 1
+    assert stats(client, "token")["yandex_request_errors"] == 1
+    await client.close()